@@ -0,0 +1,128 @@
+"""add password search index
+
+Adds passwords.search_text (lowercased title, username, url host and tags,
+one per line), backfills it in committed batches and indexes it: an
+external-content FTS5 trigram table kept in step by triggers on SQLite
+(3.34+), a pg_trgm GIN index led by user_id on PostgreSQL.
+
+On SQLite, batch-mode migrations that recreate the passwords table drop
+the triggers and change rowids; they must recreate both and run
+INSERT INTO password_search(password_search) VALUES ('rebuild').
+
+Revision ID: 014ba1220ed9
+Revises: 08fbdd4855b9
+Create Date: 2026-10-17 15:48:27.503116
+
+"""
+import sqlite3
+from typing import Sequence, Union
+from urllib.parse import urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014ba1220ed9'
+down_revision: Union[str, None] = '08fbdd4855b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS password_search USING fts5("
+    "search_text, content='passwords', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_ai AFTER INSERT ON passwords BEGIN "
+    "INSERT INTO password_search(rowid, search_text) VALUES (new.rowid, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_ad AFTER DELETE ON passwords BEGIN "
+    "INSERT INTO password_search(password_search, rowid, search_text) "
+    "VALUES ('delete', old.rowid, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_au AFTER UPDATE OF search_text ON passwords BEGIN "
+    "INSERT INTO password_search(password_search, rowid, search_text) "
+    "VALUES ('delete', old.rowid, old.search_text); "
+    "INSERT INTO password_search(rowid, search_text) VALUES (new.rowid, new.search_text); END",
+    "INSERT INTO password_search(password_search) VALUES ('rebuild')",
+)
+
+passwords = sa.table(
+    'passwords',
+    sa.column('id', sa.String),
+    sa.column('title', sa.String),
+    sa.column('username', sa.String),
+    sa.column('url', sa.String),
+    sa.column('tags', sa.JSON),
+    sa.column('search_text', sa.Text),
+)
+
+
+def _host(url) -> str:
+    if not url:
+        return ''
+    url = url.strip()
+    try:
+        return urlsplit(url if '://' in url else f'//{url}').hostname or ''
+    except ValueError:
+        return ''
+
+
+def _document(row) -> str:
+    fields = [row.title, row.username, _host(row.url), *(row.tags or ())]
+    return '\n'.join(field.lower() for field in fields if isinstance(field, str) and field)
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    statement = (
+        passwords.update()
+        .where(passwords.c.id == sa.bindparam('b_id'))
+        .values(search_text=sa.bindparam('b_search_text'))
+    )
+    last_id = ''
+    with op.get_context().autocommit_block():
+        while True:
+            rows = bind.execute(
+                sa.select(
+                    passwords.c.id, passwords.c.title, passwords.c.username,
+                    passwords.c.url, passwords.c.tags,
+                )
+                .where(passwords.c.id > last_id)
+                .order_by(passwords.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            bind.execute(statement, [{'b_id': row.id, 'b_search_text': _document(row)} for row in rows])
+            last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('passwords', sa.Column('search_text', sa.Text(), server_default='', nullable=False))
+    _backfill()
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite' and sqlite3.sqlite_version_info >= (3, 34, 0):
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+        with op.get_context().autocommit_block():
+            op.execute(
+                'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_passwords_user_search_trgm '
+                'ON passwords USING gin (user_id, search_text gin_trgm_ops)'
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('passwords_search_ai', 'passwords_search_ad', 'passwords_search_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS password_search')
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_passwords_user_search_trgm')
+    with op.batch_alter_table('passwords') as batch_op:
+        batch_op.drop_column('search_text')
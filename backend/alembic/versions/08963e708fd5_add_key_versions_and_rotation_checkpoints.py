@@ -0,0 +1,50 @@
+"""add key versions and rotation checkpoints
+
+Records which data key generation sealed each entry, keeps the previous
+data key while a rotation is in progress, and adds the checkpoint table of
+the re-encryption job. Existing entries are labelled 0 (master key); those
+already sealed with a data key are simply re-sealed by the first job run.
+
+Revision ID: 08963e708fd5
+Revises: c390c232fb26
+Create Date: 2026-10-17 13:12:40.905163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '08963e708fd5'
+down_revision: Union[str, None] = 'c390c232fb26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('key_version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('users', sa.Column('previous_wrapped_dek', sa.LargeBinary(), nullable=True))
+    op.add_column('passwords', sa.Column('key_version', sa.Integer(), server_default='0', nullable=False))
+    op.create_table(
+        'key_rotation_checkpoints',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('last_id', sa.String(length=36), nullable=False),
+        sa.Column('rows_reencrypted', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('key_rotation_checkpoints')
+    with op.batch_alter_table('passwords') as batch_op:
+        batch_op.drop_column('key_version')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('previous_wrapped_dek')
+        batch_op.drop_column('key_version')
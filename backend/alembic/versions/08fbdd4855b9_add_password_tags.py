@@ -0,0 +1,90 @@
+"""add password_tags
+
+Normalized tag table used for tag filters and per-tag counts, indexed on
+(user_id, tag). passwords.tags stays as the ordered copy returned by the
+API. Existing JSON tags are backfilled one committed batch at a time;
+entries that already have tag rows (written by the app while the backfill
+runs) are skipped.
+
+Revision ID: 08fbdd4855b9
+Revises: 08963e708fd5
+Create Date: 2026-10-17 15:02:11.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '08fbdd4855b9'
+down_revision: Union[str, None] = '08963e708fd5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+MAX_TAG_LENGTH = 255
+
+passwords = sa.table(
+    'passwords',
+    sa.column('id', sa.String),
+    sa.column('user_id', sa.String),
+    sa.column('tags', sa.JSON),
+)
+password_tags = sa.table(
+    'password_tags',
+    sa.column('password_id', sa.String),
+    sa.column('tag', sa.String),
+    sa.column('user_id', sa.String),
+)
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    last_id = ''
+    with op.get_context().autocommit_block():
+        while True:
+            rows = bind.execute(
+                sa.select(passwords.c.id, passwords.c.user_id, passwords.c.tags)
+                .where(passwords.c.id > last_id)
+                .order_by(passwords.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            indexed = set(bind.execute(
+                sa.select(password_tags.c.password_id).distinct()
+                .where(password_tags.c.password_id.in_([row.id for row in rows]))
+            ).scalars())
+            values = [
+                {'password_id': row.id, 'tag': tag, 'user_id': row.user_id}
+                for row in rows if row.id not in indexed
+                for tag in dict.fromkeys(
+                    tag for tag in row.tags or () if isinstance(tag, str) and 0 < len(tag) <= MAX_TAG_LENGTH
+                )
+            ]
+            if values:
+                bind.execute(password_tags.insert(), values)
+            last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'password_tags',
+        sa.Column('password_id', sa.String(length=36), nullable=False),
+        sa.Column('tag', sa.String(length=MAX_TAG_LENGTH), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(['password_id'], ['passwords.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('password_id', 'tag'),
+    )
+    op.create_index('ix_password_tags_user_tag', 'password_tags', ['user_id', 'tag', 'password_id'], unique=False)
+    _backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_password_tags_user_tag', table_name='password_tags')
+    op.drop_table('password_tags')
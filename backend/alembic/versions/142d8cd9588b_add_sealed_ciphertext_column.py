@@ -0,0 +1,96 @@
+"""add sealed ciphertext column
+
+Expand step of the move to a single binary secret column. Adds
+passwords.ciphertext (version byte || nonce || AES-GCM ciphertext), relaxes
+the legacy encrypted_password/iv columns and converts existing rows in
+batches, committing each batch so the table is never locked for long.
+The legacy columns are dropped by the following revision.
+
+Revision ID: 142d8cd9588b
+Revises: fce678745a76
+Create Date: 2026-10-17 11:03:27.552914
+
+"""
+from base64 import b64decode
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '142d8cd9588b'
+down_revision: Union[str, None] = 'fce678745a76'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+FORMAT_VERSION = 1
+
+passwords = sa.table(
+    'passwords',
+    sa.column('id', sa.String),
+    sa.column('encrypted_password', sa.LargeBinary),
+    sa.column('iv', sa.LargeBinary),
+    sa.column('ciphertext', sa.LargeBinary),
+)
+
+
+def _as_bytes(value) -> bytes:
+    return value.encode() if isinstance(value, str) else bytes(value)
+
+
+def seal_legacy(encrypted_password, iv) -> bytes:
+    """Convert base64 ciphertext and IV to the sealed binary format."""
+    return (
+        bytes((FORMAT_VERSION,))
+        + b64decode(_as_bytes(iv))
+        + b64decode(_as_bytes(encrypted_password))
+    )
+
+
+def backfill_ciphertext() -> None:
+    """Seal every row that has no ciphertext yet, one committed batch at a time."""
+    bind = op.get_bind()
+    last_id = ''
+    with op.get_context().autocommit_block():
+        while True:
+            rows = bind.execute(
+                sa.select(passwords.c.id, passwords.c.encrypted_password, passwords.c.iv)
+                .where(
+                    passwords.c.ciphertext.is_(None),
+                    passwords.c.encrypted_password.is_not(None),
+                    passwords.c.id > last_id,
+                )
+                .order_by(passwords.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            bind.execute(
+                passwords.update()
+                .where(passwords.c.id == sa.bindparam('row_id'))
+                .values(ciphertext=sa.bindparam('sealed')),
+                [
+                    {'row_id': row.id, 'sealed': seal_legacy(row.encrypted_password, row.iv)}
+                    for row in rows
+                ]
+            )
+            last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('passwords', sa.Column('ciphertext', sa.LargeBinary(), nullable=True))
+    with op.batch_alter_table('passwords') as batch_op:
+        batch_op.alter_column('encrypted_password', existing_type=sa.LargeBinary(), nullable=True)
+        batch_op.alter_column('iv', existing_type=sa.LargeBinary(), nullable=True)
+    backfill_ciphertext()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('passwords') as batch_op:
+        batch_op.drop_column('ciphertext')
+        batch_op.alter_column('encrypted_password', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.alter_column('iv', existing_type=sa.LargeBinary(), nullable=False)
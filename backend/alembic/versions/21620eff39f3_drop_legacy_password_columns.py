@@ -0,0 +1,92 @@
+"""drop legacy password columns
+
+Contract step of the move to a single binary secret column. Seals any rows
+written by older app instances since the previous revision, then drops
+encrypted_password/iv and makes ciphertext mandatory. Run once every app
+instance writes the sealed format.
+
+Revision ID: 21620eff39f3
+Revises: 142d8cd9588b
+Create Date: 2026-10-17 11:04:52.190337
+
+"""
+from base64 import b64decode, b64encode
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '21620eff39f3'
+down_revision: Union[str, None] = '142d8cd9588b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+FORMAT_VERSION = 1
+NONCE_SIZE = 12
+
+passwords = sa.table(
+    'passwords',
+    sa.column('id', sa.String),
+    sa.column('encrypted_password', sa.LargeBinary),
+    sa.column('iv', sa.LargeBinary),
+    sa.column('ciphertext', sa.LargeBinary),
+)
+
+
+def _as_bytes(value) -> bytes:
+    return value.encode() if isinstance(value, str) else bytes(value)
+
+
+def _convert_in_batches(pending, columns, convert) -> None:
+    """Apply convert(row) -> values to every pending row, one committed batch at a time."""
+    bind = op.get_bind()
+    last_id = ''
+    with op.get_context().autocommit_block():
+        while True:
+            rows = bind.execute(
+                sa.select(passwords.c.id, *columns)
+                .where(pending, passwords.c.id > last_id)
+                .order_by(passwords.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                bind.execute(
+                    passwords.update().where(passwords.c.id == row.id).values(**convert(row))
+                )
+            last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _convert_in_batches(
+        sa.and_(passwords.c.ciphertext.is_(None), passwords.c.encrypted_password.is_not(None)),
+        [passwords.c.encrypted_password, passwords.c.iv],
+        lambda row: {
+            'ciphertext': bytes((FORMAT_VERSION,))
+            + b64decode(_as_bytes(row.iv))
+            + b64decode(_as_bytes(row.encrypted_password))
+        },
+    )
+    with op.batch_alter_table('passwords') as batch_op:
+        batch_op.drop_column('encrypted_password')
+        batch_op.drop_column('iv')
+        batch_op.alter_column('ciphertext', existing_type=sa.LargeBinary(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('passwords', sa.Column('encrypted_password', sa.LargeBinary(), nullable=True))
+    op.add_column('passwords', sa.Column('iv', sa.LargeBinary(), nullable=True))
+    _convert_in_batches(
+        passwords.c.encrypted_password.is_(None),
+        [passwords.c.ciphertext],
+        lambda row: {
+            'iv': b64encode(bytes(row.ciphertext[1:1 + NONCE_SIZE])),
+            'encrypted_password': b64encode(bytes(row.ciphertext[1 + NONCE_SIZE:])),
+        },
+    )
@@ -0,0 +1,32 @@
+"""add user tombstone floor
+
+users.tombstone_floor records the highest vault version whose tombstones
+may have been pruned; GET /passwords/changes asks clients syncing from an
+older version to resync. Starts at 0, since nothing has been pruned yet.
+
+Revision ID: 3f8a61c2d9e4
+Revises: 9c4e2b7d1f30
+Create Date: 2026-10-17 19:41:06.572903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a61c2d9e4'
+down_revision: Union[str, None] = '9c4e2b7d1f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('tombstone_floor', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'tombstone_floor')
@@ -0,0 +1,61 @@
+"""add vault versions and tombstones
+
+Per-user vault version (users.vault_version) stamped on every entry write
+(passwords.version) and on deletes (password_tombstones), for ETags on
+listings and GET /passwords/changes. Existing users and entries start at
+version 1 through the server defaults, so no backfill is needed.
+
+Revision ID: 5b1e0c7a93d2
+Revises: e6006924f765
+Create Date: 2026-10-17 17:52:31.406118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e0c7a93d2'
+down_revision: Union[str, None] = 'e6006924f765'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('vault_version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('passwords', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_passwords_user_version', 'passwords', ['user_id', 'version'],
+                postgresql_concurrently=True
+            )
+    else:
+        op.create_index('ix_passwords_user_version', 'passwords', ['user_id', 'version'])
+
+    op.create_table(
+        'password_tombstones',
+        sa.Column('password_id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('password_id'),
+    )
+    op.create_index(
+        'ix_password_tombstones_user_version', 'password_tombstones',
+        ['user_id', 'version'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_password_tombstones_user_version', table_name='password_tombstones')
+    op.drop_table('password_tombstones')
+    op.drop_index('ix_passwords_user_version', table_name='passwords')
+    # Plain ALTER TABLE (SQLite 3.35+), keeping the search index triggers
+    op.drop_column('passwords', 'version')
+    op.drop_column('users', 'vault_version')
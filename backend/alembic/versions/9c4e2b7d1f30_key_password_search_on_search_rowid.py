@@ -0,0 +1,95 @@
+"""key password search on search_rowid
+
+The SQLite FTS5 index was keyed on the implicit rowid of passwords, whose
+primary key is a string, so VACUUM could renumber the rows under it. Adds
+passwords.search_rowid, a stored integer key with a unique index, fills it
+from the current rowids and rebuilds the index and its triggers on it; the
+insert trigger assigns the next free key to new entries. On PostgreSQL the
+column is only added and stays empty.
+
+Revision ID: 9c4e2b7d1f30
+Revises: 5b1e0c7a93d2
+Create Date: 2026-10-17 19:05:12.318664
+
+"""
+import sqlite3
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2b7d1f30'
+down_revision: Union[str, None] = '5b1e0c7a93d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = ('passwords_search_ai', 'passwords_search_ad', 'passwords_search_au')
+
+SQLITE_DDL = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_passwords_search_rowid ON passwords (search_rowid)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS password_search USING fts5("
+    "search_text, content='passwords', content_rowid='search_rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_ai AFTER INSERT ON passwords BEGIN "
+    "UPDATE passwords SET search_rowid = (SELECT coalesce(max(search_rowid), 0) + 1 FROM passwords) "
+    "WHERE rowid = new.rowid; "
+    "INSERT INTO password_search(rowid, search_text) "
+    "SELECT search_rowid, search_text FROM passwords WHERE rowid = new.rowid; END",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_ad AFTER DELETE ON passwords BEGIN "
+    "INSERT INTO password_search(password_search, rowid, search_text) "
+    "VALUES ('delete', old.search_rowid, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_au AFTER UPDATE OF search_text ON passwords BEGIN "
+    "INSERT INTO password_search(password_search, rowid, search_text) "
+    "VALUES ('delete', old.search_rowid, old.search_text); "
+    "INSERT INTO password_search(rowid, search_text) VALUES (new.search_rowid, new.search_text); END",
+    "INSERT INTO password_search(password_search) VALUES ('rebuild')",
+)
+
+# As created by 014ba1220ed9
+ROWID_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS password_search USING fts5("
+    "search_text, content='passwords', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_ai AFTER INSERT ON passwords BEGIN "
+    "INSERT INTO password_search(rowid, search_text) VALUES (new.rowid, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_ad AFTER DELETE ON passwords BEGIN "
+    "INSERT INTO password_search(password_search, rowid, search_text) "
+    "VALUES ('delete', old.rowid, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_au AFTER UPDATE OF search_text ON passwords BEGIN "
+    "INSERT INTO password_search(password_search, rowid, search_text) "
+    "VALUES ('delete', old.rowid, old.search_text); "
+    "INSERT INTO password_search(rowid, search_text) VALUES (new.rowid, new.search_text); END",
+    "INSERT INTO password_search(password_search) VALUES ('rebuild')",
+)
+
+
+def _fts5_trigram() -> bool:
+    return op.get_bind().dialect.name == 'sqlite' and sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+def _drop_sqlite_search() -> None:
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS password_search')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('passwords', sa.Column('search_rowid', sa.Integer(), nullable=True))
+    if _fts5_trigram():
+        _drop_sqlite_search()
+        op.execute('UPDATE passwords SET search_rowid = rowid')
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if _fts5_trigram():
+        _drop_sqlite_search()
+        op.execute('DROP INDEX IF EXISTS ix_passwords_search_rowid')
+    # Plain ALTER TABLE (SQLite 3.35+), so rowids and the triggers below stay valid
+    op.drop_column('passwords', 'search_rowid')
+    if _fts5_trigram():
+        for statement in ROWID_SQLITE_DDL:
+            op.execute(statement)
@@ -0,0 +1,34 @@
+"""add user wrapped dek
+
+Adds the per-user data key used for envelope encryption. Existing users get
+one lazily on their next vault request; their entries stay readable with
+the master key until rewritten. Downgrading discards the data keys, so
+entries written since cannot be decrypted afterwards.
+
+Revision ID: c390c232fb26
+Revises: 21620eff39f3
+Create Date: 2026-10-17 12:31:07.448215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c390c232fb26'
+down_revision: Union[str, None] = '21620eff39f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('wrapped_dek', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('wrapped_dek')
@@ -0,0 +1,50 @@
+"""add sealed metadata and blind index
+
+Optional encrypted-metadata mode (ENCRYPT_METADATA): title, username and
+url sealed into passwords.sealed_metadata, with keyed HMAC blind index
+tokens in password_blind_index for username and domain lookups. Nothing is
+converted here; entries are sealed as they are written with the mode on.
+
+Revision ID: e6006924f765
+Revises: 014ba1220ed9
+Create Date: 2026-10-17 16:40:05.772913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6006924f765'
+down_revision: Union[str, None] = '014ba1220ed9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('passwords', sa.Column('sealed_metadata', sa.LargeBinary(), nullable=True))
+    op.create_table(
+        'password_blind_index',
+        sa.Column('password_id', sa.String(length=36), nullable=False),
+        sa.Column('token', sa.LargeBinary(length=16), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(['password_id'], ['passwords.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('password_id', 'token'),
+    )
+    op.create_index(
+        'ix_password_blind_index_user_token', 'password_blind_index',
+        ['user_id', 'token', 'password_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_password_blind_index_user_token', table_name='password_blind_index')
+    op.drop_table('password_blind_index')
+    # Plain ALTER TABLE (SQLite 3.35+): a batch-mode copy of passwords would
+    # drop the search index triggers
+    op.drop_column('passwords', 'sealed_metadata')
@@ -0,0 +1,41 @@
+"""add password keyset index
+
+Revision ID: fce678745a76
+Revises: 286a1bd8337a
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fce678745a76'
+down_revision: Union[str, None] = '286a1bd8337a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # updated_at is part of PasswordResponse but was never created
+    op.add_column('passwords', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE passwords SET updated_at = created_at")
+    with op.batch_alter_table('passwords') as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+    # Keyset pagination on (created_at, id) within a user's vault
+    op.create_index(
+        'ix_passwords_user_created_id',
+        'passwords',
+        ['user_id', 'created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_passwords_user_created_id', 'passwords')
+    with op.batch_alter_table('passwords') as batch_op:
+        batch_op.drop_column('updated_at')
@@ -1,8 +1,23 @@
+import json
 import os
 from pathlib import Path
-from typing import Optional, List
-from pydantic import field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Annotated, Optional, List
+from pydantic import field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+
+def split_list(v) -> List[str]:
+    """
+    Parse a list setting given as a comma-separated string or a JSON array.
+    List fields are marked NoDecode so that environment values reach their
+    validator as strings instead of failing JSON decoding first.
+    """
+    if isinstance(v, str):
+        v = v.strip()
+        if v.startswith("["):
+            return json.loads(v)
+        return [item.strip() for item in v.split(",") if item.strip()]
+    return v
 
 
 class Settings(BaseSettings):
@@ -19,16 +34,79 @@ class Settings(BaseSettings):
     DATABASE_DIR: str = "data"
     DATABASE_NAME: str = "passman.db"
     
+    # Connection pool (per worker process; ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_ECHO: bool = False
+    
+    # Read replicas (comma-separated URLs); GET endpoints read from them
+    DATABASE_REPLICA_URLS: Annotated[List[str], NoDecode] = []
+    REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 5
+    REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS: float = 2
+    READ_YOUR_WRITES_SECONDS: float = 5
+    
+    # SQLite
+    SQLITE_WAL: bool = True
+    SQLITE_READ_POOL_SIZE: int = 4
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE: int = -65536
+    SQLITE_BUSY_TIMEOUT_SECONDS: float = 20
+    
+    # Pagination
+    PASSWORDS_PAGE_SIZE: int = 100
+    PASSWORDS_MAX_PAGE_SIZE: int = 500
+    EXPORT_BATCH_SIZE: int = 500
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_SPOOL_MEMORY_BYTES: int = 10485760
+    
     # JWT Configuration
     SECRET_KEY: str = "development-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAXSIZE: int = 10000
+    
+    # Authenticated user cache
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAXSIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    
+    # Cross-worker pub/sub (e.g. redis://localhost:6379/0); in-process when unset
+    PUBSUB_URL: Optional[str] = None
+    
+    # Real-time change feed (/ws/vault)
+    VAULT_FEED_QUEUE_SIZE: int = 64
+    
+    # Delta sync: days tombstones of deleted entries are kept, 0 for ever
+    TOMBSTONE_RETENTION_DAYS: int = 90
+    
+    # Password hashing
+    HASHING_EXECUTOR: str = "process"  # "process" or "thread"
+    HASHING_CONCURRENCY: int = 2
+    HASHING_QUEUE_DEPTH: int = 64
+    HASHING_RETRY_AFTER_SECONDS: int = 1
     
     # Encryption
     ENCRYPTION_KEY: str = "development-encryption-key-change-in-production"
+    PREVIOUS_ENCRYPTION_KEYS: Annotated[List[str], NoDecode] = []
+    DEK_CACHE_MAXSIZE: int = 10000
+    DEK_CACHE_TTL_SECONDS: int = 300
+    REENCRYPT_BATCH_SIZE: int = 500
+    REENCRYPT_MAX_ROWS_PER_SECOND: int = 2000
+    REENCRYPT_RETIRE_GRACE_SECONDS: float = 10
+    CRYPTO_INLINE_THRESHOLD: int = 64
+    CRYPTO_CHUNK_SIZE: int = 256
+    CRYPTO_WORKERS: int = 4
+    ENCRYPT_METADATA: bool = False
+    BLIND_INDEX_KEY: str = ""
     
     # CORS Origins
-    BACKEND_CORS_ORIGINS: List[str] = [
+    BACKEND_CORS_ORIGINS: Annotated[List[str], NoDecode] = [
         "http://localhost:3000",
         "http://localhost:5173",
         "http://127.0.0.1:3000",
@@ -38,6 +116,8 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "passman.log"
+    LOG_FORMAT: str = "text"  # "text" or "json"
+    LOG_REQUEST_SAMPLE_RATE: float = 1.0
     
     # Server Configuration
     HOST: str = "0.0.0.0"
@@ -81,13 +161,68 @@ class Settings(BaseSettings):
             raise ValueError(f"LOG_LEVEL must be one of {valid_levels}")
         return v.upper()
     
+    @field_validator("LOG_FORMAT")
+    @classmethod
+    def validate_log_format(cls, v: str) -> str:
+        """Validate log format."""
+        valid_formats = ["text", "json"]
+        if v.lower() not in valid_formats:
+            raise ValueError(f"LOG_FORMAT must be one of {valid_formats}")
+        return v.lower()
+    
+    @field_validator("LOG_REQUEST_SAMPLE_RATE")
+    @classmethod
+    def validate_log_request_sample_rate(cls, v: float) -> float:
+        """Validate request log sampling rate."""
+        if not 0 <= v <= 1:
+            raise ValueError("LOG_REQUEST_SAMPLE_RATE must be between 0 and 1")
+        return v
+    
+    @field_validator("SQLITE_SYNCHRONOUS")
+    @classmethod
+    def validate_sqlite_synchronous(cls, v: str) -> str:
+        """Validate SQLite synchronous level."""
+        valid_levels = ["OFF", "NORMAL", "FULL", "EXTRA"]
+        if v.upper() not in valid_levels:
+            raise ValueError(f"SQLITE_SYNCHRONOUS must be one of {valid_levels}")
+        return v.upper()
+    
+    @field_validator("HASHING_EXECUTOR")
+    @classmethod
+    def validate_hashing_executor(cls, v: str) -> str:
+        """Validate hashing executor kind."""
+        valid_kinds = ["process", "thread"]
+        if v.lower() not in valid_kinds:
+            raise ValueError(f"HASHING_EXECUTOR must be one of {valid_kinds}")
+        return v.lower()
+    
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v) -> List[str]:
         """Parse CORS origins from string or list."""
-        if isinstance(v, str):
-            return [origin.strip() for origin in v.split(",") if origin.strip()]
-        return v
+        return split_list(v)
+    
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    @classmethod
+    def assemble_replica_urls(cls, v) -> List[str]:
+        """Parse replica URLs from string or list."""
+        return split_list(v)
+    
+    @field_validator("PREVIOUS_ENCRYPTION_KEYS", mode="before")
+    @classmethod
+    def assemble_previous_keys(cls, v) -> List[str]:
+        """Parse retired encryption keys from string or list."""
+        return split_list(v)
+    
+    @model_validator(mode="after")
+    def require_blind_index_key(self) -> "Settings":
+        """
+        Blind index tokens are keyed independently of ENCRYPTION_KEY so that
+        rotating the master key does not orphan them.
+        """
+        if self.ENCRYPT_METADATA and not self.BLIND_INDEX_KEY:
+            raise ValueError("ENCRYPT_METADATA requires BLIND_INDEX_KEY to be set")
+        return self
     
     @property
     def is_development(self) -> bool:
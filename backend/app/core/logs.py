@@ -0,0 +1,193 @@
+"""
+Logging pipeline and request log middleware.
+
+Loggers only put records on a queue (QueueHandler); a QueueListener thread
+formats them and writes to the console and the rotating log file, so no
+handler I/O runs on the event loop. Records travel unformatted: messages
+use %-style arguments and are rendered by the listener thread, and values
+passed as arguments or extra= must not be mutated after the call.
+
+With LOG_FORMAT=json every record is written as one JSON object carrying
+the fields passed with extra=, e.g. the method, path, status and duration
+of request log records.
+"""
+import atexit
+import json
+import logging
+import logging.config
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+from .config import settings
+
+logger = logging.getLogger("app.requests")
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DETAILED_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message and extra= fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records as they are. The stock prepare()
+    formats the message on the calling thread so records can be pickled;
+    the queue here never leaves the process, so that work is left to the
+    listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _not_sql(record: logging.LogRecord) -> bool:
+    # SQLAlchemy engine warnings go to the log file only
+    return not record.name.startswith("sqlalchemy.engine")
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> None:
+    """Route every logger through one queue drained by a listener thread."""
+    global _listener
+    stop_logging()
+
+    log_path = Path(settings.LOG_FILE)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if settings.LOG_FORMAT == "json":
+        console_formatter = file_formatter = JSONFormatter()
+    else:
+        console_formatter = logging.Formatter(TEXT_FORMAT, DATE_FORMAT)
+        file_formatter = logging.Formatter(DETAILED_FORMAT, DATE_FORMAT)
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(settings.LOG_LEVEL)
+    console.setFormatter(console_formatter)
+    console.addFilter(_not_sql)
+    log_file = RotatingFileHandler(
+        settings.LOG_FILE, mode="a", maxBytes=10485760, backupCount=5, encoding="utf-8"  # 10MB
+    )
+    log_file.setLevel(settings.LOG_LEVEL)
+    log_file.setFormatter(file_formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, console, log_file, respect_handler_level=True)
+    _listener.start()
+
+    logging.config.dictConfig({
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {
+            "queue": {"()": DeferredQueueHandler, "queue": log_queue},
+        },
+        "loggers": {
+            "": {"handlers": ["queue"], "level": settings.LOG_LEVEL, "propagate": False},  # Root logger
+            "app": {"handlers": ["queue"], "level": settings.LOG_LEVEL, "propagate": False},
+            "uvicorn": {"handlers": ["queue"], "level": "INFO", "propagate": False},
+            "uvicorn.access": {"handlers": ["queue"], "level": "INFO", "propagate": False},
+            "sqlalchemy.engine": {"handlers": ["queue"], "level": "WARNING", "propagate": False},
+        },
+    })
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+class RequestLogMiddleware:
+    """
+    Logs one record per HTTP request: every error response and unhandled
+    exception, and a sample_rate fraction of the other requests. Pure ASGI,
+    so requests do not pay for BaseHTTPMiddleware's extra task and body
+    streaming; the record is only built when it will be logged.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            logger.error("Unhandled exception for %s %s: %s", scope["method"], scope["path"], e)
+            raise
+
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400:
+            level = logging.WARNING
+        elif self.sample_rate >= 1 or random.random() < self.sample_rate:
+            level = logging.INFO
+        else:
+            return
+        if not logger.isEnabledFor(level):
+            return
+
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        headers = dict(scope["headers"])
+        client = scope.get("client")
+        logger.log(
+            level, "%s %s - %d - %.2fms", scope["method"], scope["path"], status_code, duration_ms,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope["query_string"].decode("latin-1") or None,
+                "status_code": status_code,
+                "duration_ms": duration_ms,
+                "client_host": client[0] if client else None,
+                "user_agent": headers.get(b"user-agent", b"").decode("latin-1") or None,
+            }
+        )
@@ -0,0 +1,149 @@
+"""
+Process fan-out for events that every uvicorn worker must see.
+
+LocalBroker delivers messages within the current process and is used for
+single-worker deployments and tests. RedisBroker relays them through Redis
+pub/sub so that all workers receive them; it needs the optional ``redis``
+package and is selected by setting PUBSUB_URL. Messages published while a
+worker is disconnected from Redis are lost to it, so callbacks registered
+with on_reconnect run once it has resubscribed, to drop whatever state the
+missed messages would have invalidated.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+Subscriber = Callable[[Dict[str, Any]], None]
+
+RECONNECT_MIN_DELAY_SECONDS = 0.5
+RECONNECT_MAX_DELAY_SECONDS = 30
+
+
+class LocalBroker:
+    """In-process broker; publish delivers to local subscribers immediately."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Subscriber]] = defaultdict(list)
+        self._reconnect_callbacks: List[Callable[[], None]] = []
+
+    def subscribe(self, channel: str, callback: Subscriber) -> None:
+        self._subscribers[channel].append(callback)
+
+    def unsubscribe(self, channel: str, callback: Subscriber) -> None:
+        if callback in self._subscribers.get(channel, []):
+            self._subscribers[channel].remove(callback)
+
+    def on_reconnect(self, callback: Callable[[], None]) -> None:
+        """Run callback after messages may have been missed, e.g. a lost Redis connection."""
+        self._reconnect_callbacks.append(callback)
+
+    def _reconnected(self) -> None:
+        for callback in list(self._reconnect_callbacks):
+            try:
+                callback()
+            except Exception as e:
+                logger.error("Reconnect callback failed: %s", e)
+
+    def _dispatch(self, channel: str, message: Dict[str, Any]) -> None:
+        for callback in list(self._subscribers.get(channel, [])):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error("Subscriber for %s failed: %s", channel, e)
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self._dispatch(channel, message)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisBroker(LocalBroker):
+    """
+    Broker relaying messages through Redis so every worker receives them.
+    Channels are subscribed in Redis at start(), so subscribe before starting.
+    """
+
+    def __init__(self, url: str):
+        super().__init__()
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("PUBSUB_URL is set but the 'redis' package is not installed") from e
+        self._redis = redis.from_url(url)
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        # Delivered back to this worker through the listener as well
+        await self._redis.publish(channel, json.dumps(message))
+
+    async def start(self) -> None:
+        if not self._subscribers:
+            return
+        await self._subscribe()
+        self._listener = asyncio.create_task(self._listen())
+        logger.info("Redis broker listening on %d channels", len(self._subscribers))
+
+    async def _subscribe(self) -> None:
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(*self._subscribers)
+
+    async def _listen(self) -> None:
+        """Dispatch messages, resubscribing with backoff whenever the connection drops."""
+        delay = RECONNECT_MIN_DELAY_SECONDS
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._subscribe()
+                    logger.info("Redis broker resubscribed to %d channels", len(self._subscribers))
+                    self._reconnected()
+                    delay = RECONNECT_MIN_DELAY_SECONDS
+                async for raw in self._pubsub.listen():
+                    try:
+                        channel = raw["channel"].decode() if isinstance(raw["channel"], bytes) else raw["channel"]
+                        self._dispatch(channel, json.loads(raw["data"]))
+                    except Exception as e:
+                        logger.error("Dropping malformed broker message: %s", e)
+                raise ConnectionError("subscription ended")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Redis broker connection lost, resubscribing in %.1fs: %s", delay, e)
+                await self._close_pubsub()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+
+    async def _close_pubsub(self) -> None:
+        if self._pubsub is not None:
+            pubsub, self._pubsub = self._pubsub, None
+            try:
+                await pubsub.aclose()
+            except Exception as e:
+                logger.debug("Closing the Redis subscription failed: %s", e)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self._close_pubsub()
+        await self._redis.aclose()
+
+
+def create_broker() -> LocalBroker:
+    if settings.PUBSUB_URL:
+        return RedisBroker(settings.PUBSUB_URL)
+    return LocalBroker()
+
+
+# Global broker instance
+broker = create_broker()
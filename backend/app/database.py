@@ -1,50 +1,175 @@
+import asyncio
 import logging
-from typing import AsyncGenerator
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy import Select, event, text
 from fastapi import HTTPException, status
 
 from .core.config import settings
+from .core.metrics import metrics
+from .core.pubsub import broker
 from .models import Base, User, Password  # Import models to register them
+from .utils.cache import TTLCache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+POOL_WAIT = metrics.histogram(
+    "passman_db_pool_wait_seconds",
+    "Time spent obtaining a database connection from the pool",
+)
+POOL_TIMEOUTS = metrics.counter(
+    "passman_db_pool_timeouts_total",
+    "Connection requests that gave up after DB_POOL_TIMEOUT_SECONDS",
+)
+ROUTED_READS = metrics.counter(
+    "passman_db_routed_reads_total",
+    "Read-only request sessions by the engine serving them",
+    labelnames=("target",),
+)
+
+WRITES_CHANNEL = "passman:user-writes"
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time and timeouts."""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started)
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to the read engine in ``info["read_bind"]``,
+    set only by read_only_session, and everything else (flushes, DML, locking reads) to the write engine.
+    Once a session has written, later reads also use the writer so the
+    request sees its own uncommitted changes. ``info["wrote"]`` also tells
+    get_db whether the unit of work has anything to commit.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            read_bind = self.info.get("read_bind")
+            if read_bind is not None and not self.info.get("wrote"):
+                return read_bind
+        else:
+            self.info["wrote"] = True
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+def _apply_sqlite_pragmas(dbapi_connection, pragmas: tuple) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in pragmas:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+class Replica:
+    """A read replica engine and the result of its last health check."""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.healthy = True
+
 class DatabaseManager:
     """Database manager for handling connections and sessions."""
     
     def __init__(self):
         self.engine = None
+        self.read_engine = None
+        self.replicas: List[Replica] = []
         self.async_session = None
         self._initialized = False
+        self._next_replica = 0
+        self._health_task: Optional[asyncio.Task] = None
+        # Users who wrote within READ_YOUR_WRITES_SECONDS read from the primary
+        self._recent_writers = TTLCache(maxsize=100000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+        broker.subscribe(WRITES_CHANNEL, self._on_write)
+    
+    def pool_stat(self, name: str) -> float:
+        """Read a pool counter (checkedout, overflow, size, checkedin) for metrics."""
+        if self.engine is None:
+            return 0
+        return getattr(self.engine.pool, name)()
+    
+    def _engine_options(self, url: str) -> tuple:
+        """Engine URL and keyword arguments for the configured database."""
+        if "sqlite" in url:
+            return url, {
+                "connect_args": {
+                    "check_same_thread": False,
+                    "timeout": settings.SQLITE_BUSY_TIMEOUT_SECONDS,
+                },
+                "pool_size": 1,
+                "max_overflow": 0,
+            }
+        
+        connect_args = {}
+        if make_url(url).get_driver_name() == "asyncpg":
+            # Prepared statement caches on both layers; set to 0 behind a
+            # transaction-pooling proxy such as PgBouncer
+            url = make_url(url).update_query_dict(
+                {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+            )
+            connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        return url, {
+            "connect_args": connect_args,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        }
     
     def initialize(self):
         """Initialize the database engine and session factory."""
         if self._initialized:
             return
         
-        logger.info(f"Initializing database with URL: {settings.DATABASE_URL}")
+        logger.info("Initializing database with URL: %s", settings.DATABASE_URL)
         
-        # Create async engine with proper SQLite configuration
-        self.engine = create_async_engine(
-            settings.DATABASE_URL,
-            echo=settings.DEBUG,
-            pool_pre_ping=True,
-            # SQLite specific settings
-            connect_args={
-                "check_same_thread": False,
-                "timeout": 20,
-            } if "sqlite" in settings.DATABASE_URL else {},
-            # Connection pool settings
-            pool_size=5 if "sqlite" not in settings.DATABASE_URL else 1,
-            max_overflow=10 if "sqlite" not in settings.DATABASE_URL else 0,
-        )
+        url, options = self._engine_options(settings.DATABASE_URL)
+        self.engine = self._create_engine(url, **options)
+        
+        if "sqlite" in settings.DATABASE_URL and settings.SQLITE_WAL:
+            # WAL lets readers run alongside the single writer connection,
+            # whose FIFO checkout queue serializes this worker's writes
+            self._on_connect(self.engine, (
+                "journal_mode=WAL",
+                *self._sqlite_tuning_pragmas(),
+            ))
+            options["pool_size"] = settings.SQLITE_READ_POOL_SIZE
+            self.read_engine = self._create_engine(url, **options)
+            self._on_connect(self.read_engine, (
+                *self._sqlite_tuning_pragmas(),
+                "query_only=ON",
+            ))
+        
+        for replica_url in settings.DATABASE_REPLICA_URLS:
+            url, options = self._engine_options(replica_url)
+            replica = Replica(self._create_engine(url, **options))
+            if "sqlite" in replica_url:
+                self._on_connect(replica.engine, ("query_only=ON",))
+            self.replicas.append(replica)
+        if self.replicas:
+            logger.info("Routing reads to %d replicas", len(self.replicas))
         
         # Create async session factory
         self.async_session = async_sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
+            sync_session_class=RoutingSession,
             expire_on_commit=False,
             autoflush=True,
             autocommit=False
@@ -53,6 +178,33 @@ class DatabaseManager:
         self._initialized = True
         logger.info("Database engine initialized successfully")
     
+    def _create_engine(self, url, **options):
+        return create_async_engine(
+            url,
+            echo=settings.DB_ECHO,
+            poolclass=InstrumentedQueuePool,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            **options
+        )
+    
+    @staticmethod
+    def _sqlite_tuning_pragmas() -> tuple:
+        return (
+            f"synchronous={settings.SQLITE_SYNCHRONOUS}",
+            f"mmap_size={settings.SQLITE_MMAP_SIZE}",
+            f"cache_size={settings.SQLITE_CACHE_SIZE}",
+        )
+    
+    @staticmethod
+    def _on_connect(engine, pragmas: tuple) -> None:
+        """Apply SQLite pragmas to every new connection of an engine."""
+        event.listen(
+            engine.sync_engine,
+            "connect",
+            lambda dbapi_connection, _: _apply_sqlite_pragmas(dbapi_connection, pragmas)
+        )
+    
     async def create_tables(self):
         """Create all database tables."""
         if not self._initialized:
@@ -64,7 +216,7 @@ class DatabaseManager:
                 await conn.run_sync(Base.metadata.create_all)
             logger.info("Database tables created successfully")
         except Exception as e:
-            logger.error(f"Error creating database tables: {e}")
+            logger.error("Error creating database tables: %s", e)
             raise
     
     async def verify_connection(self):
@@ -77,11 +229,79 @@ class DatabaseManager:
                 await conn.execute(text("SELECT 1"))
             logger.info("Database connection verified successfully")
         except Exception as e:
-            logger.error(f"Database connection failed: {e}")
+            logger.error("Database connection failed: %s", e)
             raise
     
+    def replica_for(self, user_id: Optional[str]):
+        """
+        Sync engine of the next healthy replica, or None to read from the
+        primary because there is none or the user wrote recently.
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy or (user_id is not None and self._recent_writers.get(user_id)):
+            return None
+        self._next_replica = (self._next_replica + 1) % len(healthy)
+        return healthy[self._next_replica].engine.sync_engine
+    
+    async def note_write(self, user_id: Optional[str]) -> None:
+        """Pin a user's reads to the primary for READ_YOUR_WRITES_SECONDS, on every worker."""
+        if user_id is None or not self.replicas:
+            return
+        self._recent_writers.set(user_id, True)
+        await broker.publish(WRITES_CHANNEL, {"user_id": user_id})
+    
+    def _on_write(self, message: dict) -> None:
+        if message.get("user_id"):
+            self._recent_writers.set(message["user_id"], True)
+    
+    async def check_replicas(self) -> None:
+        """Mark each replica healthy or not with a bounded SELECT 1."""
+        for replica in self.replicas:
+            try:
+                await asyncio.wait_for(
+                    self._ping(replica.engine),
+                    timeout=settings.REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS
+                )
+                healthy = True
+            except Exception as e:
+                healthy = False
+                if replica.healthy:
+                    logger.warning("Replica %r failed its health check: %s", replica.engine.url, e)
+            if healthy and not replica.healthy:
+                logger.info("Replica %r is healthy again", replica.engine.url)
+            replica.healthy = healthy
+    
+    @staticmethod
+    async def _ping(engine) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    
+    async def _health_loop(self) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL_SECONDS)
+    
+    def start_health_checks(self) -> None:
+        if self.replicas and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+    
+    async def stop_health_checks(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+    
     async def close(self):
         """Close database connections."""
+        await self.stop_health_checks()
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        self.replicas = []
+        if self.read_engine:
+            await self.read_engine.dispose()
         if self.engine:
             await self.engine.dispose()
             logger.info("Database connections closed")
@@ -90,6 +310,22 @@ class DatabaseManager:
 # Global database manager instance
 db_manager = DatabaseManager()
 
+metrics.gauge(
+    "passman_db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    callback=lambda: db_manager.pool_stat("checkedout"),
+)
+metrics.gauge(
+    "passman_db_pool_overflow",
+    "Connections open beyond DB_POOL_SIZE (negative while the pool is still filling)",
+    callback=lambda: db_manager.pool_stat("overflow"),
+)
+metrics.gauge(
+    "passman_db_pool_size",
+    "Configured number of pooled connections",
+    callback=lambda: db_manager.pool_stat("size"),
+)
+
 async def init_db():
     """Initialize database and create tables."""
     try:
@@ -98,28 +334,57 @@ async def init_db():
         await db_manager.create_tables()
         logger.info("Database initialization completed successfully")
     except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
+        logger.error("Database initialization failed: %s", e)
         raise
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session."""
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run callback once get_db has committed the request's unit of work."""
+    session.info.setdefault("after_commit", []).append(callback)
+
+@asynccontextmanager
+async def unit_of_work(read_bind=None) -> AsyncIterator[AsyncSession]:
+    """
+    A request's unit of work.
+    
+    Handlers add, modify and flush but never commit; the session is committed
+    once after the handler returns, and only if it wrote something, so
+    read-only requests end without a COMMIT. Callbacks registered with
+    after_commit run after a successful commit. ``read_bind`` overrides
+    where plain SELECTs go, e.g. a replica.
+    """
     if not db_manager._initialized:
         db_manager.initialize()
     
     async with db_manager.async_session() as session:
+        if read_bind is not None:
+            session.info["read_bind"] = read_bind
         try:
             yield session
-            await session.commit()
+            if session.info.get("wrote") or session.new or session.dirty or session.deleted:
+                await session.commit()
+                await db_manager.note_write(session.info.get("user_id"))
+            for callback in session.info.pop("after_commit", ()):
+                await callback()
+        except HTTPException:
+            await session.rollback()
+            raise
+        except PoolTimeoutError:
+            logger.warning("Database connection pool exhausted, rejecting request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
         except SQLAlchemyError as e:
             await session.rollback()
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Database operation failed"
             )
         except Exception as e:
             await session.rollback()
-            logger.error(f"Unexpected error in database session: {e}")
+            logger.error("Unexpected error in database session: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An unexpected error occurred"
@@ -127,6 +392,31 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get database session. Every statement runs on the writer,
+    so a handler's read-modify-write is one transaction on one connection.
+    """
+    async with unit_of_work() as session:
+        yield session
+
+@asynccontextmanager
+async def read_only_session(user_id: Optional[str], replica: bool = True) -> AsyncIterator[AsyncSession]:
+    """
+    Session whose reads go to a healthy replica unless the user wrote within
+    READ_YOUR_WRITES_SECONDS or ``replica`` is False, and otherwise to the
+    SQLite WAL read pool if there is one. Used by the read-only dependencies
+    in routers.auth.
+    """
+    if not db_manager._initialized:
+        db_manager.initialize()
+    read_bind = db_manager.replica_for(user_id) if replica else None
+    ROUTED_READS.inc(target="primary" if read_bind is None else "replica")
+    if read_bind is None and db_manager.read_engine is not None:
+        read_bind = db_manager.read_engine.sync_engine
+    async with unit_of_work(read_bind) as session:
+        yield session
+
 async def close_db():
     """Close database connections."""
     await db_manager.close()
@@ -1,91 +1,19 @@
 import logging
-import logging.config
-import sys
-from pathlib import Path
 from datetime import datetime
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .core.config import settings
-from .database import init_db, close_db
-from .routers import auth, passwords, users, unsafe
-
-# Configure logging
-def setup_logging():
-    """Setup application logging configuration."""
-    
-    # Ensure log directory exists
-    log_path = Path(settings.LOG_FILE)
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    logging_config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "default": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S",
-            },
-            "detailed": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S",
-            },
-            "access": {
-                "format": "%(asctime)s - ACCESS - %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S",
-            },
-        },
-        "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": settings.LOG_LEVEL,
-                "formatter": "default",
-                "stream": sys.stdout,
-            },
-            "file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "level": settings.LOG_LEVEL,
-                "formatter": "detailed",
-                "filename": settings.LOG_FILE,
-                "mode": "a",
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
-                "encoding": "utf-8",
-            },
-        },
-        "loggers": {
-            "": {  # Root logger
-                "handlers": ["console", "file"],
-                "level": settings.LOG_LEVEL,
-                "propagate": False,
-            },
-            "app": {  # Application logger
-                "handlers": ["console", "file"],
-                "level": settings.LOG_LEVEL,
-                "propagate": False,
-            },
-            "uvicorn": {
-                "handlers": ["console", "file"],
-                "level": "INFO",
-                "propagate": False,
-            },
-            "uvicorn.access": {
-                "handlers": ["console", "file"],
-                "level": "INFO",
-                "propagate": False,
-            },
-            "sqlalchemy.engine": {
-                "handlers": ["file"],
-                "level": "WARNING",
-                "propagate": False,
-            },
-        },
-    }
-    
-    logging.config.dictConfig(logging_config)
+from .core.logs import RequestLogMiddleware, setup_logging
+from .core.metrics import metrics
+from .core.pubsub import broker
+from .database import db_manager, init_db, close_db
+from .routers import auth, passwords, tags, users, unsafe, vault_feed
+from .utils.crypto import shutdown_crypto_executor
+from .utils.hashing import hasher
 
 # Setup logging
 setup_logging()
@@ -95,15 +23,17 @@ logger = logging.getLogger("app.main")
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
-    logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
-    logger.info(f"Environment: {'Development' if settings.is_development else 'Production'}")
+    logger.info("Starting %s v%s", settings.PROJECT_NAME, settings.VERSION)
+    logger.info("Debug mode: %s", settings.DEBUG)
+    logger.info("Environment: %s", "Development" if settings.is_development else "Production")
     
     try:
         await init_db()
+        await broker.start()
+        db_manager.start_health_checks()
         logger.info("Application startup completed successfully")
     except Exception as e:
-        logger.error(f"Application startup failed: {e}")
+        logger.error("Application startup failed: %s", e)
         raise
     
     yield
@@ -111,10 +41,13 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down application...")
     try:
+        await broker.stop()
+        hasher.shutdown()
+        shutdown_crypto_executor()
         await close_db()
         logger.info("Application shutdown completed successfully")
     except Exception as e:
-        logger.error(f"Error during application shutdown: {e}")
+        logger.error("Error during application shutdown: %s", e)
 
 # Create FastAPI application
 app = FastAPI(
@@ -133,52 +66,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Vault-Version"],
 )
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log HTTP requests and responses."""
-    start_time = datetime.utcnow()
-    
-    # Process request
-    try:
-        response = await call_next(request)
-    except Exception as e:
-        # Log unhandled exceptions
-        logger.error(f"Unhandled exception for {request.method} {request.url}: {e}")
-        raise
-    
-    # Calculate request duration
-    end_time = datetime.utcnow()
-    duration = (end_time - start_time).total_seconds() * 1000
-    
-    # Log request details
-    log_data = {
-        "method": request.method,
-        "path": str(request.url.path),
-        "query": str(request.url.query) if request.url.query else None,
-        "status_code": response.status_code,
-        "duration_ms": round(duration, 2),
-        "client_host": request.client.host if request.client else None,
-        "user_agent": request.headers.get("user-agent"),
-    }
-    
-    # Log at appropriate level based on status code
-    if response.status_code >= 500:
-        logger.error(f"Server error: {log_data}")
-    elif response.status_code >= 400:
-        logger.warning(f"Client error: {log_data}")
-    else:
-        logger.info(f"Request: {request.method} {request.url.path} - {response.status_code} - {duration:.2f}ms")
-    
-    return response
+# Request logging middleware (outermost, so it times the whole stack)
+app.add_middleware(RequestLogMiddleware, sample_rate=settings.LOG_REQUEST_SAMPLE_RATE)
 
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle uncaught exceptions."""
-    logger.error(f"Global exception handler caught: {type(exc).__name__}: {exc}")
+    logger.error("Global exception handler caught: %s: %s", type(exc).__name__, exc)
     
     if settings.DEBUG:
         # In debug mode, return detailed error information
@@ -200,7 +98,9 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_STR, tags=["authentication"])
 app.include_router(passwords.router, prefix=settings.API_V1_STR, tags=["passwords"])
+app.include_router(tags.router, prefix=settings.API_V1_STR, tags=["tags"])
 app.include_router(users.router, prefix=settings.API_V1_STR, tags=["users"])
+app.include_router(vault_feed.router, prefix=settings.API_V1_STR, tags=["vault feed"])
 
 # Include unsafe router only in debug mode
 if settings.DEBUG:
@@ -226,6 +126,11 @@ async def health_check():
         "timestamp": datetime.utcnow().isoformat(),
     }
 
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus metrics for this worker process."""
+    return metrics.render()
+
 @app.get("/info", tags=["info"])
 async def app_info():
     """Application information endpoint."""
@@ -239,7 +144,7 @@ async def app_info():
 if __name__ == "__main__":
     import uvicorn
     
-    logger.info(f"Starting server on {settings.HOST}:{settings.PORT}")
+    logger.info("Starting server on %s:%s", settings.HOST, settings.PORT)
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
@@ -1,35 +0,0 @@
-from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-
-class Base(DeclarativeBase):
-    pass
-
-class User(Base):
-    __tablename__ = "users"
-
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    username: Mapped[str] = mapped_column(String(50), unique=True, index=True)
-    email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
-    hashed_password: Mapped[str] = mapped_column(String(255))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-    passwords = relationship("Password", back_populates="user", cascade="all, delete-orphan")
-
-class Password(Base):
-    __tablename__ = "passwords"
-
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"))
-    title: Mapped[str] = mapped_column(String(255))
-    username: Mapped[str] = mapped_column(String(255))
-    encrypted_password: Mapped[str] = mapped_column(String(1024))  # Encrypted with AES-GCM
-    url: Mapped[str | None] = mapped_column(String(1024), nullable=True)
-    notes: Mapped[str | None] = mapped_column(String(4096), nullable=True)
-    tags: Mapped[list[str]] = mapped_column(JSON, default=list)
-    iv: Mapped[str] = mapped_column(String(32))  # Initialization vector for AES-GCM
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-    user = relationship("User", back_populates="passwords") 
\ No newline at end of file
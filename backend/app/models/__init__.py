@@ -5,5 +5,9 @@ class Base(DeclarativeBase):
 
 from .user import User
 from .password_entry import Password
+from .password_tag import PasswordTag
+from .password_blind_token import PasswordBlindToken
+from .password_tombstone import PasswordTombstone
+from .rotation_checkpoint import RotationCheckpoint
 
-__all__ = ["Base", "User", "Password"]
+__all__ = ["Base", "User", "Password", "PasswordTag", "PasswordBlindToken", "PasswordTombstone", "RotationCheckpoint"]
@@ -0,0 +1,21 @@
+from sqlalchemy import String, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import mapped_column, Mapped
+from . import Base
+
+
+class PasswordBlindToken(Base):
+    """
+    Blind index of an entry with sealed metadata: one keyed HMAC token per
+    normalized username, username prefix, domain and host prefix, see
+    utils.metadata. Lookups match tokens instead of decrypting the vault.
+    """
+    __tablename__ = "password_blind_index"
+    __table_args__ = (
+        Index("ix_password_blind_index_user_token", "user_id", "token", "password_id"),
+    )
+
+    password_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("passwords.id", ondelete="CASCADE"), primary_key=True
+    )
+    token: Mapped[bytes] = mapped_column(LargeBinary(16), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"))
@@ -1,23 +1,91 @@
+import sqlite3
 import uuid, datetime as dt
-from typing import List
-from sqlalchemy import String, LargeBinary, DateTime, ForeignKey, JSON
+from typing import List, Optional
+from sqlalchemy import DDL, String, LargeBinary, DateTime, ForeignKey, Integer, JSON, Index, Text, event
 from sqlalchemy.orm import mapped_column, Mapped
 from . import Base
 
 
 class Password(Base):
     __tablename__ = "passwords"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id) within a user's vault
+        Index("ix_passwords_user_created_id", "user_id", "created_at", "id"),
+        # Delta sync: entries changed since a vault version
+        Index("ix_passwords_user_version", "user_id", "version"),
+    )
+    # Fetch server-generated values with RETURNING at flush time instead of
+    # expiring them for a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True)
     title: Mapped[str] = mapped_column(String(255))
     username: Mapped[str] = mapped_column(String(255))
-    encrypted_password: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # version byte || nonce || AES-GCM ciphertext, see utils.crypto
+    ciphertext: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Owner's data key generation that sealed ciphertext; 0 means the master key
+    key_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     url: Mapped[str] = mapped_column(String(1024), nullable=True)
     notes: Mapped[str] = mapped_column(String(4096), nullable=True)
     tags: Mapped[List[str]] = mapped_column(JSON, nullable=True, default=list)
-    iv: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # title, username and url sealed with the owner's data key when
+    # ENCRYPT_METADATA is on; the plaintext columns are then left blank
+    sealed_metadata: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # Lowercased title, username, url host and tags, one per line; see utils.search
+    search_text: Mapped[str] = mapped_column(Text, default="", server_default="")
+    # Owner's vault version at the entry's last write, see utils.vault_sync
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    # Key of the entry in the SQLite FTS5 index, assigned by its insert
+    # trigger; unused on PostgreSQL
+    search_rowid: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime, default=dt.datetime.utcnow
     )
+    updated_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, default=dt.datetime.utcnow, onupdate=dt.datetime.utcnow
+    )
+
+
+# Search index over search_text, created with the table. Kept in step with
+# the migration that adds it to existing databases.
+# SQLite: an external-content FTS5 table with the trigram tokenizer (3.34+),
+# synced by triggers. It is keyed on passwords.search_rowid rather than the
+# implicit rowid, which VACUUM may renumber since the primary key is a string;
+# the insert trigger gives each entry the next free key.
+FTS5_TRIGRAM = sqlite3.sqlite_version_info >= (3, 34, 0)
 
+SQLITE_SEARCH_DDL = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_passwords_search_rowid ON passwords (search_rowid)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS password_search USING fts5("
+    "search_text, content='passwords', content_rowid='search_rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_ai AFTER INSERT ON passwords BEGIN "
+    "UPDATE passwords SET search_rowid = (SELECT coalesce(max(search_rowid), 0) + 1 FROM passwords) "
+    "WHERE rowid = new.rowid; "
+    "INSERT INTO password_search(rowid, search_text) "
+    "SELECT search_rowid, search_text FROM passwords WHERE rowid = new.rowid; END",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_ad AFTER DELETE ON passwords BEGIN "
+    "INSERT INTO password_search(password_search, rowid, search_text) "
+    "VALUES ('delete', old.search_rowid, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS passwords_search_au AFTER UPDATE OF search_text ON passwords BEGIN "
+    "INSERT INTO password_search(password_search, rowid, search_text) "
+    "VALUES ('delete', old.search_rowid, old.search_text); "
+    "INSERT INTO password_search(rowid, search_text) VALUES (new.search_rowid, new.search_text); END",
+)
+
+# PostgreSQL: a trigram GIN index led by user_id (btree_gin), so a search
+# only visits the owner's entries.
+POSTGRES_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    "CREATE INDEX IF NOT EXISTS ix_passwords_user_search_trgm ON passwords "
+    "USING gin (user_id, search_text gin_trgm_ops)",
+)
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Password.__table__, "after_create",
+        DDL(statement).execute_if(dialect="sqlite", callable_=lambda *args, **kw: FTS5_TRIGRAM)
+    )
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(Password.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
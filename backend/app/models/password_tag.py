@@ -0,0 +1,24 @@
+from sqlalchemy import String, ForeignKey, Index
+from sqlalchemy.orm import mapped_column, Mapped
+from . import Base
+
+MAX_TAG_LENGTH = 255
+
+
+class PasswordTag(Base):
+    """
+    One tag of a vault entry. Filtering and per-tag counts run against this
+    table; passwords.tags keeps the entry's tags in order for responses.
+    """
+    __tablename__ = "password_tags"
+    __table_args__ = (
+        # Tag filters and counts within a user's vault
+        Index("ix_password_tags_user_tag", "user_id", "tag", "password_id"),
+    )
+
+    password_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("passwords.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag: Mapped[str] = mapped_column(String(MAX_TAG_LENGTH), primary_key=True)
+    # Denormalized owner, so counts never join passwords
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"))
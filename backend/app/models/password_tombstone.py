@@ -0,0 +1,23 @@
+import datetime as dt
+from sqlalchemy import String, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.orm import mapped_column, Mapped
+from . import Base
+
+
+class PasswordTombstone(Base):
+    """
+    Record of a deleted vault entry, so delta sync (GET /passwords/changes)
+    can tell clients to drop it. Kept after the entry itself is gone.
+    """
+    __tablename__ = "password_tombstones"
+    __table_args__ = (
+        Index("ix_password_tombstones_user_version", "user_id", "version"),
+    )
+
+    password_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"))
+    # Owner's vault version of the delete
+    version: Mapped[int] = mapped_column(Integer)
+    deleted_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, default=dt.datetime.utcnow
+    )
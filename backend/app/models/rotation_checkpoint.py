@@ -0,0 +1,20 @@
+import datetime as dt
+from typing import Optional
+from sqlalchemy import String, DateTime, Integer
+from sqlalchemy.orm import mapped_column, Mapped
+from . import Base
+
+
+class RotationCheckpoint(Base):
+    """Progress of a resumable re-encryption pass over the passwords table."""
+    __tablename__ = "key_rotation_checkpoints"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # Highest passwords.id processed; the next batch starts after it
+    last_id: Mapped[str] = mapped_column(String(36), default="")
+    rows_reencrypted: Mapped[int] = mapped_column(Integer, default=0)
+    started_at: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
+    updated_at: Mapped[dt.datetime] = mapped_column(
+        DateTime, default=dt.datetime.utcnow, onupdate=dt.datetime.utcnow
+    )
+    completed_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime, nullable=True)
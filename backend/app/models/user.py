@@ -1,15 +1,29 @@
 import uuid, datetime as dt
-from sqlalchemy import String, DateTime
+from typing import Optional
+from sqlalchemy import String, DateTime, Integer, LargeBinary
 from sqlalchemy.orm import mapped_column, Mapped
 from . import Base
 
 class User(Base):
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     email: Mapped[str]    = mapped_column(String(255), unique=True, index=True)
     username: Mapped[str] = mapped_column(String(64), unique=True, index=True)
     hashed_password: Mapped[str]
+    # Per-user data key sealed under the master key; NULL until first assigned
+    wrapped_dek: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # Generation of wrapped_dek; entries record the generation that sealed them
+    key_version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    # Data key being rotated away from, kept until no entry still uses it
+    previous_wrapped_dek: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # Bumped by every write to the user's entries, see utils.vault_sync. Only
+    # read and written with Core statements; cached principals may hold a stale copy
+    vault_version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    # Highest vault version whose tombstones may have been pruned; delta sync
+    # from an older version needs a full resync
+    tombstone_floor: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime, default=dt.datetime.utcnow
     )
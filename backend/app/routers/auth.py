@@ -1,9 +1,10 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from typing import Annotated
+from typing import Annotated, AsyncGenerator
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import uuid4
 from sqlalchemy import select, or_
@@ -11,39 +12,138 @@ import logging
 from sqlalchemy.exc import SQLAlchemyError
 
 from ..core.config import settings
-from ..database import get_db
+from ..core.metrics import metrics
+from ..database import get_db, read_only_session
 from ..models import User
 from ..schemas.auth import Token, UserCreate, UserResponse
+from ..utils.cache import TTLCache
+from ..utils.hashing import HashingBusyError, hasher
+from ..utils.keyring import keyring
+from ..utils.user_cache import user_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: AsyncSession = Depends(get_db)
-) -> User:
+# Verified claims keyed by token digest; each entry expires with its token
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAXSIZE if settings.TOKEN_CACHE_ENABLED else 0,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+TOKEN_CACHE_HITS = metrics.counter(
+    "passman_token_cache_hits_total",
+    "Bearer tokens whose verified claims were served from cache",
+)
+TOKEN_CACHE_MISSES = metrics.counter(
+    "passman_token_cache_misses_total",
+    "Bearer tokens that had to be decoded and verified",
+)
+
+def hashing_unavailable(exc: HashingBusyError) -> HTTPException:
+    """Build the 503 response returned when the hashing queue is full."""
+    logger.warning("Password hashing queue full, rejecting request")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a bearer token and return its claims.
+    Raises JWTError if the token is invalid or expired.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(digest)
+    if claims is not None:
+        TOKEN_CACHE_HITS.inc()
+        return claims
+    
+    TOKEN_CACHE_MISSES.inc()
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    expires_at = claims.get("exp")
+    if expires_at is not None:
+        token_cache.set(digest, claims, ttl=expires_at - time.time())
+    return claims
+
+async def _authenticate(token: str, db: AsyncSession) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-        
+    
+    # Lets the unit of work pin this user's reads to the primary after a write
+    db.info["user_id"] = user_id
+    user = user_cache.get(user_id)
+    if user is not None:
+        # Attach without a SELECT; reuses the session's instance if already loaded
+        return await db.merge(user, load=False)
+    
     user = await db.get(User, user_id)
     if user is None:
         raise credentials_exception
+    user_cache.set(user)
     return user
 
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    return await _authenticate(token, db)
+
+async def get_read_db(
+    token: Annotated[str, Depends(oauth2_scheme)]
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only endpoints, served by a replica unless the token's
+    user wrote within READ_YOUR_WRITES_SECONDS.
+    """
+    try:
+        user_id = decode_access_token(token).get("sub")
+    except JWTError:
+        user_id = None
+    async with read_only_session(user_id) as session:
+        yield session
+
+async def get_login_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for login, which only reads: the lookup stays off the SQLite
+    writer connection while the password is verified, and off replicas so a
+    user can log in straight after registering.
+    """
+    async with read_only_session(None, replica=False) as session:
+        yield session
+
+async def get_current_reader(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """get_current_user for read-only endpoints, loading the user from a replica on a cache miss."""
+    return await _authenticate(token, db)
+
+async def authenticate_token(token: str) -> User:
+    """
+    get_current_user for connections outside the request dependencies, such
+    as WebSockets: authenticates in a short-lived read-only session, so no
+    connection is held afterwards. Raises HTTPException like get_current_user.
+    """
+    try:
+        user_id = decode_access_token(token).get("sub")
+    except JWTError:
+        user_id = None
+    async with read_only_session(user_id) as session:
+        return await _authenticate(token, session)
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -65,23 +165,23 @@ async def register(
         db: Database session
     """
     try:
-        logger.info(f"Starting registration process for username: {user_data.username}")
+        logger.debug("Starting registration process for username: %s", user_data.username)
         
         # Log request details for debugging
-        logger.debug(f"Registration request from IP: {request.client.host}")
-        logger.debug(f"Registration data - Username: {user_data.username}, Email: {user_data.email}")
+        logger.debug("Registration request from IP: %s", request.client.host if request.client else None)
+        logger.debug("Registration data - Username: %s, Email: %s", user_data.username, user_data.email)
         
         # Check if user exists
         query = select(User).where(
             or_(User.username == user_data.username, User.email == user_data.email)
         )
-        logger.debug(f"Executing user existence check query: {query}")
+        logger.debug("Executing user existence check query: %s", query)
         
         existing_user = await db.execute(query)
         existing_user = existing_user.scalar_one_or_none()
         
         if existing_user:
-            logger.warning(f"Registration failed: User already exists - Username: {user_data.username}")
+            logger.warning("Registration failed: User already exists - Username: %s", user_data.username)
             # Check which field conflicts
             if existing_user.username == user_data.username:
                 detail = "Username already registered"
@@ -98,28 +198,32 @@ async def register(
         # Create new user
         logger.debug("Creating new user record")
         try:
-            hashed_password = pwd_context.hash(user_data.password)
+            hashed_password = await hasher.hash(user_data.password)
+        except HashingBusyError as e:
+            raise hashing_unavailable(e)
         except Exception as e:
-            logger.error(f"Password hashing failed: {str(e)}")
+            logger.error("Password hashing failed: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error processing password"
             )
         
+        user_id = str(uuid4())
+        db.info["user_id"] = user_id
         db_user = User(
-            id=str(uuid4()),
+            id=user_id,
             username=user_data.username,
             email=user_data.email,
-            hashed_password=hashed_password
+            hashed_password=hashed_password,
+            wrapped_dek=keyring.new_wrapped_key(user_id)
         )
         
         try:
             db.add(db_user)
-            await db.commit()
-            await db.refresh(db_user)
-            logger.info(f"Successfully registered new user: {user_data.username}")
+            await db.flush()
+            logger.info("Successfully registered new user: %s", user_data.username, extra={"user_id": user_id})
         except SQLAlchemyError as e:
-            logger.error(f"Database error during user creation: {str(e)}")
+            logger.error("Database error during user creation: %s", e)
             await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -133,7 +237,7 @@ async def register(
         raise
     except Exception as e:
         # Log unexpected errors
-        logger.error(f"Unexpected error during registration: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during registration: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred during registration"
@@ -143,7 +247,7 @@ async def register(
 async def login(
     request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_login_db)
 ):
     """
     Login user and return access token.
@@ -154,8 +258,11 @@ async def login(
         db: Database session
     """
     try:
-        logger.info(f"Login attempt for username: {form_data.username}")
-        logger.debug(f"Login request from IP: {request.client.host}")
+        # One INFO or WARNING record per login; the attempt itself only at DEBUG
+        logger.debug(
+            "Login attempt for username: %s from IP: %s",
+            form_data.username, request.client.host if request.client else None
+        )
         
         # Authenticate user
         user = await db.execute(
@@ -164,15 +271,20 @@ async def login(
         user = user.scalar_one_or_none()
         
         if not user:
-            logger.warning(f"Login failed: User not found - {form_data.username}")
+            logger.warning("Login failed: User not found - %s", form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        if not pwd_context.verify(form_data.password, user.hashed_password):
-            logger.warning(f"Login failed: Invalid password for user - {form_data.username}")
+        try:
+            password_valid = await hasher.verify(form_data.password, user.hashed_password)
+        except HashingBusyError as e:
+            raise hashing_unavailable(e)
+        
+        if not password_valid:
+            logger.warning("Login failed: Invalid password for user - %s", form_data.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -181,7 +293,7 @@ async def login(
         
         # Create access token
         access_token = create_access_token({"sub": user.id})
-        logger.info(f"Login successful for user: {form_data.username}")
+        logger.info("Login successful for user: %s", form_data.username, extra={"user_id": user.id})
         return Token(access_token=access_token, token_type="bearer")
         
     except HTTPException:
@@ -189,7 +301,7 @@ async def login(
         raise
     except Exception as e:
         # Log unexpected errors
-        logger.error(f"Unexpected error during login: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during login: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred during login"
@@ -1,103 +1,806 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+import logging
+from base64 import b64encode
+from tempfile import SpooledTemporaryFile
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
 from uuid import uuid4
 
 from ..core.config import settings
-from ..database import get_db
+from ..database import db_manager, get_db
 from ..models import User, Password
-from ..schemas.password import PasswordCreate, PasswordResponse, PasswordUpdate
-from ..utils.crypto import encrypt_password, decrypt_password
-from .auth import get_current_user
+from ..schemas.password import (
+    PASSWORD_FIELDS,
+    SUMMARY_FIELDS,
+    BulkItemResult,
+    BulkResult,
+    PasswordBulkCreate,
+    PasswordBulkDelete,
+    PasswordBulkUpdate,
+    PasswordChanges,
+    PasswordCreate,
+    PasswordProjection,
+    PasswordResponse,
+    PasswordRevealRequest,
+    PasswordSecret,
+    PasswordSummary,
+    PasswordUpdate,
+)
+from ..utils.crypto import CryptoEngine, decrypt_batch, encrypt_batch
+from ..utils.keyring import keyring
+from ..utils.metadata import (
+    METADATA_FIELDS,
+    add_blind_tokens,
+    blind_tokens,
+    delete_blind_tokens,
+    load_metadata,
+    metadata_columns,
+    open_items,
+    open_metadata,
+    replace_blind_tokens,
+    seal_batch,
+    seal_metadata,
+)
+from ..utils.pagination import decode_cursor, decode_search_cursor, encode_cursor, encode_search_cursor
+from ..utils.search import refresh_search_text, search_document
+from ..utils.serialization import FastJSONResponse, rows_to_dicts
+from ..utils.tags import add_tags, delete_tags, password_tags, replace_tags
+from ..utils.vault_queries import (
+    vault_changes,
+    vault_entries,
+    vault_export,
+    vault_page,
+    vault_search,
+    vault_tombstones,
+)
+from ..utils.vault_events import CREATE, DELETE, UPDATE, notify_after_commit, vault_feed
+from ..utils.vault_sync import (
+    VERSION_HEADER,
+    add_tombstones,
+    bump_vault_version,
+    current_vault_version,
+    etag_matches,
+    sync_bounds,
+    vault_etag,
+)
+from ..utils.vault_io import (
+    EXPORT_COLUMNS,
+    MEDIA_TYPES,
+    SEALED_EXPORT_COLUMNS,
+    ExportFormat,
+    ImportFormat,
+    csv_header,
+    iter_import_records,
+    serialize_csv,
+    serialize_ndjson,
+)
+from .auth import get_current_reader, get_current_user, get_read_db
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/passwords", tags=["passwords"])
 
+async def get_vault_crypto(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> CryptoEngine:
+    """Dependency returning the engine bound to the current user's data key."""
+    return await keyring.engine_for_user(current_user, db)
+
+async def get_vault_reader_crypto(
+    current_user: User = Depends(get_current_reader),
+    db: AsyncSession = Depends(get_read_db)
+) -> CryptoEngine:
+    """get_vault_crypto for read-only endpoints, sharing their replica-routed session."""
+    return await keyring.engine_for_user(current_user, db)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Fields that make up an entry's search document
+SEARCH_FIELDS = frozenset(("title", "username", "url", "tags"))
+METADATA_FIELDS_SET = frozenset(METADATA_FIELDS)
+
+def _parse_fields(fields: Optional[str]) -> tuple[str, ...]:
+    """Parse a comma-separated ?fields= value; id is always included."""
+    if not fields:
+        return PASSWORD_FIELDS
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(PASSWORD_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.add("id")
+    return tuple(field for field in PASSWORD_FIELDS if field in requested)
+
+def vault_filters(
+    tag: Optional[str] = Query(None, description="Only entries carrying this tag"),
+    title_prefix: Optional[str] = Query(None, description="Case-insensitive title prefix"),
+    domain: Optional[str] = Query(None, description="Only entries whose url host is this domain or a subdomain"),
+    domain_prefix: Optional[str] = Query(None, description="Case-insensitive url host prefix"),
+    username: Optional[str] = Query(None, description="Case-insensitive username"),
+    username_prefix: Optional[str] = Query(None, description="Case-insensitive username prefix")
+) -> dict:
+    """Listing filters, passed on to utils.vault_queries.filter_vault."""
+    return {
+        "tag": tag,
+        "title_prefix": title_prefix,
+        "domain": domain,
+        "domain_prefix": domain_prefix,
+        "username": username,
+        "username_prefix": username_prefix,
+    }
+
+def _decode_after(cursor: Optional[str]) -> Optional[tuple[datetime, str]]:
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+async def _not_modified(request: Request, response: Response, db: AsyncSession, user_id: str) -> bool:
+    """
+    Set the listing's ETag and vault version headers and tell whether the
+    client's If-None-Match already names this response. The version is read
+    before the entries, so a concurrent write can only make the ETag stale.
+    """
+    version = await current_vault_version(db, user_id)
+    etag = vault_etag(user_id, version, request.url.query)
+    response.headers["ETag"] = etag
+    response.headers[VERSION_HEADER] = str(version)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return etag_matches(request.headers.get("if-none-match"), etag)
+
+async def _open_rows(rows: list, fields: tuple[str, ...], crypto: CryptoEngine) -> List[dict]:
+    """Row tuples as dicts of fields, with sealed metadata opened and passwords decrypted."""
+    items = rows_to_dicts(rows, fields)
+    await open_items(crypto, items, [row.sealed_metadata for row in rows])
+    if "password" in fields:
+        plaintexts = await decrypt_batch(
+            [item["password"] for item in items],
+            crypto
+        )
+        for item, plaintext in zip(items, plaintexts):
+            item["password"] = plaintext
+    return items
+
+def _set_next_cursor(rows: list, limit: int, response: Response) -> list:
+    """Trim the extra look-ahead row and advertise the next page cursor."""
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows
+
+async def _export_stream(
+    user_id: str,
+    export_format: ExportFormat,
+    crypto: CryptoEngine,
+    export_engine: Optional[CryptoEngine]
+) -> AsyncIterator[str]:
+    """
+    Stream a user's vault in batches of EXPORT_BATCH_SIZE rows.
+    Uses its own session, since the request session is closed once streaming starts.
+    """
+    columns = SEALED_EXPORT_COLUMNS if export_engine else EXPORT_COLUMNS
+    if export_format == ExportFormat.CSV:
+        yield csv_header(columns)
+    
+    query = vault_export(user_id, EXPORT_COLUMNS, settings.EXPORT_BATCH_SIZE)
+    async with db_manager.async_session() as session:
+        result = await session.stream(query)
+        async for rows in result.partitions():
+            plaintexts = await decrypt_batch(
+                [row.ciphertext for row in rows],
+                crypto
+            )
+            sealed = None
+            if export_engine:
+                sealed = await encrypt_batch(plaintexts, export_engine)
+            
+            metadata = [
+                {field: getattr(row, field) for field in METADATA_FIELDS} for row in rows
+            ]
+            await open_items(crypto, metadata, [row.sealed_metadata for row in rows])
+            
+            records = []
+            for index, row in enumerate(rows):
+                record = {
+                    "id": row.id,
+                    **metadata[index],
+                    "notes": row.notes,
+                    "tags": row.tags or [],
+                    "created_at": row.created_at.isoformat(),
+                    "updated_at": row.updated_at.isoformat(),
+                }
+                if sealed:
+                    record["ciphertext"] = b64encode(sealed[index]).decode()
+                else:
+                    record["password"] = plaintexts[index]
+                records.append(record)
+            
+            if export_format == ExportFormat.CSV:
+                yield serialize_csv(records, columns)
+            else:
+                yield serialize_ndjson(records)
+
+async def _new_password_rows(
+    user_id: str,
+    items: List[PasswordCreate],
+    crypto: CryptoEngine,
+    version: int
+) -> List[dict]:
+    """Encrypt a batch of new entries and build their INSERT parameter rows at a vault version."""
+    encrypted = await encrypt_batch([item.password for item in items], crypto)
+    sealed = [None] * len(items)
+    if settings.ENCRYPT_METADATA:
+        sealed = await seal_batch(crypto, [(item.title, item.username, item.url) for item in items])
+    now = datetime.utcnow()
+    rows = []
+    for item, ciphertext, sealed_metadata in zip(items, encrypted, sealed):
+        columns = metadata_columns(item.title, item.username, item.url, sealed_metadata)
+        rows.append({
+            "id": str(uuid4()),
+            "user_id": user_id,
+            **columns,
+            "ciphertext": ciphertext,
+            "key_version": crypto.key_version,
+            "notes": item.notes,
+            "tags": item.tags,
+            "search_text": search_document(columns["title"], columns["username"], columns["url"], item.tags),
+            "version": version,
+            "created_at": now,
+            "updated_at": now,
+        })
+    return rows
+
+async def _index_new_entries(
+    session: AsyncSession,
+    user_id: str,
+    rows: List[dict],
+    items: List[PasswordCreate]
+) -> None:
+    """Add the tag and blind index rows of entries inserted from _new_password_rows."""
+    await add_tags(session, user_id, {row["id"]: row["tags"] for row in rows})
+    await add_blind_tokens(session, user_id, {
+        row["id"]: (item.username, item.url)
+        for row, item in zip(rows, items) if row["sealed_metadata"] is not None
+    })
+
+def _entry_response(password: Password, metadata: dict, plaintext: str) -> PasswordResponse:
+    """PasswordResponse for an entity whose title, username and url may be sealed."""
+    return PasswordResponse(
+        id=password.id,
+        title=metadata["title"],
+        username=metadata["username"],
+        url=metadata["url"],
+        notes=password.notes,
+        tags=password.tags or [],
+        password=plaintext,
+        created_at=password.created_at,
+        updated_at=password.updated_at
+    )
+
+async def _read_upload(upload: UploadFile, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    """Read a spooled upload in chunks, closing it when done."""
+    try:
+        while chunk := await upload.read(chunk_size):
+            yield chunk
+    finally:
+        await upload.close()
+
+async def _import_stream(
+    chunks: AsyncIterator[bytes],
+    user_id: str,
+    import_format: ImportFormat,
+    crypto: CryptoEngine
+) -> AsyncIterator[str]:
+    """
+    Parse, validate and insert an uploaded vault in batches of IMPORT_BATCH_SIZE,
+    committing each batch. Yields NDJSON progress and per-row error events.
+    """
+    processed = imported = failed = 0
+    batch: List[PasswordCreate] = []
+    
+    async def flush(session: AsyncSession) -> int:
+        version = await bump_vault_version(session, user_id)
+        rows = await _new_password_rows(user_id, batch, crypto, version)
+        await session.execute(insert(Password), rows)
+        await _index_new_entries(session, user_id, rows, batch)
+        await session.commit()
+        await db_manager.note_write(user_id)
+        await vault_feed.publish(user_id, CREATE, [row["id"] for row in rows], version)
+        return len(batch)
+    
+    def progress(event: str, **extra) -> str:
+        return serialize_ndjson([{
+            "event": event, "processed": processed, "imported": imported, "failed": failed, **extra
+        }])
+    
+    async with db_manager.async_session() as session:
+        try:
+            async for row_number, record in iter_import_records(chunks, import_format):
+                processed += 1
+                try:
+                    if record is None:
+                        raise ValueError("Malformed record")
+                    batch.append(PasswordCreate.model_validate(record))
+                except (ValidationError, ValueError) as e:
+                    failed += 1
+                    detail = (
+                        "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+                        if isinstance(e, ValidationError) else str(e)
+                    )
+                    yield serialize_ndjson([{"event": "error", "row": row_number, "detail": detail}])
+                    continue
+                
+                if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                    imported += await flush(session)
+                    batch = []
+                    yield progress("progress")
+            
+            if batch:
+                imported += await flush(session)
+                batch = []
+        except ValueError as e:
+            logger.warning("Import aborted for user %s: %s", user_id, e)
+            yield progress("aborted", detail=str(e))
+            return
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error("Database error during import for user %s: %s", user_id, e)
+            yield progress("aborted", detail="Database operation failed")
+            return
+    
+    logger.info("Imported %d of %d entries for user %s", imported, processed, user_id)
+    yield progress("complete")
+
+def _bulk_result(results: List[BulkItemResult]) -> BulkResult:
+    succeeded = sum(1 for result in results if result.status < 400)
+    return BulkResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
 @router.post("", response_model=PasswordResponse)
 async def create_password(
     password_data: PasswordCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    crypto: CryptoEngine = Depends(get_vault_crypto)
 ):
-    # Encrypt the password
-    encrypted_password, iv = encrypt_password(
-        password_data.password,
-        settings.ENCRYPTION_KEY
-    )
+    # Encrypt the password, and the metadata in encrypted-metadata mode
+    ciphertext = crypto.encrypt(password_data.password)
+    metadata = password_data.model_dump(include=set(METADATA_FIELDS))
+    sealed = seal_metadata(crypto, **metadata) if settings.ENCRYPT_METADATA else None
+    columns = metadata_columns(**metadata, sealed=sealed)
+    version = await bump_vault_version(db, current_user.id)
     
     # Create password entry
     db_password = Password(
         id=str(uuid4()),
         user_id=current_user.id,
-        title=password_data.title,
-        username=password_data.username,
-        encrypted_password=encrypted_password,
-        url=password_data.url,
+        **columns,
+        ciphertext=ciphertext,
+        key_version=crypto.key_version,
         notes=password_data.notes,
         tags=password_data.tags,
-        iv=iv
+        search_text=search_document(
+            columns["title"], columns["username"], columns["url"], password_data.tags
+        ),
+        version=version
     )
     
     db.add(db_password)
-    await db.commit()
-    await db.refresh(db_password)
+    await db.flush()
+    await add_tags(db, current_user.id, {db_password.id: db_password.tags})
+    if sealed is not None:
+        await add_blind_tokens(db, current_user.id, {db_password.id: (metadata["username"], metadata["url"])})
+    notify_after_commit(db, current_user.id, CREATE, [db_password.id], version)
     
     # Return response with decrypted password
-    response = PasswordResponse.model_validate(db_password)
-    response.password = password_data.password
-    return response
+    return _entry_response(db_password, metadata, password_data.password)
 
-@router.get("", response_model=List[PasswordResponse])
+@router.get(
+    "",
+    response_model=List[PasswordProjection],
+    response_model_exclude_unset=True
+)
 async def get_passwords(
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.PASSWORDS_PAGE_SIZE, ge=1, le=settings.PASSWORDS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Value of the previous page's X-Next-Cursor header"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include, e.g. id,title,url"),
+    filters: dict = Depends(vault_filters),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+    crypto: CryptoEngine = Depends(get_vault_reader_crypto)
+):
+    """
+    List the current user's passwords, ordered by (created_at, id).
+    When more entries remain, the cursor for the next page is returned in the
+    X-Next-Cursor header. The password is only decrypted if it is projected.
+    Rows are encoded directly into JSON; response_model only documents the shape.
+    Answers 304 without reading the entries when If-None-Match names the
+    current ETag, which changes with the vault version.
+    """
+    selected = _parse_fields(fields)
+    after = _decode_after(cursor)
+    if await _not_modified(request, response, db, current_user.id):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response.headers)
+    
+    query = vault_page(current_user.id, selected, limit, after, **filters)
+    result = await db.execute(query)
+    rows = _set_next_cursor(result.all(), limit, response)
+    items = await _open_rows(rows, selected, crypto)
+    return FastJSONResponse(items, headers=response.headers)
+
+@router.get("/summary", response_model=List[PasswordSummary])
+async def get_password_summaries(
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.PASSWORDS_PAGE_SIZE, ge=1, le=settings.PASSWORDS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Value of the previous page's X-Next-Cursor header"),
+    filters: dict = Depends(vault_filters),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+    crypto: CryptoEngine = Depends(get_vault_reader_crypto)
+):
+    """
+    List metadata for the current user's passwords without any secrets.
+    Passwords are never decrypted (only sealed metadata, if any); use
+    POST /passwords/reveal to fetch secrets on demand. Conditional like
+    GET /passwords.
+    """
+    after = _decode_after(cursor)
+    if await _not_modified(request, response, db, current_user.id):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=response.headers)
+    
+    query = vault_page(current_user.id, SUMMARY_FIELDS, limit, after, **filters)
+    result = await db.execute(query)
+    rows = _set_next_cursor(result.all(), limit, response)
+    items = rows_to_dicts(rows, SUMMARY_FIELDS, defaults={"tags": list})
+    await open_items(crypto, items, [row.sealed_metadata for row in rows])
+    return FastJSONResponse(items, headers=response.headers)
+
+@router.get("/search", response_model=List[PasswordSummary])
+async def search_passwords(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=255, description="Text to find in title, username, url host or tags"),
+    limit: int = Query(settings.PASSWORDS_PAGE_SIZE, ge=1, le=settings.PASSWORDS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Value of the previous page's X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+    crypto: CryptoEngine = Depends(get_vault_reader_crypto)
+):
+    """
+    Search the current user's entries by prefix or substring, case-insensitively.
+    Results are ordered by relevance (exact title, title prefix, prefix of
+    another field, substring) and then by title. Passwords are not decrypted;
+    entries with sealed metadata match on username or host prefix only.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search text must not be blank"
+        )
+    after = None
+    if cursor:
+        try:
+            after = decode_search_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    query = vault_search(
+        current_user.id, q, SUMMARY_FIELDS, limit, after,
+        dialect=db_manager.engine.dialect.name
+    )
+    result = await db.execute(query)
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_search_cursor(last.rank, last.sort_title, last.id)
+    items = rows_to_dicts(rows, SUMMARY_FIELDS, defaults={"tags": list})
+    await open_items(crypto, items, [row.sealed_metadata for row in rows])
+    return FastJSONResponse(items, headers=response.headers)
+
+@router.get("/changes", response_model=PasswordChanges)
+async def get_password_changes(
+    since: int = Query(..., ge=0, description="Vault version the client last synced to"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include, e.g. id,title,url"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+    crypto: CryptoEngine = Depends(get_vault_reader_crypto)
+):
+    """
+    Delta sync: entries created or updated after vault version since, and the
+    ids of entries deleted after it, up to the returned version. Clients store
+    that version and pass it as since next time; the X-Vault-Version header of
+    GET /passwords gives the starting point after a full listing.
+    """
+    selected = _parse_fields(fields)
+    floor, version = await sync_bounds(db, current_user.id)
+    if since > version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="since is ahead of the vault version; resync with GET /passwords"
+        )
+    if since < floor:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Deletes before since have been pruned; resync with GET /passwords"
+        )
+    
+    result = await db.execute(vault_changes(current_user.id, selected, since, version))
+    changed = await _open_rows(result.all(), selected, crypto)
+    result = await db.execute(vault_tombstones(current_user.id, since, version))
+    return FastJSONResponse({
+        "version": version,
+        "changed": changed,
+        "deleted": result.scalars().all(),
+    })
+
+@router.post("/reveal", response_model=List[PasswordSecret])
+async def reveal_passwords(
+    reveal: PasswordRevealRequest,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+    crypto: CryptoEngine = Depends(get_vault_reader_crypto)
+):
+    """Decrypt and return the secrets for one or a small batch of entries."""
+    ids = list(dict.fromkeys(reveal.ids))
+    result = await db.execute(
+        vault_entries(current_user.id, ("id", "password"), ids)
+    )
+    rows = {row.id: row for row in result.all()}
+    if len(rows) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Password not found"
+        )
+    
+    ordered = [rows[entry_id] for entry_id in ids]
+    plaintexts = await decrypt_batch(
+        [row.ciphertext for row in ordered],
+        crypto
+    )
+    return [
+        PasswordSecret(id=row.id, password=plaintext)
+        for row, plaintext in zip(ordered, plaintexts)
+    ]
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_passwords(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    export_key: Optional[str] = Header(
+        None,
+        alias="X-Export-Key",
+        description="Base64 AES key; when set, secrets are re-encrypted under it instead of exported in clear"
+    ),
+    current_user: User = Depends(get_current_reader),
+    crypto: CryptoEngine = Depends(get_vault_reader_crypto)
+):
+    """Stream the current user's vault as NDJSON or CSV with flat memory use."""
+    export_engine = None
+    if export_key:
+        try:
+            export_engine = CryptoEngine(export_key)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Export key must be a base64 encoded 128, 192 or 256-bit AES key"
+            )
+    
+    filename = f"passman-export-{datetime.utcnow():%Y%m%d%H%M%S}.{export_format.value}"
+    return StreamingResponse(
+        _export_stream(current_user.id, export_format, crypto, export_engine),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/import", response_class=StreamingResponse)
+async def import_passwords(
+    request: Request,
+    import_format: ImportFormat = Query(..., alias="format"),
+    current_user: User = Depends(get_current_user),
+    crypto: CryptoEngine = Depends(get_vault_crypto)
+):
+    """
+    Import a CSV, JSON or NDJSON vault export sent as the raw request body.
+    
+    The body is spooled (to disk beyond IMPORT_SPOOL_MEMORY_BYTES) before the
+    response starts: once it has, Starlette listens for a client disconnect
+    on ASGI servers older than spec 2.4, such as uvicorn, and that listener
+    would swallow the remaining body. The spooled file is then parsed
+    incrementally, validated against PasswordCreate and written in batches,
+    so memory stays bounded. Progress, per-row errors and a final summary
+    are streamed back as NDJSON events.
+    """
+    upload = UploadFile(SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_MEMORY_BYTES))
+    try:
+        async for chunk in request.stream():
+            await upload.write(chunk)
+        await upload.seek(0)
+    except BaseException:
+        await upload.close()
+        raise
+    return StreamingResponse(
+        _import_stream(_read_upload(upload), current_user.id, import_format, crypto),
+        media_type=MEDIA_TYPES[ExportFormat.NDJSON]
+    )
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_passwords(
+    bulk: PasswordBulkCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    crypto: CryptoEngine = Depends(get_vault_crypto)
+):
+    """Create many passwords in one transaction with a multi-row INSERT ... RETURNING."""
+    version = await bump_vault_version(db, current_user.id)
+    rows = await _new_password_rows(current_user.id, bulk.items, crypto, version)
+    result = await db.execute(
+        insert(Password).returning(Password.id, sort_by_parameter_order=True),
+        rows
+    )
+    created_ids = result.scalars().all()
+    await _index_new_entries(db, current_user.id, rows, bulk.items)
+    notify_after_commit(db, current_user.id, CREATE, created_ids, version)
+    
+    return _bulk_result([
+        BulkItemResult(index=index, id=entry_id, status=status.HTTP_201_CREATED)
+        for index, entry_id in enumerate(created_ids)
+    ])
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_update_passwords(
+    bulk: PasswordBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    crypto: CryptoEngine = Depends(get_vault_crypto)
 ):
+    """Apply partial updates to many passwords in one transaction."""
     result = await db.execute(
-        select(Password).where(Password.user_id == current_user.id)
+        select(Password.id).where(
+            Password.user_id == current_user.id,
+            Password.id.in_({item.id for item in bulk.items})
+        )
     )
-    passwords = result.scalars().all()
-    
-    # Decrypt passwords for response
-    responses = []
-    for password in passwords:
-        response = PasswordResponse.model_validate(password)
-        response.password = decrypt_password(
-            password.encrypted_password,
-            password.iv,
-            settings.ENCRYPTION_KEY
+    owned = set(result.scalars().all())
+    
+    results: List[Optional[BulkItemResult]] = []
+    accepted = []
+    seen = set()
+    for index, item in enumerate(bulk.items):
+        if item.id not in owned:
+            results.append(BulkItemResult(
+                index=index, id=item.id, status=status.HTTP_404_NOT_FOUND, detail="Password not found"
+            ))
+        elif item.id in seen:
+            results.append(BulkItemResult(
+                index=index, id=item.id, status=status.HTTP_409_CONFLICT, detail="Duplicate id in request"
+            ))
+        else:
+            seen.add(item.id)
+            accepted.append((index, item))
+            results.append(None)
+    
+    secrets = [item.password for _, item in accepted if item.password is not None]
+    encrypted = iter(await encrypt_batch(secrets, crypto))
+    version = await bump_vault_version(db, current_user.id) if accepted else None
+    now = datetime.utcnow()
+    rows = []
+    for index, item in accepted:
+        row = item.model_dump(exclude_none=True, exclude={"password"})
+        if item.password is not None:
+            row["ciphertext"] = next(encrypted)
+            row["key_version"] = crypto.key_version
+        row["updated_at"] = now
+        row["version"] = version
+        rows.append(row)
+        results[index] = BulkItemResult(index=index, id=item.id, status=status.HTTP_200_OK)
+    
+    # Merge metadata changes into the stored values and rewrite them in the current
+    # mode; entries with a new password too, to keep both under one data key
+    touched = [row for row in rows if "ciphertext" in row or not METADATA_FIELDS_SET.isdisjoint(row)]
+    sealed_entries = {}
+    if touched:
+        current = await load_metadata(db, crypto, [row["id"] for row in touched])
+        for row in touched:
+            metadata = {**current[row["id"]], **{field: row[field] for field in METADATA_FIELDS if field in row}}
+            sealed = seal_metadata(crypto, **metadata) if settings.ENCRYPT_METADATA else None
+            row.update(metadata_columns(**metadata, sealed=sealed))
+            if sealed is not None:
+                sealed_entries[row["id"]] = (metadata["username"], metadata["url"])
+    
+    if rows:
+        # ORM bulk UPDATE by primary key, executed as one executemany per column set
+        await db.execute(update(Password), rows)
+        await replace_tags(db, current_user.id, {row["id"]: row["tags"] for row in rows if "tags" in row})
+        await replace_blind_tokens(db, current_user.id, [row["id"] for row in touched], sealed_entries)
+        await refresh_search_text(db, [row["id"] for row in rows if SEARCH_FIELDS.intersection(row)])
+        notify_after_commit(db, current_user.id, UPDATE, [row["id"] for row in rows], version)
+    
+    return _bulk_result(results)
+
+@router.delete("/bulk", response_model=BulkResult)
+async def bulk_delete_passwords(
+    bulk: PasswordBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delete many passwords, and their tag and blind index rows, with one
+    statement each; the deleted ids are recorded as tombstones for delta sync.
+    """
+    for index_table in (password_tags, blind_tokens):
+        await db.execute(
+            delete(index_table).where(
+                index_table.c.user_id == current_user.id,
+                index_table.c.password_id.in_(set(bulk.ids))
+            )
         )
-        responses.append(response)
+    result = await db.execute(
+        delete(Password)
+        .where(Password.user_id == current_user.id, Password.id.in_(set(bulk.ids)))
+        .returning(Password.id)
+    )
+    deleted = set(result.scalars().all())
+    if deleted:
+        version = await bump_vault_version(db, current_user.id)
+        await add_tombstones(db, current_user.id, deleted, version)
+        notify_after_commit(db, current_user.id, DELETE, deleted, version)
     
-    return responses
+    return _bulk_result([
+        BulkItemResult(index=index, id=entry_id, status=status.HTTP_204_NO_CONTENT)
+        if entry_id in deleted else
+        BulkItemResult(index=index, id=entry_id, status=status.HTTP_404_NOT_FOUND, detail="Password not found")
+        for index, entry_id in enumerate(bulk.ids)
+    ])
 
 @router.get("/{password_id}", response_model=PasswordResponse)
 async def get_password(
     password_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader),
+    crypto: CryptoEngine = Depends(get_vault_reader_crypto)
 ):
-    password = await db.get(Password, password_id)
-    if not password or password.user_id != current_user.id:
+    result = await db.execute(
+        vault_entries(current_user.id, PASSWORD_FIELDS, [password_id])
+    )
+    row = result.first()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Password not found"
         )
     
     # Decrypt password for response
-    response = PasswordResponse.model_validate(password)
-    response.password = decrypt_password(
-        password.encrypted_password,
-        password.iv,
-        settings.ENCRYPTION_KEY
-    )
-    return response
+    entry = dict(zip(PASSWORD_FIELDS, row))
+    entry["password"] = crypto.decrypt(entry["password"])
+    if row.sealed_metadata is not None:
+        entry.update(open_metadata(crypto, row.sealed_metadata))
+    return PasswordResponse(**entry)
 
 @router.put("/{password_id}", response_model=PasswordResponse)
 async def update_password(
     password_id: str,
     password_data: PasswordUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    crypto: CryptoEngine = Depends(get_vault_crypto)
 ):
     password = await db.get(Password, password_id)
     if not password or password.user_id != current_user.id:
@@ -106,36 +809,40 @@ async def update_password(
             detail="Password not found"
         )
     
+    metadata = (
+        open_metadata(crypto, password.sealed_metadata) if password.sealed_metadata is not None
+        else {field: getattr(password, field) for field in METADATA_FIELDS}
+    )
+    changes = password_data.model_dump(exclude_none=True, include=set(METADATA_FIELDS))
+    if changes or password_data.password is not None:
+        # Rewritten in the current mode, sealing or unsealing the entry as needed;
+        # also on a new password, so sealed metadata moves to the same data key
+        metadata.update(changes)
+        sealed = seal_metadata(crypto, **metadata) if settings.ENCRYPT_METADATA else None
+        for column, value in metadata_columns(**metadata, sealed=sealed).items():
+            setattr(password, column, value)
+        await replace_blind_tokens(
+            db, current_user.id, [password.id],
+            {password.id: (metadata["username"], metadata["url"])} if sealed is not None else {}
+        )
+    
     # Update fields
-    if password_data.title is not None:
-        password.title = password_data.title
-    if password_data.username is not None:
-        password.username = password_data.username
     if password_data.password is not None:
-        encrypted_password, iv = encrypt_password(
-            password_data.password,
-            settings.ENCRYPTION_KEY
-        )
-        password.encrypted_password = encrypted_password
-        password.iv = iv
-    if password_data.url is not None:
-        password.url = password_data.url
+        password.ciphertext = crypto.encrypt(password_data.password)
+        password.key_version = crypto.key_version
     if password_data.notes is not None:
         password.notes = password_data.notes
     if password_data.tags is not None:
         password.tags = password_data.tags
+        await replace_tags(db, current_user.id, {password.id: password.tags})
+    password.search_text = search_document(password.title, password.username, password.url, password.tags)
+    password.version = await bump_vault_version(db, current_user.id)
+    notify_after_commit(db, current_user.id, UPDATE, [password.id], password.version)
     
-    await db.commit()
-    await db.refresh(password)
+    await db.flush()
     
     # Return response with decrypted password
-    response = PasswordResponse.model_validate(password)
-    response.password = decrypt_password(
-        password.encrypted_password,
-        password.iv,
-        settings.ENCRYPTION_KEY
-    )
-    return response
+    return _entry_response(password, metadata, crypto.decrypt(password.ciphertext))
 
 @router.delete("/{password_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_password(
@@ -150,5 +857,9 @@ async def delete_password(
             detail="Password not found"
         )
     
+    await delete_tags(db, [password.id])
+    await delete_blind_tokens(db, [password.id])
     await db.delete(password)
-    await db.commit() 
\ No newline at end of file
+    version = await bump_vault_version(db, current_user.id)
+    await add_tombstones(db, current_user.id, [password.id], version)
+    notify_after_commit(db, current_user.id, DELETE, [password.id], version)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import User
+from ..schemas.password import TagCount
+from ..utils.vault_queries import tag_counts
+from .auth import get_current_reader, get_read_db
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+@router.get("", response_model=List[TagCount])
+async def get_tags(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_reader)
+):
+    """The tags used in the current user's vault with their entry counts, most used first."""
+    result = await db.execute(tag_counts(current_user.id))
+    return [TagCount(tag=tag, count=count) for tag, count in result.all()]
@@ -2,11 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
-from ..database import get_db
-from ..models import User
-from .auth import get_current_user, pwd_context
+from ..database import after_commit, get_db
+from ..models import Password, PasswordBlindToken, PasswordTag, PasswordTombstone, User
+from ..utils.hashing import HashingBusyError, hasher
+from ..utils.keyring import keyring
+from ..utils.user_cache import user_cache
+from .auth import get_current_reader, get_current_user, hashing_unavailable
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -22,7 +25,7 @@ class UserProfileUpdate(BaseModel):
 
 @router.get("/me", response_model=UserProfile)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_reader)
 ):
     """Get the current user's profile."""
     return UserProfile(
@@ -58,12 +61,15 @@ async def update_current_user_profile(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is required to set new password"
             )
-        if not pwd_context.verify(profile.current_password, current_user.hashed_password):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Current password is incorrect"
-            )
-        current_user.hashed_password = pwd_context.hash(profile.new_password)
+        try:
+            if not await hasher.verify(profile.current_password, current_user.hashed_password):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Current password is incorrect"
+                )
+            current_user.hashed_password = await hasher.hash(profile.new_password)
+        except HashingBusyError as e:
+            raise hashing_unavailable(e)
 
     # Update fields
     if profile.username:
@@ -71,8 +77,8 @@ async def update_current_user_profile(
     if profile.email:
         current_user.email = profile.email
 
-    await db.commit()
-    await db.refresh(current_user)
+    await db.flush()
+    after_commit(db, lambda: user_cache.invalidate(current_user.id))
 
     return UserProfile(
         username=current_user.username,
@@ -84,7 +90,15 @@ async def delete_current_user_profile(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete the current user's account."""
+    """Delete the current user's account along with their entries and tombstones."""
+    # Dependent rows first: their user_id foreign keys do not cascade
+    for model in (PasswordTag, PasswordBlindToken, Password, PasswordTombstone):
+        await db.execute(delete(model).where(model.user_id == current_user.id))
     await db.delete(current_user)
-    await db.commit()
+    
+    async def forget_user():
+        await user_cache.invalidate(current_user.id)
+        keyring.forget(current_user.id)
+    
+    after_commit(db, forget_user)
     return None 
\ No newline at end of file
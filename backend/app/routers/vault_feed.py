@@ -0,0 +1,76 @@
+import asyncio
+import time
+from typing import Optional
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from jose import JWTError
+
+from ..utils.vault_events import vault_feed
+from .auth import authenticate_token, decode_access_token
+
+router = APIRouter(prefix="/ws", tags=["vault feed"])
+
+# Subprotocol announcing that the next offered subprotocol is the access token
+BEARER_PROTOCOL = "passman.bearer"
+
+def _bearer_token(websocket: WebSocket) -> Optional[str]:
+    """
+    The access token from the Sec-WebSocket-Protocol header (browsers cannot
+    set Authorization on WebSockets) or an Authorization header. Never from
+    the query string, which ends up in access logs.
+    """
+    protocols = websocket.scope.get("subprotocols", [])
+    if BEARER_PROTOCOL in protocols[:-1]:
+        return protocols[protocols.index(BEARER_PROTOCOL) + 1]
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    return credentials if scheme.lower() == "bearer" and credentials else None
+
+async def _drain(websocket: WebSocket, queue: asyncio.Queue) -> None:
+    """Discard client messages and end the stream once the client disconnects."""
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        queue.put_nowait(None)
+
+@router.websocket("/vault")
+async def vault_changes_feed(websocket: WebSocket):
+    """
+    Push the current user's vault changes as they commit, one JSON array of
+    {"id", "op", "version"} events per write. Authenticated with the same JWT
+    as the REST API; the socket is closed with 1008 when it expires, and the
+    client reconnects with a fresh token and catches up with
+    GET /passwords/changes.
+    """
+    token = _bearer_token(websocket)
+    try:
+        if token is None:
+            raise JWTError("Missing token")
+        user_id = (await authenticate_token(token)).id
+        expires_at = decode_access_token(token).get("exp")
+    except (JWTError, HTTPException):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept(
+        subprotocol=BEARER_PROTOCOL if BEARER_PROTOCOL in websocket.scope.get("subprotocols", []) else None
+    )
+    queue = vault_feed.listen(user_id)
+    reader = asyncio.create_task(_drain(websocket, queue))
+    expiry = None
+    if expires_at is not None:
+        expiry = asyncio.get_running_loop().call_later(
+            max(expires_at - time.time(), 0), queue.put_nowait, None
+        )
+    try:
+        while (frame := await queue.get()) is not None:
+            await websocket.send_text(frame)
+        if reader.done():
+            return
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        vault_feed.unlisten(user_id, queue)
+        reader.cancel()
+        if expiry is not None:
+            expiry.cancel()
@@ -1,13 +1,15 @@
-from typing import List, Optional
+from typing import Annotated, List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+Tag = Annotated[str, Field(min_length=1, max_length=255)]
+
 class PasswordBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     username: str = Field(..., min_length=1, max_length=255)
     url: Optional[str] = Field(None, max_length=1024)
     notes: Optional[str] = Field(None, max_length=4096)
-    tags: List[str] = Field(default_factory=list)
+    tags: List[Tag] = Field(default_factory=list)
 
 class PasswordCreate(PasswordBase):
     password: str = Field(..., min_length=1)
@@ -18,7 +20,7 @@ class PasswordUpdate(BaseModel):
     password: Optional[str] = Field(None, min_length=1)
     url: Optional[str] = Field(None, max_length=1024)
     notes: Optional[str] = Field(None, max_length=4096)
-    tags: Optional[List[str]] = None
+    tags: Optional[List[Tag]] = None
 
 class PasswordResponse(PasswordBase):
     id: str
@@ -27,4 +29,75 @@ class PasswordResponse(PasswordBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class PasswordProjection(BaseModel):
+    """PasswordResponse with every field but id optional, for ?fields= projections."""
+    id: str
+    title: Optional[str] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    url: Optional[str] = None
+    notes: Optional[str] = None
+    tags: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+PASSWORD_FIELDS = tuple(PasswordResponse.model_fields)
+
+class PasswordSummary(BaseModel):
+    """Vault listing entry without the secret."""
+    id: str
+    title: str
+    username: str
+    url: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+SUMMARY_FIELDS = tuple(PasswordSummary.model_fields)
+
+class PasswordChanges(BaseModel):
+    """Delta sync result: what changed after a vault version, up to version."""
+    version: int
+    changed: List[PasswordProjection]
+    deleted: List[str]
+
+class PasswordRevealRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=50)
+
+class PasswordSecret(BaseModel):
+    id: str
+    password: str
+
+MAX_BULK_ITEMS = 1000
+
+class PasswordBulkCreate(BaseModel):
+    items: List[PasswordCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class PasswordBulkUpdateItem(PasswordUpdate):
+    id: str
+
+class PasswordBulkUpdate(BaseModel):
+    items: List[PasswordBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class PasswordBulkDelete(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: int
+    detail: Optional[str] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+class TagCount(BaseModel):
+    tag: str
+    count: int
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded LRU mapping whose entries also expire after a TTL.
+
+    Entries past their expiry are treated as misses and dropped on access.
+    When ``on_evict`` is given it is called with every value that leaves the
+    cache, whether by expiry, LRU eviction, replacement or explicit removal.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        on_evict: Optional[Callable[[Any], None]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _discard(self, key: Hashable) -> None:
+        value, _ = self._data.pop(key)
+        if self._on_evict is not None:
+            self._on_evict(value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; ``ttl`` overrides the default lifetime for this entry."""
+        lifetime = self.ttl if ttl is None else ttl
+        if lifetime <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+            self._data[key] = (value, time.monotonic() + lifetime)
+            while len(self._data) > self.maxsize:
+                self._discard(next(iter(self._data)))
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._data):
+                self._discard(key)
@@ -1,54 +1,224 @@
+import asyncio
+import hashlib
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Union
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from base64 import b64encode, b64decode
 import os
 
+from ..core.config import settings
+
 def generate_encryption_key() -> str:
     """Generate a new encryption key."""
     key = AESGCM.generate_key(bit_length=256)
     return b64encode(key).decode()
 
-def encrypt_password(password: str, key: str) -> tuple[str, str]:
+# Sealed secret layout: version (1 byte) || nonce (12 bytes) || ciphertext+tag
+# Version 1 is sealed with a master key, version 2 with a per-user data key.
+FORMAT_VERSION = 1
+ENVELOPE_FORMAT_VERSION = 2
+NONCE_SIZE = 12
+HEADER_SIZE = 1 + NONCE_SIZE
+
+Sealed = Union[bytes, bytearray, memoryview]
+KeyMaterial = Union[str, bytes, bytearray]
+
+class CryptoEngine:
+    """
+    AES-GCM engine bound to a single key.
+    The key is decoded and the cipher built once, then reused for every call.
+    Secrets this key cannot open (another format version, or a failed tag
+    check) are handed to ``fallback``, so engines chain older keys.
+    ``key_version`` is recorded on rows sealed by this engine.
+    """
+
+    def __init__(
+        self,
+        key: KeyMaterial,
+        version: int = FORMAT_VERSION,
+        fallback: Optional["CryptoEngine"] = None,
+        key_version: int = 0
+    ):
+        if not key:
+            raise ValueError("Encryption key not set")
+        self.version = version
+        self.key_version = key_version
+        self._cipher = AESGCM(b64decode(key) if isinstance(key, str) else key)
+        self._fallback = fallback
+
+    def seal(self, data: Sealed, associated_data: Optional[bytes] = None) -> bytes:
+        """Encrypt raw bytes into the sealed format."""
+        nonce = os.urandom(NONCE_SIZE)
+        return bytes((self.version,)) + nonce + self._cipher.encrypt(nonce, data, associated_data)
+
+    def unseal(self, sealed: Sealed, associated_data: Optional[bytes] = None) -> bytes:
+        """
+        Decrypt a sealed value.
+        Accepts any bytes-like object; the nonce and ciphertext are sliced without copying.
+        Raises InvalidTag if neither this key nor any fallback opens it.
+        """
+        view = memoryview(sealed)
+        if len(view) <= HEADER_SIZE:
+            raise ValueError("Unsupported sealed secret format")
+        if view[0] == self.version:
+            try:
+                return self._cipher.decrypt(view[1:HEADER_SIZE], view[HEADER_SIZE:], associated_data)
+            except InvalidTag:
+                if self._fallback is None:
+                    raise
+        elif self._fallback is None:
+            raise ValueError("Unsupported sealed secret format")
+        return self._fallback.unseal(view, associated_data)
+
+    def encrypt(self, password: str) -> bytes:
+        """
+        Encrypt a password.
+        Returns the sealed secret: version byte, nonce and ciphertext concatenated.
+        """
+        return self.seal(password.encode())
+
+    def decrypt(self, sealed: Sealed) -> str:
+        """Decrypt a sealed secret."""
+        return self.unseal(sealed).decode()
+
+    def encrypt_many(self, passwords: Iterable[str]) -> list[bytes]:
+        """Encrypt a sequence of passwords in order, each with its own nonce."""
+        return [self.encrypt(password) for password in passwords]
+
+    def decrypt_many(self, sealed_values: Iterable[Sealed]) -> list[str]:
+        """Decrypt a sequence of sealed secrets in order."""
+        decrypt = self.decrypt
+        return [decrypt(sealed) for sealed in sealed_values]
+
+@lru_cache(maxsize=8)
+def _engine_for_key(key: str) -> CryptoEngine:
+    return CryptoEngine(key)
+
+def get_crypto_engine() -> CryptoEngine:
+    """Return the process-wide master key engine for settings.ENCRYPTION_KEY."""
+    return _engine_for_key(settings.ENCRYPTION_KEY)
+
+@lru_cache(maxsize=8)
+def _keychain(keys: tuple[str, ...]) -> CryptoEngine:
+    engine = None
+    for key in reversed(keys):
+        engine = CryptoEngine(key, fallback=engine)
+    return engine
+
+def get_master_keychain() -> CryptoEngine:
+    """
+    Master key engine that also opens secrets sealed under any of
+    settings.PREVIOUS_ENCRYPTION_KEYS; new secrets use ENCRYPTION_KEY.
+    """
+    return _keychain((settings.ENCRYPTION_KEY, *settings.PREVIOUS_ENCRYPTION_KEYS))
+
+# Blind index tokens are HMAC-SHA256 truncated to 128 bits
+BLIND_TOKEN_SIZE = 16
+
+class BlindIndex:
+    """
+    Keyed HMAC over normalized values, so equal values can be looked up by
+    token without storing them. Tokens are namespaced by kind (e.g. exact
+    username vs. username prefix) and only comparable under the same key.
+    """
+
+    def __init__(self, key: bytes):
+        self._key = key
+
+    def token(self, kind: str, value: str) -> bytes:
+        message = f"{kind}\x00{value}".encode()
+        return hmac.new(self._key, message, hashlib.sha256).digest()[:BLIND_TOKEN_SIZE]
+
+    def tokens(self, kind: str, values: Iterable[str]) -> list[bytes]:
+        return [self.token(kind, value) for value in values]
+
+@lru_cache(maxsize=4)
+def _blind_index_root(secret: str) -> bytes:
+    return hmac.new(secret.encode(), b"passman blind index", hashlib.sha256).digest()
+
+@lru_cache(maxsize=1024)
+def _blind_index(root: bytes, user_id: str) -> BlindIndex:
+    return BlindIndex(hmac.new(root, user_id.encode(), hashlib.sha256).digest())
+
+def blind_index_enabled() -> bool:
+    """Whether BLIND_INDEX_KEY is set; without it no tokens exist to match."""
+    return bool(settings.BLIND_INDEX_KEY)
+
+def get_blind_index(user_id: str) -> BlindIndex:
+    """
+    Per-user blind index keyed from BLIND_INDEX_KEY, which settings require
+    with ENCRYPT_METADATA. Raises RuntimeError without it rather than keying
+    tokens from the vault encryption key. Tokens do not survive a change of
+    this key.
+    """
+    if not blind_index_enabled():
+        raise RuntimeError("BLIND_INDEX_KEY is not set; blind index tokens cannot be computed")
+    return _blind_index(_blind_index_root(settings.BLIND_INDEX_KEY), user_id)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.CRYPTO_WORKERS, thread_name_prefix="passman-crypto"
+        )
+    return _executor
+
+async def _run_batch(func, items: Sequence) -> list:
+    """Run func inline for small batches, otherwise in chunks on the thread pool."""
+    if len(items) < settings.CRYPTO_INLINE_THRESHOLD:
+        return func(items)
+
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    chunk_size = settings.CRYPTO_CHUNK_SIZE
+    chunks = await asyncio.gather(*(
+        loop.run_in_executor(executor, func, items[start:start + chunk_size])
+        for start in range(0, len(items), chunk_size)
+    ))
+    return [result for chunk in chunks for result in chunk]
+
+async def decrypt_batch(
+    sealed_values: Sequence[Sealed],
+    engine: Optional[CryptoEngine] = None
+) -> list[str]:
+    """
+    Decrypt a batch of sealed secrets, preserving order.
+    Batches below CRYPTO_INLINE_THRESHOLD are decrypted inline; larger ones are
+    split into chunks and decrypted on a thread pool, since AES-GCM releases the GIL.
+    """
+    engine = engine or get_crypto_engine()
+    return await _run_batch(engine.decrypt_many, sealed_values)
+
+async def encrypt_batch(
+    passwords: Sequence[str],
+    engine: Optional[CryptoEngine] = None
+) -> list[bytes]:
+    """Encrypt a batch of passwords, preserving order. Offloaded like decrypt_batch."""
+    engine = engine or get_crypto_engine()
+    return await _run_batch(engine.encrypt_many, passwords)
+
+def shutdown_crypto_executor():
+    """Stop the batch decryption thread pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+def encrypt_password(password: str, key: str) -> bytes:
     """
     Encrypt a password using AES-GCM.
-    Returns (encrypted_password, iv) both as base64 strings.
-    """
-    if not key:
-        raise ValueError("Encryption key not set")
-    
-    # Convert key from base64
-    key_bytes = b64decode(key)
-    
-    # Generate a random IV
-    iv = os.urandom(12)
-    
-    # Create cipher
-    cipher = AESGCM(key_bytes)
-    
-    # Encrypt
-    ciphertext = cipher.encrypt(iv, password.encode(), None)
-    
-    # Return base64 encoded values
-    return (
-        b64encode(ciphertext).decode(),
-        b64encode(iv).decode()
-    )
-
-def decrypt_password(encrypted_password: str, iv: str, key: str) -> str:
-    """
-    Decrypt a password using AES-GCM.
-    Takes base64 encoded encrypted_password, iv, and key.
-    """
-    if not key:
-        raise ValueError("Encryption key not set")
-    
-    # Convert from base64
-    key_bytes = b64decode(key)
-    iv_bytes = b64decode(iv)
-    ciphertext = b64decode(encrypted_password)
-    
-    # Create cipher
-    cipher = AESGCM(key_bytes)
-    
-    # Decrypt
-    plaintext = cipher.decrypt(iv_bytes, ciphertext, None)
-    return plaintext.decode() 
\ No newline at end of file
+    Returns the sealed secret as raw bytes.
+    """
+    return _engine_for_key(key).encrypt(password)
+
+def decrypt_password(sealed: Sealed, key: str) -> str:
+    """
+    Decrypt a sealed secret using AES-GCM.
+    Takes the raw sealed bytes and a base64 key.
+    """
+    return _engine_for_key(key).decrypt(sealed)
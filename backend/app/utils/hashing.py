@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from passlib.context import CryptContext
+
+from ..core.config import settings
+from ..core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+HASH_QUEUE_WAIT = metrics.histogram(
+    "passman_hash_queue_wait_seconds",
+    "Time spent waiting for a free password hashing worker",
+    labelnames=("operation",),
+)
+HASH_DURATION = metrics.histogram(
+    "passman_hash_duration_seconds",
+    "Time spent computing a password hash or verification in a worker",
+    labelnames=("operation",),
+)
+HASH_REJECTED = metrics.counter(
+    "passman_hash_rejected_total",
+    "Password hashing requests rejected because the queue was full",
+    labelnames=("operation",),
+)
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing queue is full and the request should be retried."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+def _timed_hash(secret: str) -> tuple[str, float]:
+    """Hash a secret inside a worker and report how long it took."""
+    started = time.perf_counter()
+    hashed = pwd_context.hash(secret)
+    return hashed, time.perf_counter() - started
+
+
+def _timed_verify(secret: str, hashed: str) -> tuple[bool, float]:
+    """Verify a secret inside a worker and report how long it took."""
+    started = time.perf_counter()
+    valid = pwd_context.verify(secret, hashed)
+    return valid, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """
+    Runs Argon2 hashing and verification on a dedicated worker pool.
+
+    At most ``concurrency`` operations run at once; up to ``queue_depth``
+    more may wait for a worker. Anything beyond that is rejected with
+    HashingBusyError so the event loop never piles up unbounded work.
+    """
+
+    def __init__(self, executor_kind: str, concurrency: int, queue_depth: int, retry_after: int):
+        self.executor_kind = executor_kind
+        self.concurrency = concurrency
+        self.queue_depth = queue_depth
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._waiting = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix="passman-hash"
+                )
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.concurrency)
+            logger.info(
+                "Started %s hashing pool with %d workers", self.executor_kind, self.concurrency
+            )
+        return self._executor
+
+    async def _run(self, operation: str, func, *args):
+        if self._waiting >= self.queue_depth:
+            HASH_REJECTED.inc(operation=operation)
+            raise HashingBusyError(self.retry_after)
+
+        self._waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            HASH_QUEUE_WAIT.observe(time.perf_counter() - queued_at, operation=operation)
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._get_executor(), func, *args)
+            HASH_DURATION.observe(elapsed, operation=operation)
+            return result
+        finally:
+            self._semaphore.release()
+
+    async def hash(self, secret: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await self._run("hash", _timed_hash, secret)
+
+    async def verify(self, secret: str, hashed: str) -> bool:
+        """Verify a password against its hash without blocking the event loop."""
+        return await self._run("verify", _timed_verify, secret, hashed)
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            logger.info("Hashing pool shut down")
+
+
+# Global password hasher instance
+hasher = PasswordHasher(
+    executor_kind=settings.HASHING_EXECUTOR,
+    concurrency=settings.HASHING_CONCURRENCY,
+    queue_depth=settings.HASHING_QUEUE_DEPTH,
+    retry_after=settings.HASHING_RETRY_AFTER_SECONDS,
+)
@@ -0,0 +1,281 @@
+import logging
+from typing import AsyncIterator, Optional, Sequence
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..database import after_commit, db_manager
+from ..models import User
+from .cache import TTLCache
+from .crypto import ENVELOPE_FORMAT_VERSION, CryptoEngine, get_crypto_engine, get_master_keychain
+from .user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+DEK_CACHE_HITS = metrics.counter(
+    "passman_dek_cache_hits_total",
+    "Requests whose unwrapped data key was served from the DEK cache",
+)
+DEK_CACHE_MISSES = metrics.counter(
+    "passman_dek_cache_misses_total",
+    "Requests that had to unwrap the user's data key with the master key",
+)
+
+
+class _DataKey:
+    """Unwrapped data keys of one user generation and the engine built from them."""
+
+    __slots__ = ("key_version", "keys", "engine")
+
+    def __init__(self, key_version: int, keys: list[bytearray], engine: CryptoEngine):
+        self.key_version = key_version
+        self.keys = keys
+        self.engine = engine
+
+    def zeroize(self) -> None:
+        """
+        Overwrite the key bytes held by this process.
+        Best effort: the cipher backend keeps its own copy until the engine is
+        garbage collected.
+        """
+        for key in self.keys:
+            key[:] = bytes(len(key))
+        self.engine = None
+
+
+class KeyRing:
+    """
+    Envelope encryption keys.
+
+    Each user owns a random AES-256 data key (DEK) stored on User.wrapped_dek,
+    sealed under the master ENCRYPTION_KEY with the user id as associated data.
+    Entries are encrypted with the DEK, so rotating the master key only
+    re-wraps one small key per user. Unwrapped keys are kept in a TTL+LRU
+    cache and zeroized when they leave it.
+
+    While a user's data key is being rotated the previous one is kept in
+    User.previous_wrapped_dek, and their engine falls back to it (and then to
+    the master keys) for entries the re-encryption job has not reached yet.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, on_evict=_DataKey.zeroize)
+
+    def wrap(self, user_id: str, key: bytes) -> bytes:
+        """Seal a data key under the current master key."""
+        return get_crypto_engine().seal(key, user_id.encode())
+
+    def unwrap(self, user_id: str, wrapped_dek: bytes) -> bytearray:
+        """
+        Recover a data key, trying the current master key first and then
+        PREVIOUS_ENCRYPTION_KEYS so keys wrapped before a rotation still open.
+        """
+        try:
+            return bytearray(get_master_keychain().unseal(wrapped_dek, user_id.encode()))
+        except InvalidTag:
+            raise ValueError(f"Data key for user {user_id} cannot be unwrapped with any master key")
+
+    def new_wrapped_key(self, user_id: str) -> bytes:
+        """Generate a data key and return it wrapped."""
+        return self.wrap(user_id, AESGCM.generate_key(bit_length=256))
+
+    def engine_for(
+        self,
+        user_id: str,
+        key_version: int,
+        wrapped_dek: bytes,
+        previous_wrapped_dek: Optional[bytes] = None
+    ) -> CryptoEngine:
+        """
+        Engine sealing with the user's current data key. Entries sealed with the
+        previous generation, or with the master key before the user had one,
+        are still opened.
+        """
+        cached: Optional[_DataKey] = self._cache.get(user_id)
+        if cached is not None and cached.key_version == key_version:
+            DEK_CACHE_HITS.inc()
+            return cached.engine
+
+        DEK_CACHE_MISSES.inc()
+        data_key = self._open(user_id, key_version, wrapped_dek, previous_wrapped_dek)
+        self._cache.set(user_id, data_key)
+        return data_key.engine
+
+    def _open(
+        self,
+        user_id: str,
+        key_version: int,
+        wrapped_dek: bytes,
+        previous_wrapped_dek: Optional[bytes]
+    ) -> _DataKey:
+        keys = [self.unwrap(user_id, wrapped_dek)]
+        fallback = get_master_keychain()
+        if previous_wrapped_dek is not None:
+            keys.append(self.unwrap(user_id, previous_wrapped_dek))
+            fallback = CryptoEngine(
+                keys[1], version=ENVELOPE_FORMAT_VERSION, fallback=fallback, key_version=key_version - 1
+            )
+        engine = CryptoEngine(
+            keys[0], version=ENVELOPE_FORMAT_VERSION, fallback=fallback, key_version=key_version
+        )
+        return _DataKey(key_version, keys, engine)
+
+    async def engine_for_user(self, user: User, session: AsyncSession) -> CryptoEngine:
+        """
+        Engine for a user, assigning a data key first if they predate envelope
+        encryption. The key is stored in session's unit of work, so anything
+        sealed with it commits or rolls back together with it; a key that has
+        not committed yet is not cached.
+        """
+        if user.wrapped_dek is None:
+            wrapped_dek, assigned = await self._assign_key(session, user.id)
+            set_committed_value(user, "wrapped_dek", wrapped_dek)
+            if assigned:
+                after_commit(session, lambda: user_cache.invalidate(user.id))
+                return self._open(user.id, user.key_version, wrapped_dek, user.previous_wrapped_dek).engine
+            await user_cache.invalidate(user.id)
+        return self.engine_for(user.id, user.key_version, user.wrapped_dek, user.previous_wrapped_dek)
+
+    async def _assign_key(self, session: AsyncSession, user_id: str) -> tuple[bytes, bool]:
+        """
+        Store a fresh wrapped key unless another transaction got there first,
+        in which case theirs is returned. The guarded UPDATE waits on the row
+        lock of a concurrent assignment, so both requests end up with one key.
+        Returns the wrapped key and whether it was assigned here.
+        """
+        wrapped_dek = self.new_wrapped_key(user_id)
+        result = await session.execute(
+            update(User)
+            .where(User.id == user_id, User.wrapped_dek.is_(None))
+            .values(wrapped_dek=wrapped_dek)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            logger.info("Assigned data key to user %s", user_id)
+            return wrapped_dek, True
+        return await session.scalar(select(User.wrapped_dek).where(User.id == user_id)), False
+
+    def forget(self, user_id: str) -> None:
+        """Drop and zeroize a user's cached data key."""
+        self._cache.pop(user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    async def rewrap_all(self, batch_size: int = 500) -> int:
+        """
+        Re-wrap every data key under the current master key, one committed
+        batch at a time. Entries are untouched. Returns the number of users rewrapped.
+        """
+        master = get_crypto_engine()
+
+        def rewrap(user_id: str, wrapped_dek: Optional[bytes]) -> Optional[bytes]:
+            if wrapped_dek is None or self._wrapped_by(master, user_id, wrapped_dek):
+                return None
+            key = self.unwrap(user_id, wrapped_dek)
+            try:
+                return self.wrap(user_id, bytes(key))
+            finally:
+                key[:] = bytes(len(key))
+
+        rewrapped = 0
+        async for session, users in self._user_batches(batch_size):
+            changed = []
+            for user_id, wrapped_dek, previous_wrapped_dek in users:
+                values = {
+                    column: value for column, value in (
+                        ("wrapped_dek", rewrap(user_id, wrapped_dek)),
+                        ("previous_wrapped_dek", rewrap(user_id, previous_wrapped_dek)),
+                    ) if value is not None
+                }
+                if values:
+                    await session.execute(update(User).where(User.id == user_id).values(**values))
+                    changed.append(user_id)
+            await session.commit()
+            for user_id in changed:
+                await user_cache.invalidate(user_id)
+            rewrapped += len(changed)
+        return rewrapped
+
+    async def rotate_data_keys(
+        self,
+        user_ids: Optional[Sequence[str]] = None,
+        batch_size: int = 500
+    ) -> int:
+        """
+        Give users a new data key generation, keeping the current key as
+        previous_wrapped_dek until the re-encryption job has moved their entries.
+        Users with a rotation still in flight are skipped. Returns the number rotated.
+        """
+        rotated = 0
+        async for session, users in self._user_batches(batch_size, user_ids):
+            changed = []
+            for user_id, wrapped_dek, previous_wrapped_dek in users:
+                if wrapped_dek is None or previous_wrapped_dek is not None:
+                    continue
+                result = await session.execute(
+                    update(User)
+                    .where(User.id == user_id, User.previous_wrapped_dek.is_(None))
+                    .values(
+                        previous_wrapped_dek=User.wrapped_dek,
+                        wrapped_dek=self.new_wrapped_key(user_id),
+                        key_version=User.key_version + 1,
+                    )
+                )
+                if result.rowcount:
+                    changed.append(user_id)
+            await session.commit()
+            for user_id in changed:
+                await user_cache.invalidate(user_id)
+            rotated += len(changed)
+        return rotated
+
+    async def _user_batches(
+        self,
+        batch_size: int,
+        user_ids: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[tuple[AsyncSession, list]]:
+        """Yield (session, rows of id/wrapped_dek/previous_wrapped_dek) in id order."""
+        last_id = ""
+        while True:
+            async with db_manager.async_session() as session:
+                query = (
+                    select(User.id, User.wrapped_dek, User.previous_wrapped_dek)
+                    .where(User.id > last_id)
+                    .order_by(User.id)
+                    .limit(batch_size)
+                )
+                if user_ids is not None:
+                    query = query.where(User.id.in_(user_ids))
+                rows = (await session.execute(query)).all()
+                if not rows:
+                    return
+                yield session, rows
+                last_id = rows[-1].id
+
+    @staticmethod
+    def _wrapped_by(master: CryptoEngine, user_id: str, wrapped_dek: bytes) -> bool:
+        try:
+            master.unseal(wrapped_dek, user_id.encode())
+        except InvalidTag:
+            return False
+        return True
+
+# Global data key ring
+keyring = KeyRing(
+    maxsize=settings.DEK_CACHE_MAXSIZE,
+    ttl=settings.DEK_CACHE_TTL_SECONDS,
+)
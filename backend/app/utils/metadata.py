@@ -0,0 +1,157 @@
+"""
+Encrypted entry metadata and its blind index.
+
+With ENCRYPT_METADATA on, an entry's title, username and url are sealed
+together into passwords.sealed_metadata with the owner's data key and the
+plaintext columns are left blank (title and username empty, url NULL), so
+search_text only covers tags. Entries keep the form they were written in
+until their title, username, url or password next changes, so plaintext
+and sealed entries coexist and every read path opens the sealed ones.
+
+To keep username and domain lookups indexed, every sealed entry gets
+password_blind_index rows: keyed HMAC tokens (utils.crypto.BlindIndex) of
+  - the normalized username, and each of its prefixes of MIN_PREFIX to
+    MAX_PREFIX characters,
+  - the url host and each parent domain, so a domain also finds its
+    subdomains, and each host prefix of MIN_PREFIX to MAX_PREFIX characters.
+Tokens reveal which sealed entries share a value or prefix, but not the
+value itself. Prefix lookups on sealed entries need at least MIN_PREFIX
+characters and compare only the first MAX_PREFIX.
+"""
+import json
+from typing import Iterable, Mapping, Optional, Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Password, PasswordBlindToken
+from .crypto import BlindIndex, CryptoEngine, decrypt_batch, encrypt_batch, get_blind_index
+from .search import url_host
+
+passwords = Password.__table__
+blind_tokens = PasswordBlindToken.__table__
+
+METADATA_FIELDS = ("title", "username", "url")
+MIN_PREFIX = 3
+MAX_PREFIX = 32
+
+# Token kinds
+USERNAME = "username"
+USERNAME_PREFIX = "username_prefix"
+DOMAIN = "domain"
+HOST_PREFIX = "host_prefix"
+
+def normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+def prefixes(value: str) -> list[str]:
+    return [value[:length] for length in range(MIN_PREFIX, min(len(value), MAX_PREFIX) + 1)]
+
+def lookup_prefix(value: str) -> Optional[str]:
+    """The indexed prefix to look up for value, or None if it is too short."""
+    value = normalize(value)
+    return value[:MAX_PREFIX] if len(value) >= MIN_PREFIX else None
+
+def parent_domains(host: str) -> list[str]:
+    """The host and each parent domain of at least two labels."""
+    labels = host.split(".")
+    return [".".join(labels[index:]) for index in range(max(len(labels) - 1, 1))]
+
+def index_tokens(index: BlindIndex, username: str, url: Optional[str]) -> set[bytes]:
+    username = normalize(username)
+    host = url_host(url).lower()
+    tokens = set(index.tokens(USERNAME_PREFIX, prefixes(username)))
+    if username:
+        tokens.add(index.token(USERNAME, username))
+    if host:
+        tokens.update(index.tokens(DOMAIN, parent_domains(host)))
+        tokens.update(index.tokens(HOST_PREFIX, prefixes(host)))
+    return tokens
+
+def _serialize(title: str, username: str, url: Optional[str]) -> str:
+    return json.dumps([title, username, url], separators=(",", ":"))
+
+def seal_metadata(crypto: CryptoEngine, title: str, username: str, url: Optional[str]) -> bytes:
+    return crypto.encrypt(_serialize(title, username, url))
+
+async def seal_batch(crypto: CryptoEngine, entries: Sequence[tuple[str, str, Optional[str]]]) -> list[bytes]:
+    """Seal (title, username, url) triples, offloaded like encrypt_batch."""
+    return await encrypt_batch([_serialize(*entry) for entry in entries], crypto)
+
+def open_metadata(crypto: CryptoEngine, sealed: bytes) -> dict:
+    return dict(zip(METADATA_FIELDS, json.loads(crypto.decrypt(sealed))))
+
+def metadata_columns(title: str, username: str, url: Optional[str], sealed: Optional[bytes]) -> dict:
+    """Column values storing title, username and url, blanked when sealed is given."""
+    if sealed is None:
+        return {"title": title, "username": username, "url": url, "sealed_metadata": None}
+    return {"title": "", "username": "", "url": None, "sealed_metadata": sealed}
+
+async def open_items(
+    crypto: CryptoEngine,
+    items: Sequence[dict],
+    sealed_values: Sequence[Optional[bytes]]
+) -> None:
+    """Fill the metadata fields present in each item from its sealed value, if any."""
+    pending = [(item, sealed) for item, sealed in zip(items, sealed_values) if sealed is not None]
+    if not pending:
+        return
+    plaintexts = await decrypt_batch([sealed for _, sealed in pending], crypto)
+    for (item, _), plaintext in zip(pending, plaintexts):
+        for field, value in zip(METADATA_FIELDS, json.loads(plaintext)):
+            if field in item:
+                item[field] = value
+
+async def load_metadata(
+    session: AsyncSession,
+    crypto: CryptoEngine,
+    password_ids: Iterable[str]
+) -> dict[str, dict]:
+    """Current title, username and url of entries, opening sealed ones."""
+    result = await session.execute(
+        select(
+            passwords.c.id, passwords.c.title, passwords.c.username, passwords.c.url,
+            passwords.c.sealed_metadata
+        ).where(passwords.c.id.in_(list(password_ids)))
+    )
+    return {
+        row.id: (
+            open_metadata(crypto, row.sealed_metadata) if row.sealed_metadata is not None
+            else {"title": row.title, "username": row.username, "url": row.url}
+        )
+        for row in result.all()
+    }
+
+async def add_blind_tokens(
+    session: AsyncSession,
+    user_id: str,
+    entries: Mapping[str, tuple[str, Optional[str]]]
+) -> None:
+    """Index sealed entries, given as {password_id: (username, url)}."""
+    if not entries:
+        return
+    index = get_blind_index(user_id)
+    rows = [
+        {"password_id": password_id, "token": token, "user_id": user_id}
+        for password_id, (username, url) in entries.items()
+        for token in index_tokens(index, username, url)
+    ]
+    if rows:
+        await session.execute(insert(blind_tokens), rows)
+
+async def delete_blind_tokens(session: AsyncSession, password_ids: Iterable[str]) -> None:
+    password_ids = list(password_ids)
+    if password_ids:
+        await session.execute(
+            delete(blind_tokens).where(blind_tokens.c.password_id.in_(password_ids))
+        )
+
+async def replace_blind_tokens(
+    session: AsyncSession,
+    user_id: str,
+    password_ids: Iterable[str],
+    entries: Mapping[str, tuple[str, Optional[str]]]
+) -> None:
+    """Drop the tokens of password_ids, then index entries (the ones now sealed)."""
+    await delete_blind_tokens(session, password_ids)
+    await add_blind_tokens(session, user_id, entries)
@@ -0,0 +1,37 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+def encode_cursor(created_at: datetime, entry_id: str) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    raw = json.dumps([created_at.isoformat(), entry_id], separators=(",", ":"))
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, entry_id = json.loads(urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(entry_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def encode_search_cursor(rank: int, title: str, entry_id: str) -> str:
+    """Encode a (rank, lowercased title, id) position in search results."""
+    raw = json.dumps([rank, title, entry_id], separators=(",", ":"))
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str) -> tuple[int, str, str]:
+    """
+    Decode a cursor produced by encode_search_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, title, entry_id = json.loads(urlsafe_b64decode(padded.encode()))
+        return int(rank), str(title), str(entry_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
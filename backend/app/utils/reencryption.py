@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import and_, bindparam, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..database import db_manager
+from ..models import Password, RotationCheckpoint, User
+from .keyring import keyring
+from .user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+REENCRYPTED_ROWS = metrics.counter(
+    "passman_reencrypted_rows_total",
+    "Vault entries re-sealed under their owner's current data key",
+)
+
+passwords = Password.__table__
+
+# Guarded on the old ciphertext and sealed metadata so an entry rewritten
+# through the API while the batch was in flight is left alone; updated_at is
+# kept so clients do not see a rotation as an edit.
+_RESEAL = (
+    passwords.update()
+    .where(
+        passwords.c.id == bindparam("b_id"),
+        passwords.c.ciphertext == bindparam("b_old"),
+        passwords.c.sealed_metadata.is_not_distinct_from(bindparam("b_old_metadata")),
+    )
+    .values(
+        ciphertext=bindparam("b_new"),
+        sealed_metadata=bindparam("b_new_metadata"),
+        key_version=bindparam("b_key_version"),
+        updated_at=passwords.c.updated_at,
+    )
+)
+
+
+class ReencryptionJob:
+    """
+    Online, resumable re-encryption of vault entries.
+
+    Walks the passwords table in primary key order, picking entries whose
+    key_version differs from their owner's current data key generation
+    (including entries still sealed with the master key), and re-seals them
+    one committed batch at a time. The position is persisted in
+    key_rotation_checkpoints in the same transaction as each batch, so a
+    stopped job resumes where it left off. Throughput is capped at
+    max_rows_per_second to leave headroom for API traffic, which keeps
+    reading throughout since every user engine also opens older keys.
+    """
+
+    def __init__(
+        self,
+        name: str = "reencrypt",
+        batch_size: int = settings.REENCRYPT_BATCH_SIZE,
+        max_rows_per_second: int = settings.REENCRYPT_MAX_ROWS_PER_SECOND
+    ):
+        self.name = name
+        self.batch_size = batch_size
+        self.max_rows_per_second = max_rows_per_second
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Ask the job to exit after the batch in flight."""
+        self._stopping.set()
+
+    async def run(self, restart: bool = False) -> int:
+        """
+        Run until every entry is current or stop() is called.
+        Returns the number of entries re-sealed in this run.
+        """
+        last_id = await self._load_checkpoint(restart)
+        if last_id:
+            logger.info("Resuming re-encryption job %s after entry %s", self.name, last_id)
+
+        total = 0
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            async with db_manager.async_session() as session:
+                rows = (await session.execute(
+                    select(Password.id, Password.user_id, Password.ciphertext, Password.sealed_metadata)
+                    .join(User, User.id == Password.user_id)
+                    .where(Password.id > last_id, Password.key_version != User.key_version)
+                    .order_by(Password.id)
+                    .limit(self.batch_size)
+                )).all()
+                if rows:
+                    params = await self._reseal(session, rows)
+                    await session.execute(_RESEAL, params)
+                    last_id = rows[-1].id
+                    await session.execute(
+                        update(RotationCheckpoint)
+                        .where(RotationCheckpoint.name == self.name)
+                        .values(
+                            last_id=last_id,
+                            rows_reencrypted=RotationCheckpoint.rows_reencrypted + len(params),
+                        )
+                    )
+                    await session.commit()
+
+            if not rows:
+                if not await self._finish():
+                    break
+                logger.info("Re-encryption job %s complete, %d entries re-sealed", self.name, total)
+                return total
+
+            total += len(params)
+            REENCRYPTED_ROWS.inc(len(params))
+            await self._throttle(len(rows), time.monotonic() - started)
+
+        logger.info("Re-encryption job %s stopped after entry %s", self.name, last_id)
+        return total
+
+    async def _reseal(self, session: AsyncSession, rows: list) -> list[dict]:
+        """Decrypt each row with whichever key opens it and seal it with the current one."""
+        owners = {
+            user.id: user for user in (await session.scalars(
+                select(User).where(User.id.in_({row.user_id for row in rows}))
+            )).all()
+        }
+        params = []
+        for row in rows:
+            engine = await keyring.engine_for_user(owners[row.user_id], session)
+            metadata = row.sealed_metadata
+            params.append({
+                "b_id": row.id,
+                "b_old": row.ciphertext,
+                "b_new": engine.seal(engine.unseal(row.ciphertext)),
+                "b_old_metadata": metadata,
+                "b_new_metadata": None if metadata is None else engine.seal(engine.unseal(metadata)),
+                "b_key_version": engine.key_version,
+            })
+        return params
+
+    async def _throttle(self, rows: int, elapsed: float) -> None:
+        if self.max_rows_per_second <= 0:
+            return
+        await self._sleep(rows / self.max_rows_per_second - elapsed)
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Wait up to seconds; returns False if stop() was called meanwhile."""
+        if seconds > 0:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+            except asyncio.TimeoutError:
+                pass
+        return not self._stopping.is_set()
+
+    async def _load_checkpoint(self, restart: bool) -> str:
+        """Return the id to resume after, starting a new pass if none is in progress."""
+        async with db_manager.async_session() as session:
+            checkpoint = await session.get(RotationCheckpoint, self.name)
+            if checkpoint is None:
+                checkpoint = RotationCheckpoint(name=self.name)
+                session.add(checkpoint)
+            elif restart or checkpoint.completed_at is not None:
+                checkpoint.last_id = ""
+                checkpoint.rows_reencrypted = 0
+                checkpoint.started_at = datetime.utcnow()
+                checkpoint.completed_at = None
+            await session.commit()
+            return checkpoint.last_id or ""
+
+    async def _finish(self) -> bool:
+        """
+        Mark the pass complete and retire previous data keys no entry uses any more.
+
+        An API worker that missed a rotation's cache invalidation keeps sealing
+        with the old generation until its cached user expires, so retiring is
+        done in two steps: pick users without stale entries, wait out
+        USER_CACHE_TTL_SECONDS plus REENCRYPT_RETIRE_GRACE_SECONDS, and retire
+        only those that still have none. The others keep their previous key
+        until a later run. Returns False if the job was stopped while waiting.
+        """
+        async with db_manager.async_session() as session:
+            candidates = (await session.scalars(select(User.id).where(_retirable()))).all()
+        if candidates:
+            cache_ttl = settings.USER_CACHE_TTL_SECONDS if settings.USER_CACHE_ENABLED else 0
+            logger.info(
+                "Retiring previous data keys of %d users after %ss without stale writes",
+                len(candidates), cache_ttl + settings.REENCRYPT_RETIRE_GRACE_SECONDS
+            )
+            if not await self._sleep(cache_ttl + settings.REENCRYPT_RETIRE_GRACE_SECONDS):
+                return False
+
+        retired = []
+        async with db_manager.async_session() as session:
+            for start in range(0, len(candidates), self.batch_size):
+                retired += (await session.scalars(
+                    update(User)
+                    .where(User.id.in_(candidates[start:start + self.batch_size]), _retirable())
+                    .values(previous_wrapped_dek=None)
+                    .returning(User.id)
+                )).all()
+            await session.execute(
+                update(RotationCheckpoint)
+                .where(RotationCheckpoint.name == self.name)
+                .values(completed_at=datetime.utcnow())
+            )
+            await session.commit()
+        for user_id in retired:
+            await user_cache.invalidate(user_id)
+        if retired:
+            logger.info("Retired previous data keys of %d users", len(retired))
+        return True
+
+
+def _retirable():
+    """Users with a previous data key that none of their entries is sealed with."""
+    stale_entries = exists().where(
+        and_(Password.user_id == User.id, Password.key_version != User.key_version)
+    )
+    return and_(User.previous_wrapped_dek.is_not(None), ~stale_entries)
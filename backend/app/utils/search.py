@@ -0,0 +1,61 @@
+"""
+Search documents for vault entries.
+
+passwords.search_text holds the lowercased title, username, url host and
+tags of an entry, one per line, and is what the search index covers (FTS5
+trigram on SQLite, pg_trgm GIN on PostgreSQL; see models.password_entry).
+Write paths set it with search_document(); bulk updates that may change
+only some of the inputs call refresh_search_text() afterwards.
+"""
+from typing import Iterable, Optional, Sequence
+from urllib.parse import urlsplit
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Password
+
+passwords = Password.__table__
+
+_SET_SEARCH_TEXT = (
+    passwords.update()
+    .where(passwords.c.id == bindparam("b_id"))
+    .values(search_text=bindparam("b_search_text"))
+)
+
+def url_host(url: Optional[str]) -> str:
+    """Host part of a url, also for urls stored without a scheme."""
+    if not url:
+        return ""
+    url = url.strip()
+    try:
+        host = urlsplit(url if "://" in url else f"//{url}").hostname
+    except ValueError:
+        host = None
+    return host or ""
+
+def search_document(
+    title: str,
+    username: str,
+    url: Optional[str],
+    tags: Optional[Sequence[str]]
+) -> str:
+    fields = [title, username, url_host(url), *(tags or ())]
+    return "\n".join(field.lower() for field in fields if field)
+
+async def refresh_search_text(session: AsyncSession, password_ids: Iterable[str]) -> None:
+    """Rebuild search_text for entries from their current columns."""
+    password_ids = list(password_ids)
+    if not password_ids:
+        return
+    result = await session.execute(
+        select(
+            passwords.c.id, passwords.c.title, passwords.c.username, passwords.c.url, passwords.c.tags
+        ).where(passwords.c.id.in_(password_ids))
+    )
+    rows = [
+        {"b_id": row.id, "b_search_text": search_document(row.title, row.username, row.url, row.tags)}
+        for row in result.all()
+    ]
+    if rows:
+        await session.execute(_SET_SEARCH_TEXT, rows)
@@ -0,0 +1,78 @@
+"""
+Single-pass JSON serialization for large listings.
+
+Routes that return many rows build plain dicts straight from result tuples
+and encode them here, instead of validating a Pydantic model per row and
+letting FastAPI validate and serialize the list against response_model a
+second time. The route keeps its response_model so the OpenAPI schema is
+unchanged; rows_to_dicts only emits fields that schema declares.
+
+orjson is used when installed and falls back to the standard library
+encoder otherwise; both produce the same output as Pydantic for the types
+stored in the vault (str, None, lists of str and naive datetimes).
+"""
+import datetime as dt
+import json
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (dt.datetime, dt.date, dt.time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+_encoder = json.JSONEncoder(
+    default=_default,
+    ensure_ascii=False,
+    allow_nan=False,
+    separators=(",", ":"),
+)
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return _encoder.encode(content).encode("utf-8")
+
+def rows_to_dicts(
+    rows: Iterable[Sequence],
+    fields: Sequence[str],
+    defaults: Optional[Mapping[str, Any]] = None
+) -> list[dict]:
+    """
+    Build one dict per row, pairing fields with row values by position.
+    Fields in defaults replace a NULL column, mirroring the schema's default.
+    """
+    if not defaults:
+        return [dict(zip(fields, row)) for row in rows]
+    items = []
+    for row in rows:
+        item = dict(zip(fields, row))
+        for field, default in defaults.items():
+            if item.get(field, default) is None:
+                item[field] = default() if callable(default) else default
+        items.append(item)
+    return items
+
+class FastJSONResponse(Response):
+    """JSON response encoded with dumps(); content must already be JSON-ready."""
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        super().__init__(content, status_code, headers, self.media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
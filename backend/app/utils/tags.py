@@ -0,0 +1,56 @@
+"""
+Keeps the password_tags table in step with passwords.tags.
+
+Every write path that sets an entry's tags calls add_tags (new entries) or
+replace_tags (existing ones) in the same transaction; delete_tags runs
+before entries are deleted, since SQLite does not enforce the ON DELETE
+CASCADE of the foreign key unless foreign_keys is switched on.
+"""
+from typing import Iterable, Mapping, Optional, Sequence
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import PasswordTag
+from ..models.password_tag import MAX_TAG_LENGTH
+
+password_tags = PasswordTag.__table__
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> list[str]:
+    """Distinct, non-empty tags in their original order; over-long tags are dropped."""
+    return list(dict.fromkeys(
+        tag for tag in tags or () if tag and len(tag) <= MAX_TAG_LENGTH
+    ))
+
+def tag_rows(user_id: str, entries: Mapping[str, Optional[Sequence[str]]]) -> list[dict]:
+    return [
+        {"password_id": password_id, "tag": tag, "user_id": user_id}
+        for password_id, tags in entries.items()
+        for tag in normalize_tags(tags)
+    ]
+
+async def add_tags(
+    session: AsyncSession,
+    user_id: str,
+    entries: Mapping[str, Optional[Sequence[str]]]
+) -> None:
+    """Index the tags of new entries, given as {password_id: tags}."""
+    rows = tag_rows(user_id, entries)
+    if rows:
+        await session.execute(insert(password_tags), rows)
+
+async def delete_tags(session: AsyncSession, password_ids: Iterable[str]) -> None:
+    password_ids = list(password_ids)
+    if password_ids:
+        await session.execute(
+            delete(password_tags).where(password_tags.c.password_id.in_(password_ids))
+        )
+
+async def replace_tags(
+    session: AsyncSession,
+    user_id: str,
+    entries: Mapping[str, Optional[Sequence[str]]]
+) -> None:
+    """Re-index the tags of existing entries, given as {password_id: tags}."""
+    await delete_tags(session, entries)
+    await add_tags(session, user_id, entries)
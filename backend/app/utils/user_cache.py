@@ -0,0 +1,86 @@
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.pubsub import broker
+from ..models import User
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "passman:user-invalidations"
+
+USER_CACHE_HITS = metrics.counter(
+    "passman_user_cache_hits_total",
+    "Authenticated user lookups served from the principal cache",
+)
+USER_CACHE_MISSES = metrics.counter(
+    "passman_user_cache_misses_total",
+    "Authenticated user lookups that had to load the user from the database",
+)
+
+
+class UserCache:
+    """
+    TTL+LRU cache of authenticated user principals keyed by user id.
+
+    Only column values are cached; a hit is turned back into a detached User
+    and attached to the request session without a SELECT. Invalidations are
+    published through the broker so every worker drops its copy.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, enabled: bool = True):
+        self.enabled = enabled
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._columns = [attr.key for attr in inspect(User).column_attrs]
+        broker.subscribe(INVALIDATION_CHANNEL, self._on_invalidation)
+        # Invalidations sent while the broker was disconnected never arrive
+        broker.on_reconnect(self.clear)
+
+    def get(self, user_id: str) -> Optional[User]:
+        """Return a detached User rebuilt from the cache, or None on a miss."""
+        if not self.enabled:
+            return None
+        principal: Optional[Dict[str, Any]] = self._cache.get(user_id)
+        if principal is None:
+            USER_CACHE_MISSES.inc()
+            return None
+        USER_CACHE_HITS.inc()
+        user = User(**principal)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user: User) -> None:
+        if self.enabled:
+            self._cache.set(user.id, {column: getattr(user, column) for column in self._columns})
+
+    async def invalidate(self, user_id: str) -> None:
+        """Drop a user from this worker's cache and tell the other workers."""
+        self._cache.pop(user_id)
+        await broker.publish(INVALIDATION_CHANNEL, {"user_id": user_id})
+
+    def _on_invalidation(self, message: Dict[str, Any]) -> None:
+        self._cache.pop(message.get("user_id"))
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+# Global user principal cache
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+    enabled=settings.USER_CACHE_ENABLED,
+)
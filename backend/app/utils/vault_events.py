@@ -0,0 +1,139 @@
+"""
+Real-time vault change notifications.
+
+Write paths call notify_after_commit(); once their unit of work commits, the
+change is published on the broker (in-process, or Redis with PUBSUB_URL) so
+that every worker pushes it to the user's open /ws/vault connections as a
+JSON array of {"id", "op", "version"} events, encoded once per worker.
+
+Connections only hold a small queue. One that falls more than
+VAULT_FEED_QUEUE_SIZE messages behind has its backlog replaced by a single
+{"op": "resync"} event and should catch up with GET /passwords/changes.
+Every connection gets one when the broker reconnects, since changes
+published in the meantime were missed.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.pubsub import broker
+from ..database import after_commit
+from .serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "passman:vault-changes"
+
+# Event ops
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+RESYNC = "resync"
+
+FEED_EVENTS = metrics.counter(
+    "passman_vault_feed_events_total",
+    "Vault change events pushed to /ws/vault connections",
+)
+FEED_RESYNCS = metrics.counter(
+    "passman_vault_feed_resyncs_total",
+    "/ws/vault connections that fell behind and were told to resync",
+)
+
+
+class VaultFeed:
+    """
+    Per-worker registry of /ws/vault connections, keyed by user id. Each
+    connection is an unbounded asyncio.Queue of encoded frames whose length
+    is capped by _deliver, so producers never block; None ends the stream.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._listeners: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._connections = 0
+        broker.subscribe(CHANNEL, self._on_change)
+        broker.on_reconnect(self._resync_all)
+
+    def listen(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners[user_id].add(queue)
+        self._connections += 1
+        return queue
+
+    def unlisten(self, user_id: str, queue: asyncio.Queue) -> None:
+        listeners = self._listeners.get(user_id)
+        if listeners is None or queue not in listeners:
+            return
+        listeners.discard(queue)
+        self._connections -= 1
+        if not listeners:
+            del self._listeners[user_id]
+
+    @property
+    def connections(self) -> int:
+        return self._connections
+
+    async def publish(self, user_id: str, op: str, password_ids: Iterable[str], version: int) -> None:
+        password_ids = list(password_ids)
+        if password_ids:
+            await broker.publish(CHANNEL, {
+                "user_id": user_id, "op": op, "ids": password_ids, "version": version
+            })
+
+    def _on_change(self, message: Dict[str, Any]) -> None:
+        listeners = self._listeners.get(message.get("user_id"))
+        if not listeners:
+            return
+        op, version = message["op"], message["version"]
+        events = [{"id": password_id, "op": op, "version": version} for password_id in message["ids"]]
+        frame = dumps(events).decode()
+        for queue in listeners:
+            self._deliver(queue, frame, version)
+        FEED_EVENTS.inc(len(events) * len(listeners))
+
+    def _deliver(self, queue: asyncio.Queue, frame: str, version: int) -> None:
+        if queue.qsize() < self.queue_size:
+            queue.put_nowait(frame)
+            return
+        # The client is not keeping up; drop its backlog and have it resync
+        while not queue.empty():
+            if queue.get_nowait() is None:
+                queue.put_nowait(None)
+                return
+        queue.put_nowait(dumps([{"id": None, "op": RESYNC, "version": version}]).decode())
+        FEED_RESYNCS.inc()
+
+    def _resync_all(self) -> None:
+        frame = dumps([{"id": None, "op": RESYNC, "version": None}]).decode()
+        for listeners in self._listeners.values():
+            for queue in listeners:
+                queue.put_nowait(frame)
+        FEED_RESYNCS.inc(self._connections)
+
+
+def notify_after_commit(
+    session: AsyncSession,
+    user_id: str,
+    op: str,
+    password_ids: Iterable[str],
+    version: Optional[int]
+) -> None:
+    """Publish a change to user_id's entries once session's unit of work commits."""
+    password_ids = list(password_ids)
+    if password_ids and version is not None:
+        after_commit(session, lambda: vault_feed.publish(user_id, op, password_ids, version))
+
+
+# Global feed instance; subscribes to the broker before it starts
+vault_feed = VaultFeed(settings.VAULT_FEED_QUEUE_SIZE)
+
+metrics.gauge(
+    "passman_vault_feed_connections",
+    "Open /ws/vault connections on this worker",
+    callback=lambda: vault_feed.connections,
+)
@@ -0,0 +1,231 @@
+import codecs
+import csv
+import io
+import json
+import re
+from enum import Enum
+from typing import AsyncIterator, Iterable, Optional, Sequence
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+# Columns of a plaintext export, and of one re-encrypted under an export key
+EXPORT_COLUMNS = (
+    "id", "title", "username", "password", "url", "notes", "tags", "created_at", "updated_at"
+)
+SEALED_EXPORT_COLUMNS = (
+    "id", "title", "username", "ciphertext", "url", "notes", "tags",
+    "created_at", "updated_at"
+)
+
+TAG_SEPARATOR = ";"
+
+def serialize_ndjson(records: Iterable[dict]) -> str:
+    """Serialize records as newline-delimited JSON."""
+    return "".join(
+        json.dumps(record, default=str, separators=(",", ":")) + "\n"
+        for record in records
+    )
+
+def csv_header(columns: Sequence[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue()
+
+def serialize_csv(records: Iterable[dict], columns: Sequence[str]) -> str:
+    """Serialize records as CSV rows; tags are joined with TAG_SEPARATOR."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow([
+            TAG_SEPARATOR.join(record[column] or []) if column == "tags"
+            else record[column] if record[column] is not None
+            else ""
+            for column in columns
+        ])
+    return buffer.getvalue()
+
+class ImportFormat(str, Enum):
+    CSV = "csv"
+    JSON = "json"
+    NDJSON = "ndjson"
+
+# Column and key names used by common password managers, matched case-insensitively
+FIELD_ALIASES = {
+    "title": ("title", "name"),
+    "username": ("username", "login_username", "login name", "user"),
+    "password": ("password", "login_password"),
+    "url": ("url", "login_uri", "website", "uri"),
+    "notes": ("notes", "note", "extra"),
+    "tags": ("tags", "grouping", "folder"),
+}
+
+ITEMS_ARRAY = re.compile(r'"items"\s*:\s*\[')
+
+def _split_tags(value) -> list[str]:
+    if isinstance(value, list):
+        return [str(tag) for tag in value if tag]
+    if not value:
+        return []
+    return [tag.strip() for tag in str(value).split(TAG_SEPARATOR) if tag.strip()]
+
+def _normalize(values: dict) -> dict:
+    """Map a record keyed by lowercase column names onto PasswordCreate fields."""
+    record = {}
+    for field, aliases in FIELD_ALIASES.items():
+        value = next((values[alias] for alias in aliases if values.get(alias) not in (None, "")), None)
+        if field == "tags":
+            record[field] = _split_tags(value)
+        elif value is not None:
+            record[field] = value
+    return record
+
+def normalize_json_record(item) -> Optional[dict]:
+    """Normalize a generic or Bitwarden JSON item; None if it is not an object."""
+    if not isinstance(item, dict):
+        return None
+    login = item.get("login")
+    if isinstance(login, dict):
+        uris = login.get("uris") or []
+        return _normalize({
+            "title": item.get("name"),
+            "username": login.get("username"),
+            "password": login.get("password"),
+            "url": uris[0].get("uri") if uris and isinstance(uris[0], dict) else None,
+            "notes": item.get("notes"),
+        })
+    return _normalize({str(key).lower(): value for key, value in item.items()})
+
+async def _iter_text(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = ""
+    async for text in _iter_text(chunks):
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    if buffer:
+        yield buffer
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, Optional[dict]]]:
+    """
+    Yield (row_number, record) for each CSV data row.
+    Physical lines are buffered until their quote count is balanced, so quoted
+    fields spanning several lines are parsed as one record.
+    """
+    columns = None
+    pending: list[str] = []
+    quotes = 0
+    row_number = 0
+    async for line in _iter_lines(chunks):
+        pending.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        text = "".join(pending)
+        pending, quotes = [], 0
+        if not text.strip():
+            continue
+        values = next(csv.reader(io.StringIO(text)))
+        if columns is None:
+            columns = [column.strip().lower() for column in values]
+            continue
+        row_number += 1
+        yield row_number, _normalize(dict(zip(columns, values)))
+    if pending:
+        yield row_number + 1, None
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, Optional[dict]]]:
+    """Yield (row_number, record) for each non-empty NDJSON line."""
+    row_number = 0
+    async for line in _iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = normalize_json_record(json.loads(line))
+        except ValueError:
+            record = None
+        yield row_number, record
+
+async def iter_json_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, Optional[dict]]]:
+    """
+    Yield (row_number, record) for each element of a JSON array, decoding one
+    element at a time. Accepts a top-level array or an object with an "items"
+    array (Bitwarden). Raises ValueError on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    texts = _iter_text(chunks).__aiter__()
+    buffer = ""
+    pos = 0
+
+    async def fill() -> bool:
+        nonlocal buffer, pos
+        try:
+            text = await texts.__anext__()
+        except StopAsyncIteration:
+            return False
+        buffer = buffer[pos:] + text
+        pos = 0
+        return True
+
+    # Locate the opening bracket of the array
+    while True:
+        stripped = buffer.lstrip()
+        if stripped.startswith("["):
+            pos = len(buffer) - len(stripped) + 1
+            break
+        match = ITEMS_ARRAY.search(buffer) if stripped.startswith("{") else None
+        if match:
+            pos = match.end()
+            break
+        if stripped and not stripped.startswith(("[", "{")):
+            raise ValueError("Expected a JSON array or an object with an 'items' array")
+        if not await fill():
+            raise ValueError("No JSON array found")
+
+    row_number = 0
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or not await fill():
+                break
+        if pos >= len(buffer):
+            raise ValueError("Unexpected end of JSON input")
+        if buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if await fill():
+                continue
+            raise ValueError(f"Malformed JSON at item {row_number + 1}")
+        pos = end
+        row_number += 1
+        yield row_number, normalize_json_record(item)
+
+def iter_import_records(
+    chunks: AsyncIterator[bytes],
+    import_format: ImportFormat
+) -> AsyncIterator[tuple[int, Optional[dict]]]:
+    if import_format == ImportFormat.CSV:
+        return iter_csv_records(chunks)
+    if import_format == ImportFormat.NDJSON:
+        return iter_ndjson_records(chunks)
+    return iter_json_records(chunks)
@@ -0,0 +1,289 @@
+"""
+Column-projected queries over a user's vault.
+
+Listing paths select only the columns they return, straight from the
+passwords table, so results come back as plain row tuples: no ORM entities
+are built, nothing enters the session's identity map, and large columns
+such as notes are not fetched unless asked for. Fields are named as in the
+password schemas; "password" maps to the stored ciphertext, which callers
+decrypt in place.
+
+Every row also ends with sealed_metadata, for utils.metadata.open_items;
+filters on username and domain match sealed entries through their blind
+index tokens.
+
+Writes keep using ORM entities; this module only builds SELECTs.
+"""
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import case, desc, false, func, or_, select, text, tuple_, union
+from sqlalchemy.sql import Select
+
+from ..models import Password, PasswordBlindToken, PasswordTag, PasswordTombstone
+from ..models.password_entry import FTS5_TRIGRAM
+from .crypto import blind_index_enabled, get_blind_index
+from .metadata import DOMAIN, HOST_PREFIX, USERNAME, USERNAME_PREFIX, lookup_prefix, normalize
+
+passwords = Password.__table__
+password_tags = PasswordTag.__table__
+blind_tokens = PasswordBlindToken.__table__
+tombstones = PasswordTombstone.__table__
+
+FIELD_COLUMNS = {
+    "id": passwords.c.id,
+    "title": passwords.c.title,
+    "username": passwords.c.username,
+    "password": passwords.c.ciphertext,
+    "url": passwords.c.url,
+    "notes": passwords.c.notes,
+    "tags": passwords.c.tags,
+    "created_at": passwords.c.created_at,
+    "updated_at": passwords.c.updated_at,
+}
+
+def project(fields: Sequence[str], *extra) -> Select:
+    """SELECT the columns behind fields, in order, followed by any extra columns."""
+    return select(*(FIELD_COLUMNS[field] for field in fields), *extra)
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _domain_clause(domain: str):
+    """Match urls whose host is the domain or one of its subdomains."""
+    host = _escape_like(domain.strip().lower())
+    url = func.lower(passwords.c.url)
+    patterns = [
+        f"{prefix}{host}{suffix}"
+        for prefix in ("", "%://", "%.")
+        for suffix in ("", "/%", ":%", "?%")
+    ]
+    return or_(*(url.like(pattern, escape="\\") for pattern in patterns))
+
+def _host_prefix_clause(prefix: str):
+    """Match urls whose host starts with prefix."""
+    host = _escape_like(prefix)
+    url = func.lower(passwords.c.url)
+    return or_(*(url.like(pattern, escape="\\") for pattern in (f"{host}%", f"%://{host}%")))
+
+def _blind_match(user_id: str, kind: str, value: str):
+    """Entries of user_id whose blind index holds the token of (kind, value)."""
+    if not blind_index_enabled():
+        return false()
+    return passwords.c.id.in_(
+        select(blind_tokens.c.password_id).where(
+            blind_tokens.c.user_id == user_id,
+            blind_tokens.c.token == get_blind_index(user_id).token(kind, value)
+        )
+    )
+
+def filter_vault(
+    query: Select,
+    user_id: str,
+    tag: Optional[str] = None,
+    title_prefix: Optional[str] = None,
+    domain: Optional[str] = None,
+    username: Optional[str] = None,
+    username_prefix: Optional[str] = None,
+    domain_prefix: Optional[str] = None
+) -> Select:
+    """
+    Apply the listing filters. Plaintext entries are matched on their
+    columns and sealed ones through the blind index; title_prefix only
+    sees plaintext titles.
+    """
+    if tag:
+        # Resolved through ix_password_tags_user_tag rather than scanning tags JSON
+        query = query.where(passwords.c.id.in_(
+            select(password_tags.c.password_id).where(
+                password_tags.c.user_id == user_id,
+                password_tags.c.tag == tag
+            )
+        ))
+    if title_prefix:
+        query = query.where(
+            func.lower(passwords.c.title).startswith(title_prefix.lower(), autoescape=True)
+        )
+    if domain:
+        query = query.where(or_(
+            _domain_clause(domain),
+            _blind_match(user_id, DOMAIN, normalize(domain))
+        ))
+    if domain_prefix:
+        clause = _host_prefix_clause(normalize(domain_prefix))
+        indexed = lookup_prefix(domain_prefix)
+        if indexed:
+            clause = or_(clause, _blind_match(user_id, HOST_PREFIX, indexed))
+        query = query.where(clause)
+    if username:
+        query = query.where(or_(
+            func.lower(passwords.c.username) == normalize(username),
+            _blind_match(user_id, USERNAME, normalize(username))
+        ))
+    if username_prefix:
+        clause = func.lower(passwords.c.username).startswith(normalize(username_prefix), autoescape=True)
+        indexed = lookup_prefix(username_prefix)
+        if indexed:
+            clause = or_(clause, _blind_match(user_id, USERNAME_PREFIX, indexed))
+        query = query.where(clause)
+    return query
+
+def vault_page(
+    user_id: str,
+    fields: Sequence[str],
+    limit: int,
+    after: Optional[tuple[datetime, str]] = None,
+    **filters
+) -> Select:
+    """
+    One keyset page of a user's vault ordered by (created_at, id), fetching
+    limit + 1 rows so the caller can tell whether another page follows.
+    created_at and id are appended when fields lacks them, so every row
+    carries its cursor position; pair rows with fields by position.
+    filters are passed on to filter_vault.
+    """
+    cursor_columns = [
+        FIELD_COLUMNS[field] for field in ("created_at", "id") if field not in fields
+    ]
+    query = project(fields, *cursor_columns, passwords.c.sealed_metadata).where(
+        passwords.c.user_id == user_id
+    )
+    query = filter_vault(query, user_id, **filters)
+    if after is not None:
+        query = query.where(tuple_(passwords.c.created_at, passwords.c.id) > after)
+    return query.order_by(passwords.c.created_at, passwords.c.id).limit(limit + 1)
+
+def vault_entries(user_id: str, fields: Sequence[str], entry_ids: Sequence[str]) -> Select:
+    """The given entries of a user's vault, in no particular order."""
+    return project(fields, passwords.c.sealed_metadata).where(
+        passwords.c.user_id == user_id,
+        passwords.c.id.in_(entry_ids)
+    )
+
+def vault_export(user_id: str, fields: Sequence[str], batch_size: int) -> Select:
+    """A whole vault in (created_at, id) order, streamed batch_size rows at a time."""
+    return (
+        project(fields, passwords.c.sealed_metadata)
+        .where(passwords.c.user_id == user_id)
+        .order_by(passwords.c.created_at, passwords.c.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+def vault_changes(user_id: str, fields: Sequence[str], since: int, until: int) -> Select:
+    """Entries written at vault versions in (since, until], oldest change first."""
+    return (
+        project(fields, passwords.c.sealed_metadata)
+        .where(
+            passwords.c.user_id == user_id,
+            passwords.c.version > since,
+            passwords.c.version <= until
+        )
+        .order_by(passwords.c.version, passwords.c.id)
+    )
+
+def vault_tombstones(user_id: str, since: int, until: int) -> Select:
+    """Ids of entries deleted at vault versions in (since, until]."""
+    return (
+        select(tombstones.c.password_id)
+        .where(
+            tombstones.c.user_id == user_id,
+            tombstones.c.version > since,
+            tombstones.c.version <= until
+        )
+        .order_by(tombstones.c.version, tombstones.c.password_id)
+    )
+
+def tag_counts(user_id: str) -> Select:
+    """(tag, count) for every tag in a user's vault, most used first."""
+    count = func.count().label("count")
+    return (
+        select(password_tags.c.tag, count)
+        .where(password_tags.c.user_id == user_id)
+        .group_by(password_tags.c.tag)
+        .order_by(desc(count), password_tags.c.tag)
+    )
+
+def _search_rank(term: str):
+    """
+    Relevance bucket of an entry for a lowercased search term, best first:
+    exact title, title prefix, prefix of another field or word, substring
+    of the title, substring elsewhere.
+    """
+    like = _escape_like(term)
+    title = func.lower(passwords.c.title)
+    document = passwords.c.search_text
+    return case(
+        (title == term, 0),
+        (title.like(f"{like}%", escape="\\"), 1),
+        (or_(*(
+            document.like(pattern, escape="\\")
+            for pattern in (f"{like}%", f"%\n{like}%", f"% {like}%", f"%.{like}%")
+        )), 2),
+        (title.like(f"%{like}%", escape="\\"), 3),
+        else_=4,
+    )
+
+def vault_search(
+    user_id: str,
+    term: str,
+    fields: Sequence[str],
+    limit: int,
+    after: Optional[tuple[int, str, str]] = None,
+    dialect: str = "sqlite"
+) -> Select:
+    """
+    One page of a user's entries whose search_text contains term, ordered by
+    relevance, then title and id; fetches limit + 1 rows like vault_page.
+    Rows carry the trailing columns rank and sort_title for the next cursor.
+
+    Terms of three characters or more are answered from the trigram index:
+    on SQLite the query is driven from the FTS5 matches, narrowed to the
+    user's entries and rechecked with the LIKE; on PostgreSQL pg_trgm serves
+    the LIKE. Shorter terms fall back to scanning the user's entries. Sealed
+    entries match on username or host prefix, via the blind index.
+    """
+    term = term.strip().lower()
+    rank = _search_rank(term)
+    sort_title = func.lower(passwords.c.title)
+    cursor_columns = [rank.label("rank"), sort_title.label("sort_title")]
+    if "id" not in fields:
+        cursor_columns.append(passwords.c.id)
+    cursor_columns.append(passwords.c.sealed_metadata)
+    
+    like = f"%{_escape_like(term)}%"
+    match = passwords.c.search_text.like(like, escape="\\")
+    
+    # Sealed entries only expose tags in search_text; their usernames and
+    # hosts are found by exact or prefix blind index tokens instead
+    tokens = []
+    if blind_index_enabled():
+        index = get_blind_index(user_id)
+        tokens = [index.token(USERNAME, term), index.token(DOMAIN, term)]
+        prefix = lookup_prefix(term)
+        if prefix:
+            tokens += [index.token(USERNAME_PREFIX, prefix), index.token(HOST_PREFIX, prefix)]
+    sealed_ids = select(blind_tokens.c.password_id.label("id")).where(
+        blind_tokens.c.user_id == user_id,
+        blind_tokens.c.token.in_(tokens)
+    )
+    
+    query = project(fields, *cursor_columns).where(passwords.c.user_id == user_id)
+    if dialect == "sqlite" and FTS5_TRIGRAM and len(term) >= 3:
+        phrase = '"' + term.replace('"', '""') + '"'
+        # CROSS JOIN keeps the FTS matches as the outer loop; the planner
+        # would otherwise walk the user's entries and rerun MATCH for each
+        matched_ids = text(
+            "SELECT passwords.id AS id FROM password_search CROSS JOIN passwords "
+            "ON passwords.search_rowid = password_search.rowid "
+            "WHERE password_search MATCH :search_phrase AND passwords.user_id = :search_user_id "
+            "AND passwords.search_text LIKE :search_like ESCAPE '\\'"
+        ).bindparams(search_phrase=phrase, search_user_id=user_id, search_like=like).columns(passwords.c.id)
+        candidates = union(sealed_ids, matched_ids).subquery("candidates")
+        query = query.select_from(
+            candidates.join(passwords, passwords.c.id == candidates.c.id)
+        )
+    else:
+        query = query.where(or_(match, passwords.c.id.in_(sealed_ids)))
+    if after is not None:
+        query = query.where(tuple_(rank, sort_title, passwords.c.id) > after)
+    return query.order_by(rank, sort_title, passwords.c.id).limit(limit + 1)
@@ -0,0 +1,112 @@
+"""
+Vault versions for conditional GETs and delta sync.
+
+users.vault_version counts the writes to a user's entries. Every write path
+calls bump_vault_version() once per transaction and stamps the entries it
+writes with the new version (passwords.version); deletes leave a
+password_tombstones row carrying it. The bump is an UPDATE of the user's
+row, which stays locked until the transaction ends, so concurrent writes to
+one vault commit in version order and a client that has seen version N can
+ask for exactly the entries and tombstones above N.
+
+Tombstones older than TOMBSTONE_RETENTION_DAYS are pruned whenever the user
+deletes more entries, and users.tombstone_floor records the highest pruned
+version. A client that last synced below the floor may have missed deletes
+and has to resync from a full listing.
+
+Listings send the version in an ETag and X-Vault-Version header and answer
+a matching If-None-Match with 304 before touching the entries.
+"""
+from datetime import datetime, timedelta
+from hashlib import blake2b
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models import PasswordTombstone, User
+
+users = User.__table__
+tombstones = PasswordTombstone.__table__
+
+VERSION_HEADER = "X-Vault-Version"
+
+async def bump_vault_version(session: AsyncSession, user_id: str) -> int:
+    """Increment a user's vault version and return the new value."""
+    result = await session.execute(
+        update(users)
+        .where(users.c.id == user_id)
+        .values(vault_version=users.c.vault_version + 1)
+        .returning(users.c.vault_version)
+    )
+    return result.scalar_one()
+
+async def current_vault_version(session: AsyncSession, user_id: str) -> int:
+    result = await session.execute(
+        select(users.c.vault_version).where(users.c.id == user_id)
+    )
+    return result.scalar_one()
+
+async def sync_bounds(session: AsyncSession, user_id: str) -> tuple[int, int]:
+    """(tombstone floor, vault version): the versions delta sync can start from."""
+    result = await session.execute(
+        select(users.c.tombstone_floor, users.c.vault_version).where(users.c.id == user_id)
+    )
+    return tuple(result.one())
+
+async def add_tombstones(
+    session: AsyncSession,
+    user_id: str,
+    password_ids: Iterable[str],
+    version: int
+) -> None:
+    """
+    Record deleted entries at the vault version of the delete, and prune the
+    user's tombstones that have outlived TOMBSTONE_RETENTION_DAYS.
+    """
+    rows = [
+        {"password_id": password_id, "user_id": user_id, "version": version}
+        for password_id in password_ids
+    ]
+    if rows:
+        await session.execute(insert(tombstones), rows)
+        await prune_tombstones(session, user_id)
+
+async def prune_tombstones(session: AsyncSession, user_id: str) -> None:
+    """
+    Drop a user's tombstones older than the retention period and raise their
+    tombstone floor to the newest version dropped. Call with the user's row
+    locked by bump_vault_version, so the floor only moves up.
+    """
+    if settings.TOMBSTONE_RETENTION_DAYS <= 0:
+        return
+    cutoff = datetime.utcnow() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    pruned = (await session.execute(
+        delete(tombstones)
+        .where(tombstones.c.user_id == user_id, tombstones.c.deleted_at < cutoff)
+        .returning(tombstones.c.version)
+    )).scalars().all()
+    if pruned:
+        await session.execute(
+            update(users)
+            .where(users.c.id == user_id, users.c.tombstone_floor < max(pruned))
+            .values(tombstone_floor=max(pruned))
+        )
+
+def vault_etag(user_id: str, version: int, query: str) -> str:
+    """
+    Weak ETag of a listing: the vault version plus a digest of the user and
+    query string, since each page, projection and filter is its own response.
+    """
+    digest = blake2b(f"{user_id}\x00{query}".encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against etag."""
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in {
+        candidate.removeprefix("W/") for candidate in candidates
+    }
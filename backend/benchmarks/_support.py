@@ -0,0 +1,107 @@
+"""
+Shared helpers for the API benchmarks.
+
+configure() must run before any app module is imported, since settings are
+read at import time.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from base64 import b64encode
+from pathlib import Path
+from uuid import uuid4
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def configure(database_url: str | None = None) -> Path:
+    """Point the app at a throwaway database and log file."""
+    workdir = Path(tempfile.mkdtemp(prefix="passman-bench-"))
+    os.environ.setdefault("DATABASE_URL", database_url or f"sqlite+aiosqlite:///{workdir / 'bench.db'}")
+    os.environ.setdefault("ENCRYPTION_KEY", b64encode(os.urandom(32)).decode())
+    os.environ.setdefault("LOG_FILE", str(workdir / "bench.log"))
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    return workdir
+
+
+async def seed_vault(entries: int, batch_size: int = 1000) -> tuple[str, str]:
+    """Create a user owning `entries` passwords; returns (user_id, bearer token)."""
+    from app.database import db_manager, init_db
+    from app.models import Password, User
+    from app.routers.auth import create_access_token
+    from app.utils.keyring import keyring
+    from app.utils.search import search_document
+    from app.utils.tags import add_tags
+
+    await init_db()
+    user_id = str(uuid4())
+    wrapped_dek = keyring.new_wrapped_key(user_id)
+    crypto = keyring.engine_for(user_id, 1, wrapped_dek)
+    async with db_manager.async_session() as session:
+        session.add(User(
+            id=user_id,
+            username=f"bench-{user_id[:8]}",
+            email=f"bench-{user_id[:8]}@example.com",
+            hashed_password="not-a-real-hash",
+            wrapped_dek=wrapped_dek,
+        ))
+        for start in range(0, entries, batch_size):
+            tags = {}
+            for index in range(start, min(start + batch_size, entries)):
+                entry_id = str(uuid4())
+                title = f"Entry {index}"
+                username = f"user{index}@example.com"
+                url = f"https://site{index % 500}.example.com/login"
+                tags[entry_id] = ["bench", f"group-{index % 20}"]
+                session.add(Password(
+                    id=entry_id,
+                    user_id=user_id,
+                    title=title,
+                    username=username,
+                    ciphertext=crypto.encrypt(f"secret-{index}"),
+                    key_version=crypto.key_version,
+                    url=url,
+                    notes="benchmark entry",
+                    tags=tags[entry_id],
+                    search_text=search_document(title, username, url, tags[entry_id]),
+                ))
+            await session.flush()
+            await add_tags(session, user_id, tags)
+        await session.commit()
+    return user_id, create_access_token({"sub": user_id})
+
+
+def api_client():
+    """HTTP client bound directly to the ASGI app, without a network hop."""
+    from httpx import ASGITransport, AsyncClient
+    from app.main import app
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+
+
+async def fetch_all_pages(client, path: str, token: str, **params) -> int:
+    """Follow X-Next-Cursor until the listing is exhausted; returns the entry count."""
+    headers = {"Authorization": f"Bearer {token}"}
+    count = 0
+    cursor = None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = await client.get(path, headers=headers, params=query)
+        response.raise_for_status()
+        count += len(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return count
+
+
+async def best_of(func, repeats: int = 5) -> float:
+    """Best wall-clock time in seconds of an async callable."""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
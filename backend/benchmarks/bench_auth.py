@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Per-request overhead of the get_current_user dependency, with and without
+the JWT verification cache. The user principal cache stays enabled in both
+runs so the numbers isolate token verification.
+
+Run from the backend directory:
+    python -m benchmarks.bench_auth
+"""
+
+import asyncio
+import time
+
+from benchmarks._support import configure, seed_vault
+
+REQUESTS = 20_000
+
+
+async def run(token: str) -> float:
+    from app.database import db_manager
+    from app.routers.auth import get_current_user
+
+    async with db_manager.async_session() as session:
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await get_current_user(token, session)
+        return (time.perf_counter() - started) / REQUESTS
+
+
+async def main():
+    configure()
+    from app.routers.auth import token_cache
+
+    _, token = await seed_vault(0)
+
+    maxsize = token_cache.maxsize
+    token_cache.maxsize = 0
+    uncached = await run(token)
+
+    token_cache.maxsize = maxsize
+    cached = await run(token)
+
+    print(f"{'mode':>12} | {'us/request':>10}")
+    print("-" * 26)
+    print(f"{'no cache':>12} | {uncached * 1e6:>10.1f}")
+    print(f"{'token cache':>12} | {cached * 1e6:>10.1f}")
+    print(f"speedup: {uncached / cached:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
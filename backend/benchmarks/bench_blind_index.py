@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Lookups over sealed metadata (ENCRYPT_METADATA on): exact username, username
+prefix and domain filters answered from the blind index, against the only
+alternative without one, loading and decrypting every entry's metadata and
+filtering in Python.
+
+Entries are written through POST /passwords/bulk so they are sealed and
+indexed by the real write path. Runs against a throwaway SQLite database by
+default; pass a database URL to benchmark PostgreSQL instead, e.g.:
+    python -m benchmarks.bench_blind_index postgresql+asyncpg://passman:pw@localhost/passman_bench
+"""
+
+import asyncio
+import json
+import os
+import sys
+from base64 import b64encode
+
+from benchmarks._support import api_client, best_of, configure, seed_vault
+
+VAULT_SIZES = (10_000, 50_000)
+LOOKUPS = (
+    ("username", {"username": "user4242@example.com"}, lambda meta: meta["username"] == "user4242@example.com"),
+    ("prefix", {"username_prefix": "user424"}, lambda meta: meta["username"].startswith("user424")),
+    ("domain", {"domain": "site7.example.com"}, lambda meta: "//site7.example.com" in (meta["url"] or "")),
+)
+
+
+def entry(index: int) -> dict:
+    return {
+        "title": f"Sealed {index}",
+        "username": f"user{index}@example.com",
+        "password": f"secret-{index}",
+        "url": f"https://site{index % 500}.example.com/login",
+    }
+
+
+async def decrypt_scan(user_id: str, matches) -> int:
+    from sqlalchemy import select
+    from app.database import db_manager
+    from app.models import Password, User
+    from app.utils.crypto import decrypt_batch
+    from app.utils.keyring import keyring
+
+    async with db_manager.async_session() as session:
+        crypto = await keyring.engine_for_user(await session.get(User, user_id), session)
+        rows = (await session.execute(
+            select(Password.id, Password.sealed_metadata).where(Password.user_id == user_id)
+        )).all()
+    plaintexts = await decrypt_batch([row.sealed_metadata for row in rows], crypto)
+    return sum(
+        1 for plaintext in plaintexts
+        if matches(dict(zip(("title", "username", "url"), json.loads(plaintext))))
+    )
+
+
+async def main():
+    os.environ["ENCRYPT_METADATA"] = "true"
+    os.environ.setdefault("BLIND_INDEX_KEY", b64encode(os.urandom(32)).decode())
+    configure(sys.argv[1] if len(sys.argv) > 1 else None)
+    from app.core.config import settings
+    from app.schemas.password import MAX_BULK_ITEMS
+
+    print(f"{'entries':>8} | {'lookup':>8} | {'hits':>5} | {'index ms':>9} | {'scan ms':>8} | {'speedup':>7}")
+    print("-" * 62)
+    async with api_client() as client:
+        for size in VAULT_SIZES:
+            user_id, token = await seed_vault(0)
+            headers = {"Authorization": f"Bearer {token}"}
+            for start in range(0, size, MAX_BULK_ITEMS):
+                items = [entry(index) for index in range(start, min(start + MAX_BULK_ITEMS, size))]
+                (await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)).raise_for_status()
+
+            for label, params, matches in LOOKUPS:
+                query = dict(params, limit=settings.PASSWORDS_MAX_PAGE_SIZE)
+
+                async def lookup():
+                    response = await client.get("/api/v1/passwords/summary", headers=headers, params=query)
+                    response.raise_for_status()
+                    return response
+
+                hits = len((await lookup()).json())
+                scanned = await decrypt_scan(user_id, matches)
+                if scanned != hits:
+                    raise SystemExit(f"{label}: blind index found {hits} entries, scan found {scanned}")
+                indexed = await best_of(lookup)
+                scan = await best_of(lambda: decrypt_scan(user_id, matches))
+                print(f"{size:>8} | {label:>8} | {hits:>5} | {indexed * 1e3:>9.1f} | "
+                      f"{scan * 1e3:>8.1f} | {scan / indexed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
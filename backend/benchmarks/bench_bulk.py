@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Vault import throughput: one POST /passwords per entry against
+POST /passwords/bulk in batches.
+
+Runs against a throwaway SQLite database by default. Pass a database URL to
+benchmark PostgreSQL instead, e.g.:
+    python -m benchmarks.bench_bulk postgresql+asyncpg://passman:pw@localhost/passman_bench
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks._support import api_client, configure, seed_vault
+
+ENTRIES = 5_000
+
+
+def entry(index: int) -> dict:
+    return {
+        "title": f"Imported {index}",
+        "username": f"user{index}@example.com",
+        "password": f"secret-{index}",
+        "url": f"https://site{index % 500}.example.com",
+        "tags": ["import"],
+    }
+
+
+async def main():
+    database_url = sys.argv[1] if len(sys.argv) > 1 else None
+    configure(database_url)
+    from app.schemas.password import MAX_BULK_ITEMS
+
+    print(f"database: {database_url or 'sqlite (temporary file)'}")
+    async with api_client() as client:
+        _, token = await seed_vault(0)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        started = time.perf_counter()
+        for index in range(ENTRIES):
+            response = await client.post("/api/v1/passwords", json=entry(index), headers=headers)
+            response.raise_for_status()
+        single = time.perf_counter() - started
+
+        _, token = await seed_vault(0)
+        headers = {"Authorization": f"Bearer {token}"}
+        started = time.perf_counter()
+        for start in range(0, ENTRIES, MAX_BULK_ITEMS):
+            items = [entry(index) for index in range(start, min(start + MAX_BULK_ITEMS, ENTRIES))]
+            response = await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)
+            response.raise_for_status()
+        bulk = time.perf_counter() - started
+
+    print(f"{'mode':>8} | {'total s':>8} | {'entries/s':>10}")
+    print("-" * 32)
+    print(f"{'single':>8} | {single:>8.2f} | {ENTRIES / single:>10.0f}")
+    print(f"{'bulk':>8} | {bulk:>8.2f} | {ENTRIES / bulk:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
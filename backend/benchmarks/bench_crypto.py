@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for vault decryption cost per entry.
+
+Compares the legacy per-call path (decode the key and build a new AESGCM
+for every entry, base64 ciphertext and IV) with the cached CryptoEngine
+decrypting raw sealed bytes.
+
+Run from the backend directory:
+    python -m benchmarks.bench_crypto
+"""
+
+import os
+import sys
+import time
+from base64 import b64decode, b64encode
+from pathlib import Path
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.crypto import CryptoEngine, generate_encryption_key  # noqa: E402
+
+VAULT_SIZES = (10, 1_000, 10_000)
+REPEATS = 5
+
+
+def legacy_encrypt(password: str, key: str) -> tuple[str, str]:
+    """Encrypt the way the routers did before the engine existed."""
+    iv = os.urandom(12)
+    ciphertext = AESGCM(b64decode(key)).encrypt(iv, password.encode(), None)
+    return b64encode(ciphertext).decode(), b64encode(iv).decode()
+
+
+def legacy_decrypt(encrypted_password: str, iv: str, key: str) -> str:
+    """Decrypt the way the routers did before the engine existed."""
+    cipher = AESGCM(b64decode(key))
+    return cipher.decrypt(b64decode(iv), b64decode(encrypted_password), None).decode()
+
+
+def random_secrets(size: int) -> list[str]:
+    return [b64encode(os.urandom(12)).decode() for _ in range(size)]
+
+
+def best_of(func, repeats: int = REPEATS) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    key = generate_encryption_key()
+    engine = CryptoEngine(key)
+
+    print(f"{'entries':>8} | {'legacy us/entry':>16} | {'engine us/entry':>16} | {'speedup':>7}")
+    print("-" * 58)
+    for size in VAULT_SIZES:
+        secrets = random_secrets(size)
+        legacy_vault = [legacy_encrypt(secret, key) for secret in secrets]
+        sealed_vault = engine.encrypt_many(secrets)
+        legacy = best_of(lambda: [legacy_decrypt(c, iv, key) for c, iv in legacy_vault])
+        cached = best_of(lambda: engine.decrypt_many(sealed_vault))
+        print(
+            f"{size:>8} | {legacy / size * 1e6:>16.2f} | "
+            f"{cached / size * 1e6:>16.2f} | {legacy / cached:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Per-request cost of resolving a user's data key: cold (unwrap with the
+master key and build the cipher) against warm (served from the DEK cache),
+both for the key lookup alone and for a full GET /passwords/{id}.
+
+Run from the backend directory:
+    python -m benchmarks.bench_keyring
+"""
+
+import asyncio
+import time
+
+from benchmarks._support import api_client, configure, seed_vault
+
+LOOKUPS = 20_000
+REQUESTS = 2_000
+
+
+def lookup_cost(keyring, user_id: str, wrapped_dek: bytes, cold: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(LOOKUPS):
+        if cold:
+            keyring.forget(user_id)
+        keyring.engine_for(user_id, 1, wrapped_dek)
+    return (time.perf_counter() - started) / LOOKUPS
+
+
+async def request_cost(client, keyring, path: str, token: str, user_id: str, cold: bool) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        if cold:
+            keyring.forget(user_id)
+        response = await client.get(path, headers=headers)
+        response.raise_for_status()
+    return (time.perf_counter() - started) / REQUESTS
+
+
+async def main():
+    configure()
+    from sqlalchemy import select
+    from app.database import db_manager
+    from app.models import Password, User
+    from app.utils.keyring import keyring
+
+    user_id, token = await seed_vault(1)
+    async with db_manager.async_session() as session:
+        wrapped_dek = await session.scalar(select(User.wrapped_dek).where(User.id == user_id))
+        entry_id = await session.scalar(select(Password.id).where(Password.user_id == user_id))
+
+    cold_lookup = lookup_cost(keyring, user_id, wrapped_dek, cold=True)
+    warm_lookup = lookup_cost(keyring, user_id, wrapped_dek, cold=False)
+
+    async with api_client() as client:
+        path = f"/api/v1/passwords/{entry_id}"
+        await request_cost(client, keyring, path, token, user_id, cold=False)
+        cold_request = await request_cost(client, keyring, path, token, user_id, cold=True)
+        warm_request = await request_cost(client, keyring, path, token, user_id, cold=False)
+
+    print(f"{'scenario':>14} | {'cold us':>9} | {'warm us':>9} | {'saved us':>9}")
+    print("-" * 50)
+    print(
+        f"{'key lookup':>14} | {cold_lookup * 1e6:>9.1f} | {warm_lookup * 1e6:>9.1f} | "
+        f"{(cold_lookup - warm_lookup) * 1e6:>9.1f}"
+    )
+    print(
+        f"{'GET entry':>14} | {cold_request * 1e6:>9.1f} | {warm_request * 1e6:>9.1f} | "
+        f"{(cold_request - warm_request) * 1e6:>9.1f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Vault listing latency: full GET /passwords against the metadata-only
+GET /passwords/summary, for vaults of 1k and 10k entries.
+
+Run from the backend directory:
+    python -m benchmarks.bench_list
+"""
+
+import asyncio
+
+from benchmarks._support import api_client, best_of, configure, fetch_all_pages, seed_vault
+
+VAULT_SIZES = (1_000, 10_000)
+
+
+async def main():
+    configure()
+    from app.core.config import settings
+
+    page = {"limit": settings.PASSWORDS_MAX_PAGE_SIZE}
+    print(f"{'entries':>8} | {'full ms':>9} | {'summary ms':>10} | {'speedup':>7}")
+    print("-" * 45)
+    async with api_client() as client:
+        for size in VAULT_SIZES:
+            _, token = await seed_vault(size)
+            full = await best_of(lambda: fetch_all_pages(client, "/api/v1/passwords", token, **page))
+            summary = await best_of(lambda: fetch_all_pages(client, "/api/v1/passwords/summary", token, **page))
+            print(f"{size:>8} | {full * 1e3:>9.1f} | {summary * 1e3:>10.1f} | {full / summary:>6.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Request logging overhead per request, without the database: a bare app
+against the previous log_requests middleware (BaseHTTPMiddleware, f-string
+dicts, console and RotatingFileHandler written on the event loop) and
+RequestLogMiddleware behind the QueueHandler/QueueListener pipeline, text
+and JSON, logging every request and a 10% sample.
+
+Console output goes to a temporary file in every variant so the terminal
+does not skew the numbers. Run from the backend directory:
+    python -m benchmarks.bench_logging
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from benchmarks._support import configure
+
+REQUESTS = 5_000
+REPEATS = 3
+
+
+def make_app():
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return PlainTextResponse("pong")
+
+    return app
+
+
+def legacy_app(workdir):
+    """The app with the log_requests middleware as it was before the queue pipeline."""
+    from fastapi import Request
+
+    legacy_logger = logging.getLogger("bench.legacy")
+    legacy_logger.propagate = False
+    legacy_logger.setLevel(logging.INFO)
+    console = logging.StreamHandler(open(workdir / "legacy-console.log", "w"))
+    console.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    log_file = RotatingFileHandler(workdir / "legacy.log", maxBytes=10485760, backupCount=5, encoding="utf-8")
+    log_file.setFormatter(logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
+    ))
+    legacy_logger.addHandler(console)
+    legacy_logger.addHandler(log_file)
+
+    app = make_app()
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = datetime.utcnow()
+        try:
+            response = await call_next(request)
+        except Exception as e:
+            legacy_logger.error(f"Unhandled exception for {request.method} {request.url}: {e}")
+            raise
+        end_time = datetime.utcnow()
+        duration = (end_time - start_time).total_seconds() * 1000
+        log_data = {
+            "method": request.method,
+            "path": str(request.url.path),
+            "query": str(request.url.query) if request.url.query else None,
+            "status_code": response.status_code,
+            "duration_ms": round(duration, 2),
+            "client_host": request.client.host if request.client else None,
+            "user_agent": request.headers.get("user-agent"),
+        }
+        if response.status_code >= 500:
+            legacy_logger.error(f"Server error: {log_data}")
+        elif response.status_code >= 400:
+            legacy_logger.warning(f"Client error: {log_data}")
+        else:
+            legacy_logger.info(f"Request: {request.method} {request.url.path} - {response.status_code} - {duration:.2f}ms")
+        return response
+
+    return app
+
+
+def queued_app(workdir, log_format: str, sample_rate: float):
+    """The app with RequestLogMiddleware, logging through a fresh queue pipeline."""
+    from app.core import logs
+    from app.core.config import settings
+
+    settings.LOG_FORMAT = log_format
+    settings.LOG_FILE = str(workdir / f"queued-{log_format}.log")
+    stdout = sys.stdout
+    sys.stdout = open(workdir / f"queued-{log_format}-console.log", "w")
+    try:
+        logs.setup_logging()
+    finally:
+        sys.stdout = stdout
+
+    app = make_app()
+    app.add_middleware(logs.RequestLogMiddleware, sample_rate=sample_rate)
+    return app
+
+
+async def per_request(app) -> float:
+    """Best mean seconds per GET /ping over REPEATS runs of REQUESTS requests."""
+    from httpx import ASGITransport, AsyncClient
+
+    best = float("inf")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            for _ in range(REQUESTS):
+                (await client.get("/ping", params={"q": "x"})).raise_for_status()
+            best = min(best, (time.perf_counter() - started) / REQUESTS)
+    return best
+
+
+async def main():
+    os.environ.setdefault("LOG_LEVEL", "INFO")
+    workdir = configure()
+    from app.core import logs
+
+    bare = await per_request(make_app())
+    variants = [("legacy log_requests", await per_request(legacy_app(workdir)))]
+    for log_format in ("text", "json"):
+        for sample_rate in (1.0, 0.1):
+            app = queued_app(workdir, log_format, sample_rate)
+            variants.append((f"queue {log_format}, sample {sample_rate:g}", await per_request(app)))
+    logs.stop_logging()
+
+    print(f"{REQUESTS} requests x best of {REPEATS}, bare app: {bare * 1e6:.1f} us/request")
+    print(f"{'middleware':>24} | {'us/request':>10} | {'overhead us':>11}")
+    print("-" * 52)
+    for label, seconds in variants:
+        print(f"{label:>24} | {seconds * 1e6:>10.1f} | {(seconds - bare) * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
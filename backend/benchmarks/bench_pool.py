@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Connection pool behaviour under exhaustion: many concurrent GET /passwords
+requests against a deliberately small pool, first with a patient pool
+timeout (requests queue for a connection) and then with a short one
+(requests fail fast with 503 and Retry-After).
+
+Runs against a throwaway SQLite database by default, where the pool is
+always a single connection. Pass a database URL to exercise a PostgreSQL
+pool of DB_POOL_SIZE connections instead, e.g.:
+    python -m benchmarks.bench_pool postgresql+asyncpg://passman:pw@localhost/passman_bench
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+from benchmarks._support import api_client, configure, seed_vault
+
+CONCURRENCY = 64
+ROUNDS = 5
+ENTRIES = 1_000
+POOL_TIMEOUTS = (30.0, 0.05)
+
+
+async def request(client, token: str) -> tuple[int, float]:
+    started = time.perf_counter()
+    response = await client.get(
+        "/api/v1/passwords",
+        params={"limit": 100},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    return response.status_code, time.perf_counter() - started
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def main():
+    database_url = sys.argv[1] if len(sys.argv) > 1 else None
+    os.environ.setdefault("DB_POOL_SIZE", "4")
+    os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+    configure(database_url)
+    from app.core.config import settings
+    from app.database import POOL_TIMEOUTS as TIMEOUTS_TOTAL, POOL_WAIT, db_manager
+
+    _, token = await seed_vault(ENTRIES)
+    print(f"database: {database_url or 'sqlite (temporary file)'}")
+    print(f"pool: size={settings.DB_POOL_SIZE} overflow={settings.DB_MAX_OVERFLOW}, "
+          f"{CONCURRENCY} concurrent requests x {ROUNDS} rounds")
+    print(f"{'timeout s':>9} | {'ok':>5} | {'503':>5} | {'p50 ms':>7} | {'p99 ms':>7} | "
+          f"{'mean wait ms':>12} | {'timeouts':>8}")
+    print("-" * 72)
+
+    async with api_client() as client:
+        for pool_timeout in POOL_TIMEOUTS:
+            settings.DB_POOL_TIMEOUT_SECONDS = pool_timeout
+            await db_manager.close()
+            db_manager._initialized = False
+            db_manager.initialize()
+
+            waits, wait_total, timeouts = POOL_WAIT.count(), POOL_WAIT.sum(), TIMEOUTS_TOTAL.value()
+            statuses = Counter()
+            latencies = []
+            for _ in range(ROUNDS):
+                for status_code, latency in await asyncio.gather(
+                    *(request(client, token) for _ in range(CONCURRENCY))
+                ):
+                    statuses[status_code] += 1
+                    latencies.append(latency)
+
+            mean_wait = (POOL_WAIT.sum() - wait_total) / max(POOL_WAIT.count() - waits, 1)
+            print(
+                f"{pool_timeout:>9} | {statuses[200]:>5} | {statuses[503]:>5} | "
+                f"{percentile(latencies, 0.5) * 1e3:>7.1f} | {percentile(latencies, 0.99) * 1e3:>7.1f} | "
+                f"{mean_wait * 1e3:>12.2f} | {TIMEOUTS_TOTAL.value() - timeouts:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Full-entity loading (select(Password), one ORM instance per row in the
+session's identity map) against the column-projected row tuples of
+app.utils.vault_queries, for vaults of 10k and 50k entries with 2 KiB notes.
+
+Both sides read the whole vault in one query: entities with every column,
+and rows with the summary columns (no notes, no ciphertext) or every
+listing field. Memory is the tracemalloc peak while the result is held.
+
+Run from the backend directory:
+    python -m benchmarks.bench_projection [postgresql+asyncpg://...]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from benchmarks._support import configure, seed_vault
+
+VAULT_SIZES = (10_000, 50_000)
+NOTES_SIZE = 2048
+REPEATS = 3
+
+
+async def entities(session, user_id: str) -> list:
+    from sqlalchemy import select
+    from app.models import Password
+
+    result = await session.execute(
+        select(Password).where(Password.user_id == user_id).order_by(Password.created_at, Password.id)
+    )
+    return result.scalars().all()
+
+
+async def projected(session, user_id: str, fields) -> list:
+    from app.utils.vault_queries import vault_page
+
+    result = await session.execute(vault_page(user_id, fields, sys.maxsize - 1))
+    return result.all()
+
+
+async def measure(load) -> tuple[float, float]:
+    """Best time in seconds and peak traced MiB of load(session) in a fresh session."""
+    from app.database import db_manager
+
+    timings = []
+    for _ in range(REPEATS):
+        async with db_manager.async_session() as session:
+            started = time.perf_counter()
+            await load(session)
+            timings.append(time.perf_counter() - started)
+
+    async with db_manager.async_session() as session:
+        tracemalloc.start()
+        rows = await load(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del rows
+    return min(timings), peak / 2**20
+
+
+async def main():
+    configure(sys.argv[1] if len(sys.argv) > 1 else None)
+    from sqlalchemy import update
+    from app.database import db_manager
+    from app.models import Password
+    from app.schemas.password import PASSWORD_FIELDS, SUMMARY_FIELDS
+
+    print(f"{'entries':>8} | {'query':>9} | {'ms':>8} | {'peak MiB':>9}")
+    print("-" * 44)
+    for size in VAULT_SIZES:
+        user_id, _ = await seed_vault(size)
+        async with db_manager.async_session() as session:
+            await session.execute(
+                update(Password).where(Password.user_id == user_id).values(notes="n" * NOTES_SIZE)
+            )
+            await session.commit()
+
+        loads = (
+            ("entities", lambda session: entities(session, user_id)),
+            ("all cols", lambda session: projected(session, user_id, PASSWORD_FIELDS)),
+            ("summary", lambda session: projected(session, user_id, SUMMARY_FIELDS)),
+        )
+        for label, load in loads:
+            elapsed, peak = await measure(load)
+            print(f"{size:>8} | {label:>9} | {elapsed * 1e3:>8.1f} | {peak:>9.1f}")
+
+    await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Read-replica routing walkthrough: GET traffic spread over healthy replicas,
+read-your-writes stickiness after a write, and fallback to the primary when
+a replica fails its health check.
+
+By default the primary is a throwaway SQLite file and the replica is a copy
+taken after seeding, so it visibly lags behind later writes; a second
+replica points at a path that cannot be opened. To use real streaming
+replication pass a primary URL followed by replica URLs, e.g.:
+    python -m benchmarks.bench_replicas postgresql+asyncpg://.../passman postgresql+asyncpg://replica/passman
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import time
+
+from benchmarks._support import api_client, configure, seed_vault
+
+ENTRIES = 200
+READS = 500
+
+
+def routed(counter) -> str:
+    return f"replica={counter.value(target='replica'):.0f} primary={counter.value(target='primary'):.0f}"
+
+
+async def main():
+    urls = sys.argv[1:]
+    os.environ.setdefault("READ_YOUR_WRITES_SECONDS", "1")
+    if urls:
+        os.environ["DATABASE_REPLICA_URLS"] = ",".join(urls[1:])
+        workdir = configure(urls[0])
+    else:
+        workdir = configure()
+        os.environ["DATABASE_REPLICA_URLS"] = (
+            f"sqlite+aiosqlite:///{workdir / 'replica.db'},"
+            f"sqlite+aiosqlite:///{workdir / 'missing' / 'replica.db'}"
+        )
+    from app.core.config import settings
+    from app.database import ROUTED_READS, db_manager
+
+    _, token = await seed_vault(ENTRIES)
+    if not urls:
+        # Snapshot the primary as the replica; later writes will not reach it
+        await db_manager.close()
+        shutil.copy(workdir / "bench.db", workdir / "replica.db")
+        db_manager._initialized = False
+        db_manager.initialize()
+
+    await db_manager.check_replicas()
+    print("replicas: " + ", ".join(
+        f"{replica.engine.url!r} {'healthy' if replica.healthy else 'UNHEALTHY'}"
+        for replica in db_manager.replicas
+    ))
+
+    headers = {"Authorization": f"Bearer {token}"}
+    listing = {"limit": settings.PASSWORDS_MAX_PAGE_SIZE}
+    async with api_client() as client:
+        started = time.perf_counter()
+        for _ in range(READS):
+            (await client.get("/api/v1/passwords", headers=headers, params={"limit": 20})).raise_for_status()
+        elapsed = time.perf_counter() - started
+        print(f"{READS} listings in {elapsed:.2f} s -> {routed(ROUTED_READS)}")
+
+        (await client.post("/api/v1/passwords", headers=headers, json={
+            "title": "Fresh", "username": "fresh@example.com", "password": "secret",
+        })).raise_for_status()
+        seen = len((await client.get("/api/v1/passwords", headers=headers, params=listing)).json())
+        print(f"right after a write: {seen} entries visible (read-your-writes) -> {routed(ROUTED_READS)}")
+
+        await asyncio.sleep(settings.READ_YOUR_WRITES_SECONDS + 0.1)
+        seen = len((await client.get("/api/v1/passwords", headers=headers, params=listing)).json())
+        print(f"after the stickiness window: {seen} entries visible -> {routed(ROUTED_READS)}")
+
+    await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Database round trips per request for the common vault operations: SQL
+statements plus BEGIN/COMMIT/ROLLBACK, counted with engine events.
+
+Run from the backend directory:
+    python -m benchmarks.bench_roundtrips
+"""
+
+import asyncio
+from collections import Counter
+
+from sqlalchemy import event
+
+from benchmarks._support import api_client, configure, seed_vault
+
+
+def count_round_trips(engine, counts: Counter) -> None:
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", lambda *_: counts.update(["statements"]))
+    event.listen(sync_engine, "begin", lambda *_: counts.update(["begin"]))
+    event.listen(sync_engine, "commit", lambda *_: counts.update(["commit"]))
+    event.listen(sync_engine, "rollback", lambda *_: counts.update(["rollback"]))
+
+
+async def main():
+    configure()
+    from app.database import db_manager
+
+    _, token = await seed_vault(100)
+    headers = {"Authorization": f"Bearer {token}"}
+    counts = Counter()
+    for engine in (db_manager.engine, db_manager.read_engine):
+        if engine is not None:
+            count_round_trips(engine, counts)
+
+    async with api_client() as client:
+        # Warm the principal, token and data key caches so only the handler's work is counted
+        await client.get("/api/v1/passwords", headers=headers, params={"limit": 1})
+        created = (await client.post(
+            "/api/v1/passwords", headers=headers,
+            json={"title": "Round trips", "username": "rt@example.com", "password": "secret"},
+        )).json()
+        scenarios = [
+            ("GET /passwords", "GET", "/api/v1/passwords", {"params": {"limit": 50}}),
+            ("GET /passwords/{id}", "GET", f"/api/v1/passwords/{created['id']}", {}),
+            ("POST /passwords", "POST", "/api/v1/passwords", {"json": {
+                "title": "Another", "username": "rt@example.com", "password": "secret",
+            }}),
+            ("PUT /passwords/{id}", "PUT", f"/api/v1/passwords/{created['id']}", {"json": {"title": "Renamed"}}),
+            ("GET /users/me", "GET", "/api/v1/users/me", {}),
+            ("PUT /users/me", "PUT", "/api/v1/users/me", {"json": {"email": "rt-user@example.com"}}),
+            ("DELETE /passwords/{id}", "DELETE", f"/api/v1/passwords/{created['id']}", {}),
+        ]
+
+        print(f"{'request':>24} | {'status':>6} | {'stmts':>5} | {'begin':>5} | {'commit':>6} | {'rollback':>8}")
+        print("-" * 70)
+        for label, method, path, kwargs in scenarios:
+            counts.clear()
+            response = await client.request(method, path, headers=headers, **kwargs)
+            print(
+                f"{label:>24} | {response.status_code:>6} | {counts['statements']:>5} | "
+                f"{counts['begin']:>5} | {counts['commit']:>6} | {counts['rollback']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+GET /passwords/search latency in a 100k-entry vault, for substring, prefix,
+host, tag and short (unindexed) terms, against the client-side alternative
+of paging through GET /passwords/summary and filtering locally.
+
+Runs against a throwaway SQLite file (FTS5 trigram) by default; pass a
+PostgreSQL URL to measure the pg_trgm index instead, e.g.:
+    python -m benchmarks.bench_search postgresql+asyncpg://passman:pw@localhost/passman_bench
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks._support import api_client, configure, fetch_all_pages, seed_vault
+
+ENTRIES = 100_000
+REPEATS = 50
+PAGE_SIZE = 50
+TERMS = (
+    ("substring", "ry 4242"),
+    ("prefix", "entry 9999"),
+    ("username", "user1234@"),
+    ("host", "site42.example"),
+    ("tag", "group-7"),
+    ("short", "y9"),
+    ("no match", "zzzz"),
+)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def main():
+    configure(sys.argv[1] if len(sys.argv) > 1 else None)
+    from app.database import db_manager
+
+    _, token = await seed_vault(ENTRIES)
+    headers = {"Authorization": f"Bearer {token}"}
+    print(f"{ENTRIES} entries, first page of {PAGE_SIZE}, {REPEATS} requests per term")
+    print(f"{'term':>10} | {'query':>15} | {'hits':>5} | {'p50 ms':>7} | {'p99 ms':>7}")
+    print("-" * 56)
+    async with api_client() as client:
+        for label, term in TERMS:
+            latencies = []
+            for _ in range(REPEATS):
+                started = time.perf_counter()
+                response = await client.get(
+                    "/api/v1/passwords/search", headers=headers, params={"q": term, "limit": PAGE_SIZE}
+                )
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+            hits = len(response.json())
+            print(f"{label:>10} | {term!r:>15} | {hits:>5} | "
+                  f"{percentile(latencies, 0.5) * 1e3:>7.1f} | {percentile(latencies, 0.99) * 1e3:>7.1f}")
+
+        started = time.perf_counter()
+        await fetch_all_pages(client, "/api/v1/passwords/summary", token, limit=500)
+        elapsed = time.perf_counter() - started
+        print(f"client-side filtering needs the whole vault first: {elapsed * 1e3:.0f} ms")
+
+    await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Listing serialization cost for 1k and 10k entries, without the database:
+the previous path (PasswordResponse.model_validate per row, then FastAPI
+validating and serializing the list against response_model before
+json.dumps) against rows_to_dicts + one-pass encoding, with orjson when it
+is installed and with the standard library encoder.
+
+Allocations are measured with tracemalloc: blocks and KiB still allocated
+when the body is ready (every intermediate kept alive by the pipeline) and
+the peak traced memory while producing it.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialize
+"""
+
+import datetime as dt
+import json
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import List
+from uuid import uuid4
+
+from benchmarks._support import configure
+
+VAULT_SIZES = (1_000, 10_000)
+REPEATS = 5
+
+
+def make_rows(count: int, fields: tuple) -> list[tuple]:
+    """Row tuples with the values in `fields` order, as vault_entries yields them."""
+    created = dt.datetime(2024, 1, 1, 12, 0, 0, 123456)
+    rows = []
+    for index in range(count):
+        values = {
+            "id": str(uuid4()),
+            "title": f"Entry {index}",
+            "username": f"user{index}@example.com",
+            "password": f"secret-{index}",
+            "url": f"https://site{index % 500}.example.com/login",
+            "notes": "benchmark entry",
+            "tags": ["bench", f"group-{index % 20}"],
+            "created_at": created + dt.timedelta(seconds=index),
+            "updated_at": created + dt.timedelta(seconds=index),
+        }
+        rows.append(tuple(values[field] for field in fields))
+    return rows
+
+
+def legacy_pipeline(rows, fields, response_adapter):
+    from app.schemas.password import PasswordResponse
+
+    entities = [SimpleNamespace(**dict(zip(fields, row))) for row in rows]
+    models = []
+    for entity in entities:
+        model = PasswordResponse.model_validate(entity)
+        model.password = entity.password
+        models.append(model)
+    validated = response_adapter.validate_python(models, from_attributes=True)
+    jsonable = response_adapter.dump_python(validated, mode="json", exclude_unset=True)
+    body = json.dumps(jsonable, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    return entities, models, validated, jsonable, body
+
+
+def fast_pipeline(rows, fields):
+    from app.utils.serialization import dumps, rows_to_dicts
+
+    items = rows_to_dicts(rows, fields)
+    return items, dumps(items)
+
+
+def measure(pipeline) -> tuple[float, int, float, float, bytes]:
+    """Best time in seconds, live blocks, live KiB, peak KiB and the encoded body."""
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        pipeline()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = pipeline()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in diff)
+    size = sum(stat.size_diff for stat in diff)
+    return min(timings), blocks, size / 1024, peak / 1024, result[-1]
+
+
+def main():
+    configure()
+    from pydantic import TypeAdapter
+
+    from app.schemas.password import PASSWORD_FIELDS, PasswordProjection
+    from app.utils import serialization
+
+    response_adapter = TypeAdapter(List[PasswordProjection])
+    encoder = "orjson" if serialization.orjson is not None else "json (orjson not installed)"
+    print(f"fast path encoder: {encoder}")
+    print(f"{'entries':>8} | {'path':>8} | {'ms':>8} | {'blocks':>8} | {'live KiB':>9} | {'peak KiB':>9}")
+    print("-" * 66)
+    for size in VAULT_SIZES:
+        rows = make_rows(size, PASSWORD_FIELDS)
+        expected = None
+        paths = [
+            ("legacy", lambda: legacy_pipeline(rows, PASSWORD_FIELDS, response_adapter)),
+            ("fast", lambda: fast_pipeline(rows, PASSWORD_FIELDS)),
+        ]
+        if serialization.orjson is not None:
+            paths.append(("stdlib", lambda: fast_pipeline(rows, PASSWORD_FIELDS)))
+        for label, pipeline in paths:
+            fast_encoder = serialization.orjson
+            if label == "stdlib":
+                serialization.orjson = None
+            try:
+                elapsed, blocks, live, peak, body = measure(pipeline)
+            finally:
+                serialization.orjson = fast_encoder
+            if expected is None:
+                expected = json.loads(body)
+            elif json.loads(body) != expected:
+                raise SystemExit(f"{label} output differs from the legacy response")
+            print(f"{size:>8} | {label:>8} | {elapsed * 1e3:>8.1f} | {blocks:>8} | {live:>9.0f} | {peak:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write throughput on SQLite: concurrent clients issuing 80%
+GET /passwords and 20% POST /passwords, with the legacy single-connection
+setup (rollback journal, one pooled connection) against WAL mode with a
+read pool and a single writer connection. In WAL mode the GETs read from
+the pool while a POST holds the writer only for its own transaction; in
+legacy mode every request queues for the one connection. The clients
+share one process, so throughput is capped by the event loop's CPU and
+the gap widens with the share of request time spent in SQLite.
+
+Run from the backend directory:
+    python -m benchmarks.bench_sqlite
+"""
+
+import asyncio
+import random
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks._support import api_client, configure, seed_vault
+
+CLIENTS = 32
+OPERATIONS_PER_CLIENT = 100
+WRITE_RATIO = 0.2
+ENTRIES = 2_000
+
+
+async def client_loop(client, token: str, seed: int, statuses: Counter) -> None:
+    rng = random.Random(seed)
+    headers = {"Authorization": f"Bearer {token}"}
+    for index in range(OPERATIONS_PER_CLIENT):
+        if rng.random() < WRITE_RATIO:
+            response = await client.post("/api/v1/passwords", headers=headers, json={
+                "title": f"Mixed {seed}-{index}",
+                "username": "mixed@example.com",
+                "password": f"secret-{seed}-{index}",
+            })
+        else:
+            response = await client.get("/api/v1/passwords", headers=headers, params={"limit": 50})
+        statuses[response.status_code] += 1
+
+
+async def run(wal: bool) -> tuple[float, Counter]:
+    from app.core.config import settings
+    from app.database import db_manager
+
+    await db_manager.close()
+    db_manager._initialized = False
+    settings.SQLITE_WAL = wal
+    settings.DATABASE_URL = f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp(prefix='passman-bench-')) / 'bench.db'}"
+    _, token = await seed_vault(ENTRIES)
+
+    statuses = Counter()
+    async with api_client() as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, token, seed, statuses) for seed in range(CLIENTS)))
+        elapsed = time.perf_counter() - started
+    return elapsed, statuses
+
+
+async def main():
+    configure()
+    operations = CLIENTS * OPERATIONS_PER_CLIENT
+    print(f"{CLIENTS} clients x {OPERATIONS_PER_CLIENT} operations, {WRITE_RATIO:.0%} writes")
+    print(f"{'mode':>8} | {'total s':>8} | {'ops/s':>8} | {'errors':>6}")
+    print("-" * 40)
+    for label, wal in (("legacy", False), ("wal", True)):
+        elapsed, statuses = await run(wal)
+        errors = operations - statuses[200]
+        print(f"{label:>8} | {elapsed:>8.2f} | {operations / elapsed:>8.0f} | {errors:>6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
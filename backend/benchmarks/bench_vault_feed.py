@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+/ws/vault under load: one uvicorn worker holding 10k idle change-feed
+connections. Reports the worker's memory per connection, REST latency with
+and without the idle connections, and how long a write takes to reach every
+open connection of its user.
+
+Starts the worker as a subprocess on a local port against a throwaway
+SQLite database; pass a database URL to use PostgreSQL instead, e.g.:
+    python -m benchmarks.bench_vault_feed postgresql+asyncpg://passman:pw@localhost/passman_bench
+Needs the `websockets` client (installed with uvicorn[standard]) and enough
+file descriptors for two sockets per connection; the soft limit is raised
+to the hard limit if possible.
+"""
+
+import asyncio
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks._support import BACKEND_DIR, configure, seed_vault
+
+CONNECTIONS = 10_000
+USERS = 100
+CONNECT_CONCURRENCY = 200
+REQUESTS = 200
+WRITES = 20
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def rest_latency(client, token: str) -> tuple[float, float]:
+    timings = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = await client.get(
+            "/api/v1/passwords/summary", params={"limit": 20},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        response.raise_for_status()
+        timings.append(time.perf_counter() - started)
+    return percentile(timings, 0.5) * 1e3, percentile(timings, 0.99) * 1e3
+
+
+async def wait_ready(client, server: subprocess.Popen) -> None:
+    for _ in range(200):
+        if server.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.05)
+    raise SystemExit("uvicorn did not start")
+
+
+async def main():
+    import httpx
+    import websockets
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    if hard < 2 * CONNECTIONS + 1000:
+        print(f"warning: RLIMIT_NOFILE is {hard}, connections may fail")
+
+    configure(sys.argv[1] if len(sys.argv) > 1 else None)
+    tokens = [(await seed_vault(10))[1] for _ in range(USERS)]
+
+    port = free_port()
+    # Default 20 s keepalive pings: --ws-ping-interval 0 does not disable
+    # them but pings every connection back to back
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--ws", "websockets", "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    sockets = []
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            await wait_ready(client, server)
+            idle_rss = rss_mb(server.pid)
+            idle_p50, idle_p99 = await rest_latency(client, tokens[0])
+
+            gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+            async def connect(index: int):
+                async with gate:
+                    return await websockets.connect(
+                        f"ws://127.0.0.1:{port}/api/v1/ws/vault",
+                        subprotocols=["passman.bearer", tokens[index % USERS]],
+                        ping_interval=None,
+                    )
+
+            started = time.perf_counter()
+            sockets = await asyncio.gather(*(connect(index) for index in range(CONNECTIONS)))
+            connect_seconds = time.perf_counter() - started
+            await asyncio.sleep(1)
+            loaded_rss = rss_mb(server.pid)
+            loaded_p50, loaded_p99 = await rest_latency(client, tokens[0])
+
+            # Every write fans out to the CONNECTIONS / USERS sockets of its user
+            own = sockets[::USERS]
+            deliveries = []
+            for index in range(WRITES):
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/passwords",
+                    json={"title": f"Feed {index}", "username": "feed", "password": "secret"},
+                    headers={"Authorization": f"Bearer {tokens[0]}"},
+                )
+                response.raise_for_status()
+                await asyncio.gather(*(ws.recv() for ws in own))
+                deliveries.append(time.perf_counter() - started)
+
+        print(f"worker: 1 uvicorn process, {CONNECTIONS} connections over {USERS} users "
+              f"(opened in {connect_seconds:.1f}s)")
+        print(f"{'':>24} | {'RSS MB':>8} | {'p50 ms':>7} | {'p99 ms':>7}")
+        print("-" * 56)
+        print(f"{'no feed connections':>24} | {idle_rss:>8.1f} | {idle_p50:>7.2f} | {idle_p99:>7.2f}")
+        print(f"{f'{CONNECTIONS} idle connections':>24} | {loaded_rss:>8.1f} | {loaded_p50:>7.2f} | {loaded_p99:>7.2f}")
+        print(f"memory per connection: {(loaded_rss - idle_rss) * 1024 / CONNECTIONS:.1f} KB")
+        print(f"write to {len(own)} connections of one user, POST to last delivery: "
+              f"p50 {percentile(deliveries, 0.5) * 1e3:.2f} ms, p99 {percentile(deliveries, 0.99) * 1e3:.2f} ms")
+    finally:
+        await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Key rotation tasks, safe to run while the API is serving.
+
+Master key rotation: move the old value into PREVIOUS_ENCRYPTION_KEYS, set
+the new ENCRYPTION_KEY, deploy, then run both
+    python rotate_keys.py rewrap
+    python rotate_keys.py reencrypt
+rewrap re-wraps one data key per user; reencrypt moves entries still sealed
+directly with a master key onto their owner's data key. Once both report
+completion the old key can be removed from PREVIOUS_ENCRYPTION_KEYS.
+
+Data key rotation: give users a new data key generation and re-encrypt
+their entries in the background:
+    python rotate_keys.py rotate-deks [--user USER_ID ...]
+    python rotate_keys.py reencrypt
+
+reencrypt commits a checkpoint with every batch; if it is interrupted, run
+it again to resume, or pass --restart to begin a new pass.
+
+Every command invalidates cached users on the API workers through
+PUBSUB_URL and refuses to run without it, since an in-process broker never
+reaches them. Pass --without-broker to run anyway, e.g. while the API is
+down; workers then pick up the new keys only as their caches expire.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.core.config import settings  # noqa: E402
+from app.database import close_db, db_manager  # noqa: E402
+from app.utils.keyring import keyring  # noqa: E402
+from app.utils.reencryption import ReencryptionJob  # noqa: E402
+
+
+async def rewrap(args):
+    rewrapped = await keyring.rewrap_all()
+    print(f"Re-wrapped data keys of {rewrapped} users under the current master key")
+
+
+async def rotate_deks(args):
+    rotated = await keyring.rotate_data_keys(args.user)
+    print(f"Rotated data keys of {rotated} users; run 'reencrypt' to move their entries")
+
+
+async def reencrypt(args):
+    job = ReencryptionJob()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, job.stop)
+    reencrypted = await job.run(restart=args.restart)
+    print(f"Re-encrypted {reencrypted} entries")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="PassMan key rotation")
+    parser.add_argument(
+        "--without-broker", action="store_true",
+        help="Run without PUBSUB_URL; API workers keep stale keys until their user cache expires"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rewrap", help="Re-wrap data keys under the current master key").set_defaults(
+        handler=rewrap
+    )
+    rotate = commands.add_parser("rotate-deks", help="Start a new data key generation")
+    rotate.add_argument("--user", action="append", help="Only rotate this user (repeatable)")
+    rotate.set_defaults(handler=rotate_deks)
+    job = commands.add_parser("reencrypt", help="Re-seal entries under their owner's current data key")
+    job.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    job.set_defaults(handler=reencrypt)
+    args = parser.parse_args()
+    if not settings.PUBSUB_URL and not args.without_broker:
+        parser.error(
+            "PUBSUB_URL is not set, so cache invalidations would not reach the API workers; "
+            "set it to the deployment's broker or pass --without-broker"
+        )
+
+    db_manager.initialize()
+    try:
+        await args.handler(args)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Test configuration. The settings are read when app modules are imported,
+so the environment is pointed at a throwaway database before any import.
+"""
+import os
+import tempfile
+from base64 import b64encode
+from pathlib import Path
+from uuid import uuid4
+
+WORKDIR = Path(tempfile.mkdtemp(prefix="passman-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{WORKDIR / 'test.db'}"
+os.environ["ENCRYPTION_KEY"] = b64encode(os.urandom(32)).decode()
+os.environ["LOG_FILE"] = str(WORKDIR / "test.log")
+os.environ["LOG_LEVEL"] = "WARNING"
+os.environ["HASHING_EXECUTOR"] = "thread"
+os.environ["DB_POOL_TIMEOUT_SECONDS"] = "5"
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ.pop("PUBSUB_URL", None)
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+
+@pytest.fixture(scope="session")
+async def app():
+    from app.database import init_db
+    from app.main import app
+
+    await init_db()
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def create_user() -> tuple[str, dict]:
+    """A user with a data key, created directly; returns (user_id, auth headers)."""
+    from app.database import db_manager
+    from app.models import User
+    from app.routers.auth import create_access_token
+    from app.utils.keyring import keyring
+
+    user_id = str(uuid4())
+    async with db_manager.async_session() as session:
+        session.add(User(
+            id=user_id,
+            username=f"user-{user_id[:8]}",
+            email=f"user-{user_id[:8]}@example.com",
+            hashed_password="not-a-real-hash",
+            wrapped_dek=keyring.new_wrapped_key(user_id),
+        ))
+        await session.commit()
+    return user_id, {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+
+
+@pytest.fixture
+async def user(app) -> tuple[str, dict]:
+    return await create_user()
+
+
+@pytest.fixture
+def headers(user) -> dict:
+    return user[1]
+
+
+@pytest.fixture
+def single_connection(app, monkeypatch):
+    """
+    Sessions without the WAL read engine, as with SQLITE_WAL=false: every
+    session of the request shares the one writer connection, so opening a
+    second one waits for the pool timeout and fails with 503.
+    """
+    from app.database import db_manager
+
+    monkeypatch.setattr(db_manager, "read_engine", None)
+
+
+def entry(index: int, **overrides) -> dict:
+    return {
+        "title": f"Entry {index}",
+        "username": f"user{index}@example.com",
+        "password": f"secret-{index}",
+        "url": f"https://site{index}.example.com/login",
+        "tags": ["test", f"group-{index % 3}"],
+        **overrides,
+    }
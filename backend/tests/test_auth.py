@@ -0,0 +1,75 @@
+import asyncio
+from uuid import uuid4
+
+from app.utils.hashing import HashingBusyError, PasswordHasher, hasher
+
+
+async def register(client, password: str = "correct horse battery") -> dict:
+    name = f"user-{uuid4().hex[:8]}"
+    response = await client.post("/api/v1/auth/register", json={
+        "username": name, "email": f"{name}@example.com", "password": password
+    })
+    assert response.status_code == 200, response.text
+    return {"username": name, "password": password}
+
+
+async def test_register_login_and_reject_wrong_password(client):
+    credentials = await register(client)
+    response = await client.post("/api/v1/auth/login", data=credentials)
+    assert response.status_code == 200
+    token = response.json()["access_token"]
+    me = await client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.json()["username"] == credentials["username"]
+
+    response = await client.post("/api/v1/auth/login", data={**credentials, "password": "wrong password"})
+    assert response.status_code == 401
+
+
+async def test_concurrent_logins_are_hashed_off_the_event_loop(client):
+    credentials = await register(client)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    assert (await client.post("/api/v1/auth/login", data=credentials)).status_code == 200
+    one_login = loop.time() - started
+    gaps = []
+
+    async def ticker():
+        last = loop.time()
+        while True:
+            await asyncio.sleep(0.001)
+            gaps.append(loop.time() - last)
+            last = loop.time()
+
+    task = asyncio.create_task(ticker())
+    try:
+        responses = await asyncio.gather(*(
+            client.post("/api/v1/auth/login", data=credentials) for _ in range(4)
+        ))
+    finally:
+        task.cancel()
+    assert {response.status_code for response in responses} <= {200, 503}
+    assert any(response.status_code == 200 for response in responses)
+    # The loop kept running while Argon2 worked in the executor
+    assert max(gaps) < one_login / 2
+
+
+async def test_hashing_queue_is_bounded():
+    bounded = PasswordHasher("thread", concurrency=1, queue_depth=1, retry_after=2)
+    hashed = await bounded.hash("secret")
+    try:
+        results = await asyncio.gather(
+            *(bounded.verify("secret", hashed) for _ in range(3)), return_exceptions=True
+        )
+    finally:
+        bounded.shutdown()
+    # One running, one waiting for the worker, the third turned away
+    assert results[:2] == [True, True]
+    assert isinstance(results[2], HashingBusyError) and results[2].retry_after == 2
+
+
+async def test_login_answers_503_when_the_hashing_queue_is_full(client, monkeypatch):
+    credentials = await register(client)
+    monkeypatch.setattr(hasher, "queue_depth", 0)
+    response = await client.post("/api/v1/auth/login", data=credentials)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(hasher.retry_after)
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.database import db_manager
+from app.models import Password
+from app.utils.crypto import get_blind_index
+
+from .conftest import entry
+
+
+@pytest.fixture
+def sealed(monkeypatch):
+    monkeypatch.setattr(settings, "ENCRYPT_METADATA", True)
+    monkeypatch.setattr(settings, "BLIND_INDEX_KEY", "test blind index key")
+
+
+async def titles(client, headers, **params) -> set:
+    response = await client.get("/api/v1/passwords", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return {item["title"] for item in response.json()}
+
+
+async def test_sealed_entries_are_found_through_the_blind_index(client, user, sealed):
+    user_id, headers = user
+    await client.post("/api/v1/passwords", json=entry(1, username="Alice@Example.com", url="https://mail.example.org/inbox"), headers=headers)
+    await client.post("/api/v1/passwords", json=entry(2, username="bob@example.com", url="https://shop.test/"), headers=headers)
+
+    async with db_manager.async_session() as session:
+        stored = (await session.execute(select(Password.username, Password.url).where(Password.user_id == user_id))).all()
+    assert {username for username, _ in stored} == {""} and not any(url for _, url in stored)
+
+    assert await titles(client, headers, username="alice@example.com") == {"Entry 1"}
+    assert await titles(client, headers, username_prefix="bob") == {"Entry 2"}
+    assert await titles(client, headers, domain="example.org") == {"Entry 1"}
+    assert await titles(client, headers, domain_prefix="sho") == {"Entry 2"}
+    assert await titles(client, headers, username="carol@example.com") == set()
+    found = (await client.get("/api/v1/passwords/search", params={"q": "alice"}, headers=headers)).json()
+    assert [item["title"] for item in found] == ["Entry 1"]
+
+
+async def test_blind_index_fails_closed_without_its_key(client, headers, monkeypatch):
+    monkeypatch.setattr(settings, "BLIND_INDEX_KEY", "")
+    with pytest.raises(RuntimeError, match="BLIND_INDEX_KEY"):
+        get_blind_index("user")
+
+    # Plaintext entries are still matched on their columns
+    await client.post("/api/v1/passwords", json=entry(1), headers=headers)
+    assert await titles(client, headers, username="user1@example.com") == {"Entry 1"}
+    found = (await client.get("/api/v1/passwords/search", params={"q": "site1"}, headers=headers)).json()
+    assert [item["title"] for item in found] == ["Entry 1"]
@@ -0,0 +1,31 @@
+from .conftest import create_user, entry
+
+
+async def test_bulk_create_update_and_delete(client, headers):
+    created = (await client.post(
+        "/api/v1/passwords/bulk", json={"items": [entry(index) for index in range(4)]}, headers=headers
+    )).json()
+    assert created["succeeded"] == 4 and created["failed"] == 0
+    ids = [result["id"] for result in created["results"]]
+
+    _, other = await create_user()
+    foreign = (await client.post("/api/v1/passwords", json=entry(9), headers=other)).json()["id"]
+    updated = (await client.patch("/api/v1/passwords/bulk", json={"items": [
+        {"id": ids[0], "title": "Renamed", "password": "rotated"},
+        {"id": ids[0], "title": "Twice"},
+        {"id": foreign, "title": "Not mine"},
+        {"id": ids[1], "tags": ["moved"]},
+    ]}, headers=headers)).json()
+    assert [result["status"] for result in updated["results"]] == [200, 409, 404, 200]
+    first = (await client.get(f"/api/v1/passwords/{ids[0]}", headers=headers)).json()
+    assert first["title"] == "Renamed" and first["password"] == "rotated"
+    tags = {tag["tag"]: tag["count"] for tag in (await client.get("/api/v1/tags", headers=headers)).json()}
+    assert tags["moved"] == 1 and tags["test"] == 3
+
+    deleted = (await client.request(
+        "DELETE", "/api/v1/passwords/bulk", json={"ids": [ids[2], ids[3], foreign]}, headers=headers
+    )).json()
+    assert [result["status"] for result in deleted["results"]] == [204, 204, 404]
+    remaining = {item["id"] for item in (await client.get("/api/v1/passwords", headers=headers)).json()}
+    assert remaining == {ids[0], ids[1]}
+    assert (await client.get(f"/api/v1/passwords/{foreign}", headers=other)).status_code == 200
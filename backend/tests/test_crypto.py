@@ -0,0 +1,112 @@
+import importlib.util
+import os
+import threading
+from base64 import b64decode, b64encode
+from pathlib import Path
+
+import pytest
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from app.core.config import settings
+from app.utils import crypto
+from app.utils.crypto import (
+    CryptoEngine,
+    decrypt_batch,
+    decrypt_password,
+    encrypt_batch,
+    encrypt_password,
+    generate_encryption_key,
+)
+
+from .conftest import entry
+
+
+def test_engine_builds_the_cipher_once_per_key(monkeypatch):
+    built = []
+    cipher = crypto.AESGCM
+    key = generate_encryption_key()
+
+    def counting_cipher(key):
+        built.append(key)
+        return cipher(key)
+
+    monkeypatch.setattr(crypto, "AESGCM", counting_cipher)
+    crypto._engine_for_key.cache_clear()
+    sealed = [encrypt_password(f"secret-{index}", key) for index in range(50)]
+    assert [decrypt_password(value, key) for value in sealed] == [f"secret-{index}" for index in range(50)]
+    assert len(built) == 1
+    assert crypto.get_crypto_engine() is crypto.get_crypto_engine()
+    crypto._engine_for_key.cache_clear()
+
+
+def test_engine_rejects_other_keys_and_chains_fallbacks():
+    old, new = generate_encryption_key(), generate_encryption_key()
+    sealed = CryptoEngine(old).encrypt("secret")
+    with pytest.raises(InvalidTag):
+        CryptoEngine(new).decrypt(sealed)
+    assert CryptoEngine(new, fallback=CryptoEngine(old)).decrypt(sealed) == "secret"
+    with pytest.raises(ValueError):
+        CryptoEngine("")
+
+
+class RecordingEngine(CryptoEngine):
+    def __init__(self, key):
+        super().__init__(key)
+        self.calls = []
+
+    def decrypt_many(self, sealed_values):
+        self.calls.append((threading.current_thread().name, len(sealed_values)))
+        return super().decrypt_many(sealed_values)
+
+
+@pytest.mark.parametrize("size, chunks", [(9, [9]), (25, [10, 10, 5])])
+async def test_batch_decryption_offloads_large_batches_in_order(monkeypatch, size, chunks):
+    monkeypatch.setattr(settings, "CRYPTO_INLINE_THRESHOLD", 10)
+    monkeypatch.setattr(settings, "CRYPTO_CHUNK_SIZE", 10)
+    engine = RecordingEngine(generate_encryption_key())
+    passwords = [f"secret-{index}" for index in range(size)]
+
+    assert await decrypt_batch(await encrypt_batch(passwords, engine), engine) == passwords
+    assert sorted(length for _, length in engine.calls) == sorted(chunks)
+    offloaded = [name.startswith("passman-crypto") for name, _ in engine.calls]
+    assert all(offloaded) if size >= 10 else not any(offloaded)
+
+
+async def test_listing_decrypts_every_entry_through_the_pool(client, headers, monkeypatch):
+    monkeypatch.setattr(settings, "CRYPTO_INLINE_THRESHOLD", 4)
+    monkeypatch.setattr(settings, "CRYPTO_CHUNK_SIZE", 3)
+    items = [entry(index) for index in range(11)]
+    await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)
+    listed = (await client.get("/api/v1/passwords", params={"limit": 50}, headers=headers)).json()
+    assert {item["title"]: item["password"] for item in listed} == {item["title"]: item["password"] for item in items}
+
+
+def load_migration(name: str):
+    path = Path(__file__).resolve().parent.parent / "alembic" / "versions" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_secrets_are_sealed_as_one_versioned_binary_value():
+    engine = CryptoEngine(generate_encryption_key())
+    sealed = engine.encrypt("secret")
+    assert isinstance(sealed, bytes) and sealed[0] == crypto.FORMAT_VERSION
+    # version byte, nonce, ciphertext and 16-byte tag, with no base64 expansion
+    assert len(sealed) == crypto.HEADER_SIZE + len("secret") + 16
+    assert engine.decrypt(memoryview(sealed)) == engine.decrypt(bytearray(sealed)) == "secret"
+    with pytest.raises(ValueError):
+        engine.decrypt(bytes((9,)) + sealed[1:])
+    with pytest.raises(ValueError):
+        engine.decrypt(sealed[:crypto.HEADER_SIZE])
+
+
+def test_migration_converts_base64_columns_to_the_sealed_format():
+    migration = load_migration("142d8cd9588b_add_sealed_ciphertext_column")
+    key = generate_encryption_key()
+    nonce = os.urandom(crypto.NONCE_SIZE)
+    legacy = AESGCM(b64decode(key)).encrypt(nonce, b"secret", None)
+    sealed = migration.seal_legacy(b64encode(legacy).decode(), b64encode(nonce))
+    assert CryptoEngine(key).decrypt(sealed) == "secret"
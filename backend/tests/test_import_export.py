@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+
+from tests.conftest import create_user, entry
+
+
+def events(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+async def export(client, headers, export_format: str):
+    response = await client.get("/api/v1/passwords/export", params={"format": export_format}, headers=headers)
+    assert response.status_code == 200
+    return response.text
+
+
+async def test_csv_import_round_trips_export(client, headers):
+    items = [entry(index) for index in range(25)]
+    response = await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)
+    assert response.json()["succeeded"] == 25
+    exported = await export(client, headers, "csv")
+
+    _, other = await create_user()
+    response = await client.post(
+        "/api/v1/passwords/import", params={"format": "csv"},
+        content=exported.encode(), headers={**other, "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert events(response)[-1] == {"event": "complete", "processed": 25, "imported": 25, "failed": 0}
+
+    original = {row["title"]: row for row in csv.DictReader(io.StringIO(exported))}
+    copied = {row["title"]: row for row in csv.DictReader(io.StringIO(await export(client, other, "csv")))}
+    assert copied.keys() == original.keys()
+    for title, row in copied.items():
+        for field in ("username", "password", "url", "tags"):
+            assert row[field] == original[title][field]
+
+
+async def test_ndjson_import_streams_a_chunked_file(client, headers):
+    lines = [json.dumps(entry(index)) for index in range(2500)]
+    lines.insert(10, "{not json")
+
+    async def body():
+        for start in range(0, len(lines), 100):
+            yield ("\n".join(lines[start:start + 100]) + "\n").encode()
+
+    response = await client.post(
+        "/api/v1/passwords/import", params={"format": "ndjson"},
+        content=body(), headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    result = events(response)
+    assert [event["row"] for event in result if event["event"] == "error"] == [11]
+    assert result[-1] == {"event": "complete", "processed": 2501, "imported": 2500, "failed": 1}
+
+    exported = [json.loads(line) for line in (await export(client, headers, "ndjson")).splitlines()]
+    assert len(exported) == 2500
+    assert {record["password"] for record in exported} == {f"secret-{index}" for index in range(2500)}
+
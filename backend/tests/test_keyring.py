@@ -0,0 +1,26 @@
+from sqlalchemy import select, update
+
+from app.database import db_manager
+from app.models import User
+from app.utils.keyring import keyring
+from app.utils.user_cache import user_cache
+
+from .conftest import create_user, entry
+
+
+async def test_data_key_is_assigned_on_the_request_session(client, single_connection):
+    user_id, headers = await create_user()
+    async with db_manager.async_session() as session:
+        await session.execute(update(User).where(User.id == user_id).values(wrapped_dek=None))
+        await session.commit()
+    await user_cache.invalidate(user_id)
+    keyring.forget(user_id)
+
+    response = await client.post("/api/v1/passwords", json=entry(1), headers=headers)
+    assert response.status_code == 200, response.text
+    async with db_manager.async_session() as session:
+        assert await session.scalar(select(User.wrapped_dek).where(User.id == user_id)) is not None
+
+    response = await client.get(f"/api/v1/passwords/{response.json()['id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["password"] == "secret-1"
@@ -0,0 +1,62 @@
+import json
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.logs import DeferredQueueHandler, JSONFormatter, RequestLogMiddleware
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def request_records():
+    handler = Records()
+    request_logger = logging.getLogger("app.requests")
+    level = request_logger.level
+    request_logger.addHandler(handler)
+    request_logger.setLevel(logging.INFO)
+    yield handler.records
+    request_logger.removeHandler(handler)
+    request_logger.setLevel(level)
+
+
+async def endpoint(scope, receive, send):
+    status = 404 if scope["path"] == "/missing" else 200
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+@pytest.mark.parametrize("sample_rate, logged", [(1.0, ["/ok", "/missing"]), (0.0, ["/missing"])])
+async def test_request_log_sampling_keeps_errors(request_records, sample_rate, logged):
+    app = RequestLogMiddleware(endpoint, sample_rate=sample_rate)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/ok", params={"limit": 5})
+        await client.get("/missing")
+    assert [record.path for record in request_records] == logged
+    assert request_records[-1].levelno == logging.WARNING and request_records[-1].status_code == 404
+
+
+def test_queue_handler_leaves_formatting_to_the_listener():
+    queued = []
+    handler = DeferredQueueHandler(type("Queue", (), {"put_nowait": staticmethod(queued.append)})())
+    record = logging.makeLogRecord({"msg": "Started %s pool with %d workers", "args": ("thread", 4)})
+    handler.emit(record)
+    assert queued == [record] and not hasattr(record, "message")
+
+
+def test_json_records_carry_extra_fields():
+    record = logging.makeLogRecord({
+        "name": "app.requests", "levelname": "INFO", "msg": "%s %s", "args": ("GET", "/ok"),
+        "path": "/ok", "duration_ms": 1.5,
+    })
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "GET /ok" and entry["path"] == "/ok" and entry["duration_ms"] == 1.5
+    assert {"time", "level", "logger"} <= set(entry)
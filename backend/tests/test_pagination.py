@@ -0,0 +1,48 @@
+from .conftest import entry
+
+
+async def test_keyset_pagination_walks_every_entry_once(client, headers):
+    items = [entry(index) for index in range(23)]
+    assert (await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)).json()["succeeded"] == 23
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, "fields": "id,title"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/v1/passwords", params=params, headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert all(set(item) == {"id", "title"} for item in page)
+        seen += [item["title"] for item in page]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert len(seen) == 23 and set(seen) == {item["title"] for item in items}
+
+    response = await client.get("/api/v1/passwords", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+
+async def test_listing_filters_and_projection(client, headers):
+    items = [
+        entry(1, title="Mail", url="https://mail.example.org/", tags=["work"]),
+        entry(2, title="Mailbox", url="https://example.org/", tags=["home"]),
+        entry(3, title="Shop", username="buyer@shop.test", url="https://www.shop.test/cart", tags=["home"]),
+    ]
+    await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)
+
+    async def titles(**params):
+        response = await client.get("/api/v1/passwords", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        return sorted(item["title"] for item in response.json())
+
+    assert await titles(tag="home") == ["Mailbox", "Shop"]
+    assert await titles(title_prefix="mail") == ["Mail", "Mailbox"]
+    assert await titles(domain="example.org") == ["Mail", "Mailbox"]
+    assert await titles(domain="shop.test", tag="home") == ["Shop"]
+    assert await titles(username="BUYER@shop.test") == ["Shop"]
+
+    projected = (await client.get("/api/v1/passwords", params={"fields": "title,url"}, headers=headers)).json()
+    assert all(set(item) == {"id", "title", "url"} for item in projected)
+    assert (await client.get("/api/v1/passwords", params={"fields": "title,nope"}, headers=headers)).status_code == 400
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+from app.database import POOL_TIMEOUTS, POOL_WAIT, db_manager
+
+from .conftest import entry
+
+
+def test_postgres_pool_options_come_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 12)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE_SECONDS", 600)
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+    url, options = db_manager._engine_options("postgresql+asyncpg://passman@db/passman")
+    assert (options["pool_size"], options["max_overflow"], options["pool_recycle"]) == (12, 3, 600)
+    # Both prepared statement caches off, as behind PgBouncer
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert url.query["prepared_statement_cache_size"] == "0"
+
+
+async def test_pool_exhaustion_is_counted_and_answered_with_503(client, headers, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT_SECONDS", 0.1)
+    url, options = db_manager._engine_options(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    engine = db_manager._create_engine(url, **options)
+    timeouts, waits = POOL_TIMEOUTS.value(), POOL_WAIT.count()
+    try:
+        async with engine.connect() as held:
+            await held.execute(text("SELECT 1"))
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+    finally:
+        await engine.dispose()
+    assert POOL_TIMEOUTS.value() == timeouts + 1 and POOL_WAIT.count() == waits + 2
+
+    # A request that cannot get a connection is turned away rather than queued
+    writer = db_manager.engine.sync_engine.pool
+    monkeypatch.setattr(writer, "_timeout", 0.1)
+    async with db_manager.engine.connect():
+        response = await client.post("/api/v1/passwords", json=entry(1), headers=headers)
+    assert response.status_code == 503 and response.headers["Retry-After"] == "1"
+    assert "passman_db_pool_timeouts_total" in (await client.get("/metrics")).text
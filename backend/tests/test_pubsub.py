@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+from app.core import pubsub
+from app.core.pubsub import RedisBroker
+
+
+class FakePubSub:
+    """Redis subscription yielding scripted messages, then failing like a dropped connection or idling."""
+
+    def __init__(self, messages, drops=True):
+        self.messages = messages
+        self.drops = drops
+        self.closed = False
+
+    async def subscribe(self, *channels):
+        pass
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+        if self.drops:
+            raise ConnectionError("Connection reset by peer")
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    def __init__(self, *connections):
+        self.connections = list(connections)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return self.connections.pop(0)
+
+
+def message(channel, payload):
+    return {"channel": channel.encode(), "data": json.dumps(payload)}
+
+
+async def test_redis_broker_resubscribes_after_losing_the_connection(monkeypatch):
+    monkeypatch.setattr(pubsub, "RECONNECT_MIN_DELAY_SECONDS", 0)
+    first = FakePubSub([message("test", {"n": 1})])
+    second = FakePubSub([message("test", {"n": 2})])
+    final = FakePubSub([], drops=False)
+
+    broker = RedisBroker.__new__(RedisBroker)
+    pubsub.LocalBroker.__init__(broker)
+    broker._redis = FakeRedis(first, second, final)
+    broker._pubsub = None
+    broker._listener = None
+    received, reconnects = [], []
+    broker.subscribe("test", received.append)
+    broker.on_reconnect(lambda: reconnects.append(len(received)))
+
+    await broker.start()
+    for _ in range(100):
+        if len(reconnects) == 2:
+            break
+        await asyncio.sleep(0.01)
+    broker._listener.cancel()
+
+    assert received == [{"n": 1}, {"n": 2}]
+    # State is dropped after each reconnect, before the messages that follow it
+    assert reconnects == [1, 2]
+    assert first.closed and second.closed
@@ -0,0 +1,34 @@
+import pytest
+
+from app.utils.user_cache import user_cache
+
+from .conftest import entry
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/passwords",
+    "/api/v1/passwords/summary",
+    "/api/v1/passwords/search?q=site1",
+    "/api/v1/passwords/changes?since=0",
+    "/api/v1/passwords/export",
+    "/api/v1/tags",
+])
+async def test_read_endpoints_use_one_session(client, user, single_connection, path):
+    user_id, headers = user
+    assert (await client.post("/api/v1/passwords", json=entry(1), headers=headers)).status_code == 200
+    # A cache miss loads the user, which must happen on the read session
+    await user_cache.invalidate(user_id)
+    response = await client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+
+
+async def test_get_and_reveal_use_one_session(client, user, single_connection):
+    user_id, headers = user
+    password_id = (await client.post("/api/v1/passwords", json=entry(1), headers=headers)).json()["id"]
+    await user_cache.invalidate(user_id)
+    response = await client.get(f"/api/v1/passwords/{password_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    await user_cache.invalidate(user_id)
+    response = await client.post("/api/v1/passwords/reveal", json={"ids": [password_id]}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == [{"id": password_id, "password": "secret-1"}]
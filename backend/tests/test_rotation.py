@@ -0,0 +1,122 @@
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.database import db_manager
+from app.models import Password, User
+from app.utils.crypto import generate_encryption_key, get_crypto_engine
+from app.utils.keyring import keyring
+from app.utils.reencryption import ReencryptionJob
+
+from .conftest import entry
+
+
+async def owner(user_id: str) -> User:
+    async with db_manager.async_session() as session:
+        return await session.get(User, user_id)
+
+
+async def key_versions(user_id: str) -> set[int]:
+    async with db_manager.async_session() as session:
+        return set((await session.scalars(select(Password.key_version).where(Password.user_id == user_id))).all())
+
+
+async def secrets(client, headers) -> dict[str, str]:
+    response = await client.get("/api/v1/passwords", headers=headers)
+    assert response.status_code == 200
+    return {item["title"]: item["password"] for item in response.json()}
+
+
+async def test_entries_survive_a_data_key_rotation(client, user, monkeypatch):
+    user_id, headers = user
+    monkeypatch.setattr(settings, "USER_CACHE_TTL_SECONDS", 0)
+    monkeypatch.setattr(settings, "REENCRYPT_RETIRE_GRACE_SECONDS", 0)
+    items = [entry(index) for index in range(12)]
+    assert (await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)).status_code == 200
+    before = await secrets(client, headers)
+    old_version = (await owner(user_id)).key_version
+
+    assert await keyring.rotate_data_keys([user_id]) == 1
+    rotated = await owner(user_id)
+    assert rotated.key_version == old_version + 1 and rotated.previous_wrapped_dek is not None
+    # Entries sealed with either generation open while the job has not run
+    assert await secrets(client, headers) == before
+
+    await ReencryptionJob(batch_size=5, max_rows_per_second=0).run(restart=True)
+    assert await key_versions(user_id) == {rotated.key_version}
+    assert (await owner(user_id)).previous_wrapped_dek is None
+    assert await secrets(client, headers) == before
+
+
+async def test_stale_write_during_retirement_keeps_the_previous_key(client, user, monkeypatch):
+    user_id, headers = user
+    monkeypatch.setattr(settings, "REENCRYPT_RETIRE_GRACE_SECONDS", 0)
+    response = await client.post("/api/v1/passwords", json=entry(1), headers=headers)
+    password_id = response.json()["id"]
+    old = await owner(user_id)
+    await keyring.rotate_data_keys([user_id])
+
+    job = ReencryptionJob(max_rows_per_second=0)
+
+    async def stale_worker_writes(seconds: float) -> bool:
+        # A worker that missed the invalidation still seals with the old generation
+        stale = keyring._open(user_id, old.key_version, old.wrapped_dek, None).engine
+        async with db_manager.async_session() as session:
+            await session.execute(
+                update(Password)
+                .where(Password.id == password_id)
+                .values(ciphertext=stale.encrypt("written-late"), key_version=old.key_version)
+            )
+            await session.commit()
+        return True
+
+    monkeypatch.setattr(job, "_sleep", stale_worker_writes)
+    await job.run(restart=True)
+    assert (await owner(user_id)).previous_wrapped_dek is not None
+    assert (await secrets(client, headers))["Entry 1"] == "written-late"
+
+    monkeypatch.undo()
+    monkeypatch.setattr(settings, "USER_CACHE_TTL_SECONDS", 0)
+    monkeypatch.setattr(settings, "REENCRYPT_RETIRE_GRACE_SECONDS", 0)
+    await ReencryptionJob(max_rows_per_second=0).run(restart=True)
+    assert (await owner(user_id)).previous_wrapped_dek is None
+    assert (await secrets(client, headers))["Entry 1"] == "written-late"
+
+
+async def test_entries_survive_a_master_key_rotation(client, user, monkeypatch):
+    user_id, headers = user
+    monkeypatch.setattr(settings, "USER_CACHE_TTL_SECONDS", 0)
+    monkeypatch.setattr(settings, "REENCRYPT_RETIRE_GRACE_SECONDS", 0)
+    items = [entry(index) for index in range(5)]
+    await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)
+    # An entry from before envelope encryption, sealed with the master key itself
+    legacy = (await client.post("/api/v1/passwords", json=entry(5), headers=headers)).json()["id"]
+    async with db_manager.async_session() as session:
+        await session.execute(
+            update(Password)
+            .where(Password.id == legacy)
+            .values(ciphertext=get_crypto_engine().encrypt("secret-5"), key_version=0)
+        )
+        await session.commit()
+    before = await secrets(client, headers)
+
+    old_key, new_key = settings.ENCRYPTION_KEY, generate_encryption_key()
+
+    async def rotate_master(current: str, previous: str):
+        monkeypatch.setattr(settings, "ENCRYPTION_KEY", current)
+        monkeypatch.setattr(settings, "PREVIOUS_ENCRYPTION_KEYS", [previous])
+        keyring.clear()
+        await keyring.rewrap_all()
+        await ReencryptionJob(max_rows_per_second=0).run(restart=True)
+        monkeypatch.setattr(settings, "PREVIOUS_ENCRYPTION_KEYS", [])
+        keyring.clear()
+
+    await rotate_master(new_key, old_key)
+    try:
+        assert (await owner(user_id)).wrapped_dek is not None
+        assert 0 not in await key_versions(user_id)
+        # Readable with the old master key gone
+        assert await secrets(client, headers) == before
+    finally:
+        # Other tests' users were rewrapped too; hand them back the original key
+        await rotate_master(old_key, new_key)
+    assert await secrets(client, headers) == before
@@ -0,0 +1,40 @@
+from sqlalchemy import text
+
+from app.database import db_manager
+
+from .conftest import create_user, entry
+
+
+async def titles(client, headers, term: str) -> list[str]:
+    response = await client.get("/api/v1/passwords/search", params={"q": term}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [item["title"] for item in response.json()]
+
+
+async def test_search_only_matches_own_entries(client, headers):
+    _, other = await create_user()
+    items = [entry(index, url=f"https://shared{index}.example.org") for index in range(3)]
+    for owner in (headers, other):
+        assert (await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=owner)).status_code == 200
+
+    assert sorted(await titles(client, headers, "shared1")) == ["Entry 1"]
+    assert sorted(await titles(client, headers, "example.org")) == ["Entry 0", "Entry 1", "Entry 2"]
+    # Under three characters the trigram index is skipped
+    assert len(await titles(client, headers, "sh")) == 3
+
+
+async def test_search_follows_updates_deletes_and_vacuum(client, headers):
+    created = (await client.post("/api/v1/passwords", json=entry(1, title="Mailbox"), headers=headers)).json()
+    doomed = (await client.post("/api/v1/passwords", json=entry(2, title="Mailroom"), headers=headers)).json()
+    assert sorted(await titles(client, headers, "mail")) == ["Mailbox", "Mailroom"]
+
+    response = await client.put(f"/api/v1/passwords/{created['id']}", json={"title": "Postbox"}, headers=headers)
+    assert response.status_code == 200
+    assert (await client.delete(f"/api/v1/passwords/{doomed['id']}", headers=headers)).status_code == 204
+    assert await titles(client, headers, "mail") == []
+    assert await titles(client, headers, "postbox") == ["Postbox"]
+
+    async with db_manager.engine.connect() as connection:
+        await connection.execute(text("VACUUM"))
+        await connection.execute(text("INSERT INTO password_search(password_search) VALUES ('integrity-check')"))
+    assert await titles(client, headers, "postbox") == ["Postbox"]
@@ -0,0 +1,42 @@
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+def load(monkeypatch, **env) -> Settings:
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return Settings(_env_file=None)
+
+
+@pytest.mark.parametrize("value", ["key-one,key-two", " key-one , key-two ", '["key-one", "key-two"]'])
+def test_previous_encryption_keys(monkeypatch, value):
+    assert load(monkeypatch, PREVIOUS_ENCRYPTION_KEYS=value).PREVIOUS_ENCRYPTION_KEYS == ["key-one", "key-two"]
+
+
+def test_previous_encryption_keys_single_and_empty(monkeypatch):
+    assert load(monkeypatch, PREVIOUS_ENCRYPTION_KEYS="only-key").PREVIOUS_ENCRYPTION_KEYS == ["only-key"]
+    assert load(monkeypatch, PREVIOUS_ENCRYPTION_KEYS="").PREVIOUS_ENCRYPTION_KEYS == []
+
+
+def test_cors_origins(monkeypatch):
+    settings = load(monkeypatch, BACKEND_CORS_ORIGINS="http://a.example,http://b.example")
+    assert settings.BACKEND_CORS_ORIGINS == ["http://a.example", "http://b.example"]
+
+
+@pytest.mark.parametrize("value", [
+    "postgresql+asyncpg://r1/passman,postgresql+asyncpg://r2/passman",
+    '["postgresql+asyncpg://r1/passman", "postgresql+asyncpg://r2/passman"]',
+])
+def test_database_replica_urls(monkeypatch, value):
+    assert load(monkeypatch, DATABASE_REPLICA_URLS=value).DATABASE_REPLICA_URLS == [
+        "postgresql+asyncpg://r1/passman", "postgresql+asyncpg://r2/passman"
+    ]
+
+
+def test_encrypt_metadata_requires_blind_index_key(monkeypatch):
+    monkeypatch.delenv("BLIND_INDEX_KEY", raising=False)
+    with pytest.raises(ValidationError, match="BLIND_INDEX_KEY"):
+        load(monkeypatch, ENCRYPT_METADATA="true")
+    assert load(monkeypatch, ENCRYPT_METADATA="true", BLIND_INDEX_KEY="index-key").ENCRYPT_METADATA
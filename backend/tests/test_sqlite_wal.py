@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+
+from .conftest import entry
+
+
+@pytest.mark.parametrize("encrypt_metadata", [False, True])
+async def test_concurrent_updates_of_one_entry_keep_both_changes(client, headers, monkeypatch, encrypt_metadata):
+    monkeypatch.setattr(settings, "ENCRYPT_METADATA", encrypt_metadata)
+    monkeypatch.setattr(settings, "BLIND_INDEX_KEY", "test blind index key")
+    password_id = (await client.post("/api/v1/passwords", json=entry(1), headers=headers)).json()["id"]
+
+    for round in range(10):
+        title, url = f"Renamed {round}", f"https://moved{round}.example.com"
+        responses = await asyncio.gather(
+            client.put(f"/api/v1/passwords/{password_id}", json={"title": title}, headers=headers),
+            client.put(f"/api/v1/passwords/{password_id}", json={"url": url}, headers=headers),
+        )
+        assert [response.status_code for response in responses] == [200, 200]
+
+        stored = (await client.get(f"/api/v1/passwords/{password_id}", headers=headers)).json()
+        assert (stored["title"], stored["url"]) == (title, url)
+        if not encrypt_metadata:
+            found = (await client.get("/api/v1/passwords/search", params={"q": title}, headers=headers)).json()
+            assert [item["id"] for item in found] == [password_id]
+
+
+async def test_reads_and_writes_use_their_own_engines(app):
+    from app.database import db_manager, get_db, read_only_session
+
+    async for session in get_db():
+        assert session.get_bind() is db_manager.engine.sync_engine
+        assert "read_bind" not in session.info
+    async with read_only_session(None) as session:
+        assert session.info["read_bind"] is db_manager.read_engine.sync_engine
+
+
+async def test_connections_are_tuned_on_connect(app):
+    from sqlalchemy import text
+
+    from app.database import db_manager
+
+    async with db_manager.engine.connect() as writer:
+        assert (await writer.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        assert (await writer.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+        assert (await writer.execute(text("PRAGMA cache_size"))).scalar() == settings.SQLITE_CACHE_SIZE
+    async with db_manager.read_engine.connect() as reader:
+        assert (await reader.execute(text("PRAGMA query_only"))).scalar() == 1
+        assert (await reader.execute(text("PRAGMA mmap_size"))).scalar() == settings.SQLITE_MMAP_SIZE
@@ -0,0 +1,30 @@
+from app.utils.crypto import CryptoEngine
+
+from .conftest import create_user, entry
+
+
+async def test_summary_lists_metadata_without_decrypting(client, headers, monkeypatch):
+    items = [entry(index) for index in range(3)]
+    await client.post("/api/v1/passwords/bulk", json={"items": items}, headers=headers)
+
+    def no_decryption(self, *args):
+        raise AssertionError("summary listing decrypted a secret")
+
+    monkeypatch.setattr(CryptoEngine, "unseal", no_decryption)
+    response = await client.get("/api/v1/passwords/summary", headers=headers)
+    assert response.status_code == 200, response.text
+    summaries = response.json()
+    assert sorted(item["title"] for item in summaries) == ["Entry 0", "Entry 1", "Entry 2"]
+    assert all("password" not in item for item in summaries)
+
+
+async def test_reveal_returns_requested_secrets_in_order(client, headers):
+    ids = [(await client.post("/api/v1/passwords", json=entry(index), headers=headers)).json()["id"] for index in range(3)]
+    revealed = (await client.post("/api/v1/passwords/reveal", json={"ids": [ids[2], ids[0]]}, headers=headers)).json()
+    assert revealed == [{"id": ids[2], "password": "secret-2"}, {"id": ids[0], "password": "secret-0"}]
+
+    _, other = await create_user()
+    response = await client.post("/api/v1/passwords/reveal", json={"ids": [ids[1]]}, headers=other)
+    assert response.status_code == 404
+    too_many = await client.post("/api/v1/passwords/reveal", json={"ids": ids * 20}, headers=headers)
+    assert too_many.status_code == 422
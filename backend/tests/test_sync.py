@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+
+from app.database import db_manager
+from app.models import Password, PasswordTag, PasswordTombstone, User
+
+from .conftest import entry
+
+
+async def changes(client, headers, since: int):
+    return await client.get("/api/v1/passwords/changes", params={"since": since}, headers=headers)
+
+
+async def test_old_tombstones_are_pruned_behind_a_floor(client, user):
+    user_id, headers = user
+    ids = [(await client.post("/api/v1/passwords", json=entry(index), headers=headers)).json()["id"] for index in range(3)]
+    start = int((await client.get("/api/v1/passwords", headers=headers)).headers["X-Vault-Version"])
+
+    assert (await client.delete(f"/api/v1/passwords/{ids[0]}", headers=headers)).status_code == 204
+    assert (await changes(client, headers, start)).json()["deleted"] == [ids[0]]
+
+    async with db_manager.async_session() as session:
+        await session.execute(
+            update(PasswordTombstone)
+            .where(PasswordTombstone.user_id == user_id)
+            .values(deleted_at=datetime.utcnow() - timedelta(days=365))
+        )
+        await session.commit()
+    assert (await client.delete(f"/api/v1/passwords/{ids[1]}", headers=headers)).status_code == 204
+
+    async with db_manager.async_session() as session:
+        floor = await session.scalar(select(User.tombstone_floor).where(User.id == user_id))
+        kept = (await session.scalars(
+            select(PasswordTombstone.password_id).where(PasswordTombstone.user_id == user_id)
+        )).all()
+    assert floor == start + 1 and kept == [ids[1]]
+
+    assert (await changes(client, headers, start)).status_code == 409
+    response = await changes(client, headers, floor)
+    assert response.status_code == 200
+    assert response.json()["deleted"] == [ids[1]]
+
+
+async def test_deleting_an_account_removes_its_entries_and_tombstones(client, user):
+    user_id, headers = user
+    items = [entry(index) for index in range(3)]
+    ids = [item["id"] for item in (await client.post(
+        "/api/v1/passwords/bulk", json={"items": items}, headers=headers
+    )).json()["results"]]
+    assert (await client.delete(f"/api/v1/passwords/{ids[0]}", headers=headers)).status_code == 204
+
+    assert (await client.delete("/api/v1/users/me", headers=headers)).status_code == 204
+    async with db_manager.async_session() as session:
+        for model in (Password, PasswordTag, PasswordTombstone):
+            assert await session.scalar(select(func.count()).where(model.user_id == user_id)) == 0
+        assert await session.get(User, user_id) is None
+
+
+async def test_listing_etag_answers_304_until_the_vault_changes(client, headers):
+    await client.post("/api/v1/passwords", json=entry(1), headers=headers)
+    first = await client.get("/api/v1/passwords/summary", headers=headers)
+    etag, version = first.headers["ETag"], int(first.headers["X-Vault-Version"])
+
+    cached = await client.get("/api/v1/passwords/summary", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    # Each query string is its own response
+    other = await client.get("/api/v1/passwords/summary", params={"limit": 5}, headers={**headers, "If-None-Match": etag})
+    assert other.status_code == 200
+
+    await client.post("/api/v1/passwords", json=entry(2), headers=headers)
+    changed = await client.get("/api/v1/passwords/summary", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag and int(changed.headers["X-Vault-Version"]) == version + 1
+
+    delta = (await client.get("/api/v1/passwords/changes", params={"since": version}, headers=headers)).json()
+    assert [item["title"] for item in delta["changed"]] == ["Entry 2"] and delta["version"] == version + 1
+    assert (await client.get("/api/v1/passwords/changes", params={"since": version + 5}, headers=headers)).status_code == 409
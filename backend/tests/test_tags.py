@@ -0,0 +1,31 @@
+from app.utils.tags import normalize_tags
+
+from .conftest import create_user, entry
+
+
+async def tag_counts(client, headers) -> list[tuple[str, int]]:
+    response = await client.get("/api/v1/tags", headers=headers)
+    assert response.status_code == 200, response.text
+    return [(item["tag"], item["count"]) for item in response.json()]
+
+
+async def test_tag_counts_follow_creates_updates_and_deletes(client, headers):
+    ids = [
+        (await client.post("/api/v1/passwords", json=entry(index, tags=tags), headers=headers)).json()["id"]
+        for index, tags in enumerate([["work", "mail"], ["work"], ["home", "home"]])
+    ]
+    _, other = await create_user()
+    await client.post("/api/v1/passwords", json=entry(9, tags=["work"]), headers=other)
+    assert await tag_counts(client, headers) == [("work", 2), ("home", 1), ("mail", 1)]
+
+    await client.put(f"/api/v1/passwords/{ids[1]}", json={"tags": ["home"]}, headers=headers)
+    await client.delete(f"/api/v1/passwords/{ids[0]}", headers=headers)
+    assert await tag_counts(client, headers) == [("home", 2)]
+
+    listed = (await client.get("/api/v1/passwords", params={"tag": "home"}, headers=headers)).json()
+    assert sorted(item["id"] for item in listed) == sorted(ids[1:])
+
+
+def test_tags_are_deduplicated_and_bounded():
+    assert normalize_tags(["a", "b", "a", "", "x" * 256]) == ["a", "b"]
+    assert normalize_tags(None) == []
@@ -0,0 +1,42 @@
+import asyncio
+
+from app.core.config import settings
+from app.routers import auth
+from app.routers.auth import create_access_token, decode_access_token
+from app.utils.cache import TTLCache
+
+
+def test_repeated_tokens_are_verified_once(monkeypatch):
+    verified = []
+    decode = auth.jwt.decode
+
+    def counting_decode(token, *args, **kwargs):
+        verified.append(token)
+        return decode(token, *args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    token = create_access_token({"sub": "cached-user"})
+    claims = [decode_access_token(token) for _ in range(5)]
+    assert verified == [token] and all(claim["sub"] == "cached-user" for claim in claims)
+
+
+async def test_cached_claims_expire_with_the_token(client, user, monkeypatch):
+    user_id, _ = user
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 1 / 60)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+    # jose compares exp against whole seconds, so the token is valid until the next one
+    await asyncio.sleep(2.1)
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 401
+
+
+def test_cache_is_bounded_and_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    cache.set("expired", 4, ttl=0)
+    assert cache.get("expired") is None and len(cache) == 2
@@ -0,0 +1,53 @@
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from .conftest import entry
+
+
+@pytest.fixture
+def round_trips(app):
+    """BEGIN/COMMIT counts and SQL statements across the writer and the read pool."""
+    from app.database import db_manager
+
+    trips = SimpleNamespace(counts=Counter(), sql=[])
+    listeners = [
+        ("before_cursor_execute", lambda conn, cursor, statement, *_: trips.sql.append(statement)),
+        ("begin", lambda *_: trips.counts.update(["begin"])),
+        ("commit", lambda *_: trips.counts.update(["commit"])),
+    ]
+    engines = [engine.sync_engine for engine in (db_manager.engine, db_manager.read_engine) if engine]
+    for engine in engines:
+        for name, listener in listeners:
+            event.listen(engine, name, listener)
+    yield trips
+    for engine in engines:
+        for name, listener in listeners:
+            event.remove(engine, name, listener)
+
+
+async def test_each_request_is_one_transaction(client, headers, round_trips):
+    password_id = (await client.post("/api/v1/passwords", json=entry(1), headers=headers)).json()["id"]
+    requests = [
+        ("POST", "/api/v1/passwords", {"json": entry(2)}, 1),
+        ("PUT", f"/api/v1/passwords/{password_id}", {"json": {"title": "Renamed"}}, 1),
+        ("PUT", "/api/v1/users/me", {"json": {"email": "renamed@example.com"}}, 1),
+        ("GET", "/api/v1/passwords", {}, 0),
+        ("GET", f"/api/v1/passwords/{password_id}", {}, 0),
+        ("DELETE", f"/api/v1/passwords/{password_id}", {}, 1),
+    ]
+    for method, path, kwargs, commits in requests:
+        round_trips.counts.clear()
+        response = await client.request(method, path, headers=headers, **kwargs)
+        assert response.is_success, response.text
+        assert (round_trips.counts["begin"], round_trips.counts["commit"]) == (1, commits), (method, path)
+
+
+async def test_created_entry_is_returned_without_a_refresh(client, headers, round_trips):
+    await client.get("/api/v1/passwords", headers=headers)
+    round_trips.sql.clear()
+    created = (await client.post("/api/v1/passwords", json=entry(1), headers=headers)).json()
+    assert created["created_at"] and created["updated_at"]
+    assert not [statement for statement in round_trips.sql if statement.lstrip().startswith("SELECT")]
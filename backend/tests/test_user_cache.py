@@ -0,0 +1,39 @@
+from app.core.pubsub import broker
+from app.utils.user_cache import INVALIDATION_CHANNEL, user_cache
+
+
+async def test_repeated_requests_are_served_from_the_cache(client, user):
+    user_id, headers = user
+    await client.get("/api/v1/users/me", headers=headers)
+    hits, misses = user_cache.hits, user_cache.misses
+    for _ in range(3):
+        assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+    assert (user_cache.hits - hits, user_cache.misses - misses) == (3, 0)
+
+
+async def test_profile_update_invalidates_the_cached_user(client, user):
+    user_id, headers = user
+    await client.get("/api/v1/users/me", headers=headers)
+    assert user_cache.get(user_id) is not None
+
+    response = await client.put("/api/v1/users/me", json={"email": f"new-{user_id[:8]}@example.com"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert user_cache.get(user_id) is None
+    profile = (await client.get("/api/v1/users/me", headers=headers)).json()
+    assert profile["email"] == f"new-{user_id[:8]}@example.com"
+
+
+async def test_deleted_user_is_not_served_from_the_cache(client, user):
+    user_id, headers = user
+    await client.get("/api/v1/users/me", headers=headers)
+    assert (await client.delete("/api/v1/users/me", headers=headers)).status_code == 204
+    assert user_cache.get(user_id) is None
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 401
+
+
+async def test_invalidations_from_other_workers_drop_the_entry(client, user):
+    user_id, headers = user
+    await client.get("/api/v1/users/me", headers=headers)
+    # What the broker delivers when another worker invalidates the user
+    await broker.publish(INVALIDATION_CHANNEL, {"user_id": user_id})
+    assert user_cache.get(user_id) is None
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import socket
+
+import pytest
+import uvicorn
+import websockets
+
+from app.core.config import settings
+from app.routers.auth import create_access_token
+from app.utils.vault_events import vault_feed
+
+from .conftest import create_user, entry
+
+
+@pytest.fixture
+async def server(app):
+    """The app served by uvicorn on a local port, on the test event loop."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=port, lifespan="off", log_level="warning", ws="websockets"
+    ))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    yield f"ws://127.0.0.1:{port}/api/v1/ws/vault"
+    server.should_exit = True
+    await task
+
+
+async def receive(ws) -> list[dict]:
+    return json.loads(await asyncio.wait_for(ws.recv(), timeout=5))
+
+
+async def test_feed_pushes_the_users_own_changes(client, user, server):
+    user_id, headers = user
+    token = headers["Authorization"].removeprefix("Bearer ")
+    async with websockets.connect(server, subprotocols=["passman.bearer", token]) as ws:
+        assert ws.subprotocol == "passman.bearer"
+        async with websockets.connect(server, additional_headers=headers) as same_user:
+            _, other = await create_user()
+            await client.post("/api/v1/passwords", json=entry(0), headers=other)
+
+            created = (await client.post("/api/v1/passwords", json=entry(1), headers=headers)).json()
+            events = await receive(ws)
+            assert [(event["id"], event["op"]) for event in events] == [(created["id"], "create")]
+            assert await receive(same_user) == events
+
+            await client.put(f"/api/v1/passwords/{created['id']}", json={"title": "Renamed"}, headers=headers)
+            await client.delete(f"/api/v1/passwords/{created['id']}", headers=headers)
+            update, delete = await receive(ws), await receive(ws)
+            assert (update[0]["op"], delete[0]["op"]) == ("update", "delete")
+            assert delete[0]["version"] == update[0]["version"] + 1
+    await asyncio.sleep(0.05)
+    assert vault_feed.connections == 0
+
+
+async def test_feed_rejects_missing_and_expired_tokens(user, server, monkeypatch):
+    user_id, headers = user
+    token = headers["Authorization"].removeprefix("Bearer ")
+    for url, subprotocols in (
+        (server, None),
+        (server, ["passman.bearer", "garbage"]),
+        # The query string ends up in access logs, so tokens are not read from it
+        (f"{server}?token={token}", None),
+    ):
+        with pytest.raises(websockets.InvalidStatus):
+            async with websockets.connect(url, subprotocols=subprotocols):
+                pass
+
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 1 / 60)
+    token = create_access_token({"sub": user_id})
+    async with websockets.connect(server, subprotocols=["passman.bearer", token]) as ws:
+        with pytest.raises(websockets.ConnectionClosed) as closed:
+            await asyncio.wait_for(ws.recv(), timeout=5)
+    assert closed.value.rcvd.code == 1008
@@ -0,0 +1,24 @@
+from sqlalchemy.engine import Row
+
+from app.database import read_only_session
+from app.schemas.password import SUMMARY_FIELDS
+from app.utils.vault_queries import vault_page
+
+from .conftest import entry
+
+
+async def test_list_queries_select_only_the_requested_columns(client, user):
+    user_id, headers = user
+    await client.post("/api/v1/passwords/bulk", json={"items": [entry(index, notes="n" * 4000) for index in range(3)]}, headers=headers)
+
+    query = vault_page(user_id, ("id", "title"), limit=10)
+    selected = [column.name for column in query.selected_columns]
+    assert selected == ["id", "title", "created_at", "sealed_metadata"]
+    summary = [column.name for column in vault_page(user_id, SUMMARY_FIELDS, limit=10).selected_columns]
+    assert "notes" not in summary and "ciphertext" not in summary
+
+    async with read_only_session(user_id) as session:
+        rows = (await session.execute(query)).all()
+        assert len(rows) == 3 and all(isinstance(row, Row) for row in rows)
+        # Plain tuples: nothing was added to the identity map
+        assert len(session.identity_map) == 0
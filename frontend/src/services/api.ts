@@ -3,6 +3,7 @@ import type { AxiosError, AxiosInstance } from 'axios';
 import { config } from '../config';
 import { useAuthStore } from '../store/authStore';
 import { mockApi } from './mockData';
+import type { Password } from '../types';
 
 // Types
 export interface ApiError {
@@ -123,8 +124,17 @@ export const passwordsApi = {
       return mockApi.passwords.getAll();
     }
 
-    const response = await api.get('/passwords');
-    return response.data;
+    // Follow keyset pagination until the server stops returning a cursor
+    const passwords: Password[] = [];
+    let cursor: string | undefined;
+    do {
+      const response = await api.get<Password[]>('/passwords', {
+        params: cursor ? { cursor } : undefined,
+      });
+      passwords.push(...response.data);
+      cursor = response.headers['x-next-cursor'];
+    } while (cursor);
+    return passwords;
   },
 
   getById: async (id: string) => {